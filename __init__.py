@@ -6,33 +6,143 @@ addon_dir = os.path.dirname(os.path.abspath(__file__))
 if addon_dir not in sys.path:
     sys.path.append(addon_dir)
 
+# Apenas o necessário para registrar os hooks é importado aqui; os módulos de
+# GUI, agendador e utilitários são importados no primeiro uso (ver init_addon)
 from aqt import gui_hooks
 from aqt.qt import QTimer, QAction
 from aqt import mw
 from aqt.utils import showInfo
-from gui.popup import ReminderPopup
-from anki_utils import AnkiUtils
-from gui.options import ReminderOptions
-from dont_stop_scheduler import DontStopScheduler
-from translations import tr
+from translations import tr, invalidate_language
+from dss_metrics import instrument, registry as metrics
+from dss_journal import journal
+from answer_times import answer_times
+from answer_limits import answer_limits
+from dss_lifecycle import Lifecycle, lifecycle
+from dss_log_pipeline import ADDON_LOGGER, log_pipeline
 import time
 import logging
 
-# Configuração do logger
-logger = logging.getLogger(__name__.split('.')[0])
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", "%H:%M:%S")
-sh = logging.StreamHandler(sys.stdout)
-sh.setFormatter(formatter)
-sh.setStream(sys.stdout)  # Força o uso do stdout
-sh.encoding = 'utf-8'  # Define o encoding como UTF-8
-logger.addHandler(sh)
-logger.setLevel(logging.WARNING)
-# Timers para controle de inatividade na revisão
-card_max_timer = None
-card_inactivity_timer = None
+# Configuração do logger: os registros do addon e de todos os seus módulos vão
+# para uma fila e são formatados e escritos no stdout (e no buffer do painel de
+# diagnóstico) por outra thread
+logger = logging.getLogger(ADDON_LOGGER)
+log_pipeline.start(sys.stdout, logging.WARNING)
+lifecycle.register("log_pipeline", log_pipeline.stop)
+# Controle de inatividade na revisão: o ActivityTracker registra a última interação
+# e um único prazo no timer_engine verifica se ela passou do limite
+timer_engine = None
+activity_tracker = None
+inactivity_check_timer = None
+inactivity_threshold_secs = None
 
+def get_timer_engine():
+    """Retorna o motor de prazos, criando-o no primeiro uso"""
+    global timer_engine
+    if timer_engine is None:
+        from dss_timer_engine import TimerEngine
+        timer_engine = TimerEngine()
+        lifecycle.register("timer_engine", release_timer_engine)
+    return timer_engine
+
+def release_timer_engine():
+    """Cancela todos os prazos e destrói o motor"""
+    global timer_engine
+    engine, timer_engine = timer_engine, None
+    if engine is not None:
+        engine.dispose()
+
+def get_activity_tracker():
+    """Retorna o rastreador de atividade, criando-o no primeiro uso"""
+    global activity_tracker
+    if activity_tracker is None:
+        from activity_tracker import ActivityTracker
+        activity_tracker = ActivityTracker(mw)
+        lifecycle.register("activity_tracker", release_activity_tracker)
+    return activity_tracker
+
+def release_activity_tracker():
+    """Remove o filtro de eventos dos widgets observados e destrói o rastreador"""
+    global activity_tracker
+    tracker, activity_tracker = activity_tracker, None
+    if tracker is not None:
+        tracker.unwatch_all()
+        tracker.deleteLater()
+
+def get_inactivity_threshold(config, card=None):
+    """Limite de inatividade em segundos: tempo de resposta esperado + tempo extra configurado.
+
+    O tempo esperado é o quantil (p95) dos tempos de resposta do deck do cartão, que
+    pode ficar acima ou abaixo do tempo máximo de resposta das opções do deck; com
+    poucas amostras, vale o tempo máximo.
+    """
+    max_answer_secs = answer_limits.DEFAULT_LIMIT_SECS
+    if card is not None and mw.col is not None:
+        deck_id = card.odid or card.did
+        deck_secs = answer_times.threshold(deck_id)
+        if deck_secs is not None:
+            max_answer_secs = max(1, round(deck_secs))
+        else:
+            max_answer_secs = answer_limits.limit(mw.col, deck_id)
+    return max_answer_secs + config.inactivity_extra_minutes * 60
+
+def answer_seconds(card):
+    """Tempo de resposta do cartão em segundos, sem o limite de tempo máximo das
+    opções do deck (card.time_taken() nunca passa desse limite)"""
+    started = getattr(card, "timer_started", None)
+    if started:
+        return time.time() - started
+    return card.time_taken() / 1000
+
+def start_inactivity_monitor(threshold_secs, context=""):
+    """Registra atividade e garante que a verificação de inatividade esteja agendada"""
+    global inactivity_check_timer, inactivity_threshold_secs
+    get_activity_tracker().touch()
+    engine = get_timer_engine()
+    if threshold_secs != inactivity_threshold_secs or not engine.is_pending(inactivity_check_timer):
+        inactivity_threshold_secs = threshold_secs
+        inactivity_check_timer = engine.schedule(threshold_secs, check_inactivity, inactivity_check_timer, coalesce=False)
+        logger.info("Monitor de inatividade iniciado%s: %d segundos sem interação", context, threshold_secs)
+
+def stop_inactivity_monitor():
+    """Cancela a verificação de inatividade"""
+    global inactivity_threshold_secs
+    inactivity_threshold_secs = None
+    if timer_engine is not None and timer_engine.cancel(inactivity_check_timer):
+        logger.info("Monitor de inatividade parado")
+
+def check_inactivity():
+    """Alerta se o limite de inatividade foi ultrapassado; caso contrário,
+    reagenda a verificação para o novo prazo (última atividade + limite)"""
+    global inactivity_check_timer
+    if inactivity_threshold_secs is None:
+        return
+    engine = get_timer_engine()
+    idle = activity_tracker.idle_seconds()
+    remaining = inactivity_threshold_secs - idle
+    if remaining <= 0 and engine.is_late(inactivity_threshold_secs):
+        # A verificação venceu muito atrasada (computador suspenso): os alertas
+        # perdidos seguem a mesma política dos lembretes
+        policy = anki_utils.get_config().missed_reminder_policy
+        logger.info("Verificação de inatividade atrasada %.0f segundos, política: %s", engine.lateness, policy)
+        if policy == "reschedule":
+            activity_tracker.touch()
+            remaining = inactivity_threshold_secs
+        elif policy == "skip":
+            # Mantém a fase: o próximo alerta seria em um múltiplo do limite desde a última atividade
+            remaining = inactivity_threshold_secs - idle % inactivity_threshold_secs
+    if remaining <= 0:
+        logger.info("Inatividade detectada: %d segundos sem interação", inactivity_threshold_secs)
+        journal.record("inactivity_alert", threshold=inactivity_threshold_secs)
+        # O alerta reinicia a contagem; se o usuário continuar ausente, alerta de novo após o limite
+        activity_tracker.touch()
+        remaining = inactivity_threshold_secs
+        show_lembrete("inactivity")
+    # Prazo exato: o alerta é medido a partir da última interação, não da grade do modo de baixo consumo
+    inactivity_check_timer = engine.schedule(remaining, check_inactivity, inactivity_check_timer, coalesce=False)
+
+@instrument("on_reviewer_did_show_question")
 def on_reviewer_did_show_question(card):
-    global card_max_timer, card_inactivity_timer, anki_utils
+    global anki_utils
 
     # Inicializa anki_utils se necessário
     if anki_utils is None:
@@ -47,53 +157,32 @@ def on_reviewer_did_show_question(card):
     config = anki_utils.get_config()
 
     # Se não ativou o recurso, não faz nada
-    if not config.get("inactivity_after_max_answer", False):
+    if not config.inactivity_after_max_answer:
+        stop_inactivity_monitor()
         return
 
-    # Lê o tempo máximo do cartão do Anki (em segundos)
-    mw = card.reviewer.mw if hasattr(card, "reviewer") else None
-    max_answer_secs = 120  # padrão
-    if mw and hasattr(mw.col, "conf"):
-        max_answer_secs = mw.col.conf.get("maxAnswerSecs", 120)
-
-    # Tempo extra de inatividade (em minutos)
-    inactivity_extra = config.get("inactivity_extra_minutes", 1)
-
-    # Cancela timers anteriores
-    if card_max_timer:
-        card_max_timer.stop()
-    if card_inactivity_timer:
-        card_inactivity_timer.stop()
-
-    # Inicia timer do cartão
-    card_max_timer = QTimer()
-    card_max_timer.setSingleShot(True)
-    def start_inactivity_timer():
-        global card_inactivity_timer
-        card_inactivity_timer = QTimer()
-        card_inactivity_timer.setSingleShot(True)
-        def show_inactivity_alert():
-            # Mostra o popup de inatividade
-            show_lembrete()
-        card_inactivity_timer.timeout.connect(show_inactivity_alert)
-        card_inactivity_timer.start(inactivity_extra * 60 * 1000)
-        logger.info(f"Iniciando timer de inatividade: {inactivity_extra} minutos após o tempo máximo do cartão")
-    card_max_timer.timeout.connect(start_inactivity_timer)
-    card_max_timer.start(max_answer_secs * 1000)
-    logger.info(f"Iniciando timer do cartão: {max_answer_secs} segundos")
-
-def on_reviewer_did_answer_card(card, ease, reviewer):
-    global card_max_timer, card_inactivity_timer
-    if card_max_timer:
-        card_max_timer.stop()
-        logger.info("Timer do cartão cancelado após resposta")
-    if card_inactivity_timer:
-        card_inactivity_timer.stop()
-        logger.info("Timer de inatividade cancelado após resposta")
+    start_inactivity_monitor(get_inactivity_threshold(config, card))
+
+@instrument("on_reviewer_did_answer_card")
+def on_reviewer_did_answer_card(reviewer, card, ease):
+    """Registra a resposta no diário e o tempo de resposta do deck (o aqt chama
+    reviewer_did_answer_card(reviewer, card, ease))"""
+    journal.record("answer", card=card.id, deck=card.did, ease=ease)
+    secs = answer_seconds(card)
+    # Uma resposta que passou do limite de inatividade mede a ausência, não o cartão
+    if inactivity_threshold_secs is None or secs < inactivity_threshold_secs:
+        answer_times.observe(card.odid or card.did, secs)
+    if activity_tracker is not None:
+        activity_tracker.touch()
+
+def on_reviewer_did_show_answer(card):
+    """Mostrar a resposta conta como atividade"""
+    if activity_tracker is not None:
+        activity_tracker.touch()
 
 def on_reminder_dismissed():
-    """Reinicia o timer quando o usuário clica em 'depois'"""
-    global card_max_timer, card_inactivity_timer, anki_utils
+    """Reinicia a contagem de inatividade quando o usuário clica em 'depois'"""
+    global anki_utils
     
     # Inicializa anki_utils se necessário
     if anki_utils is None:
@@ -105,42 +194,27 @@ def on_reminder_dismissed():
             return
     
     # Se estiver em revisão e com inatividade ativada
-    if mw.state == "review" and anki_utils.get_config().get("inactivity_after_max_answer", False):
-        # Cancela timers atuais
-        if card_max_timer:
-            card_max_timer.stop()
-        if card_inactivity_timer:
-            card_inactivity_timer.stop()
-            
-        # Reinicia o timer do cartão
-        mw = mw
-        max_answer_secs = 120  # padrão
-        if hasattr(mw.col, "conf"):
-            max_answer_secs = mw.col.conf.get("maxAnswerSecs", 120)
-            
-        card_max_timer = QTimer()
-        card_max_timer.setSingleShot(True)
-        def start_inactivity_timer():
-            global card_inactivity_timer
-            card_inactivity_timer = QTimer()
-            card_inactivity_timer.setSingleShot(True)
-            def show_inactivity_alert():
-                show_lembrete()
-            card_inactivity_timer.timeout.connect(show_inactivity_alert)
-            inactivity_extra = anki_utils.get_config().get("inactivity_extra_minutes", 1)
-            card_inactivity_timer.start(inactivity_extra * 60 * 1000)
-            logger.info(f"Timer de inatividade reiniciado após 'depois': {inactivity_extra} minutos")
-        card_max_timer.timeout.connect(start_inactivity_timer)
-        card_max_timer.start(max_answer_secs * 1000)
-        logger.info(f"Timer do cartão reiniciado após 'depois': {max_answer_secs} segundos")
+    config = anki_utils.get_config()
+    if mw.state == "review" and config.inactivity_after_max_answer:
+        card = getattr(mw.reviewer, "card", None)
+        start_inactivity_monitor(get_inactivity_threshold(config, card), " após 'depois'")
 
 # Conecta os hooks na inicialização do addon
-gui_hooks.reviewer_did_show_question.append(on_reviewer_did_show_question)
-gui_hooks.reviewer_did_answer_card.append(on_reviewer_did_answer_card)
+lifecycle.hook(gui_hooks.reviewer_did_show_question, on_reviewer_did_show_question)
+lifecycle.hook(gui_hooks.reviewer_did_answer_card, on_reviewer_did_answer_card)
+lifecycle.hook(gui_hooks.reviewer_did_show_answer, on_reviewer_did_show_answer)
 
 # Adiciona hooks para pausar/retomar o timer durante revisão
+@instrument("on_state_will_change")
 def on_state_will_change(new_state, old_state):
     """Gerencia o timer baseado na mudança de estado"""
+    if new_state == "review":
+        journal.record("review_start")
+        # Observa teclado, mouse e rolagem na janela principal e no revisor
+        get_activity_tracker().watch_reviewer(mw)
+    elif old_state == "review":
+        journal.record("review_end")
+        stop_inactivity_monitor()
     if dont_stop_scheduler:
         if new_state == "review":
             dont_stop_scheduler.pause_schedule()
@@ -149,10 +223,50 @@ def on_state_will_change(new_state, old_state):
             dont_stop_scheduler.resume_schedule()
             logger.info("Scheduler retomado ao sair da revisão")
 
-gui_hooks.state_will_change.append(on_state_will_change)
+lifecycle.hook(gui_hooks.state_will_change, on_state_will_change)
+
+# Reconstrói o índice de decks apenas quando o conjunto de decks muda
+def on_operation_did_execute(changes, handler):
+    if getattr(changes, "deck", False):
+        invalidate_deck_index()
+        answer_limits.invalidate_decks()
+    if getattr(changes, "deck_config", False):
+        answer_limits.invalidate_configs()
+
+def on_deck_conf_will_save_config(deck_conf, deck, config):
+    """As opções antigas (DeckConf) são salvas fora das operações; descarta os limites guardados"""
+    answer_limits.invalidate()
+
+def invalidate_deck_index():
+    """Marca o índice de decks para reconstrução no próximo acesso"""
+    from deck_index import deck_index
+    deck_index.invalidate()
+
+def invalidate_deck_ranking():
+    """Descarta a classificação de urgência e os tempos médios do perfil que está sendo fechado"""
+    from deck_ranking import deck_ranking
+    deck_ranking.invalidate()
+
+def invalidate_due_counts():
+    """Descarta as contagens de cartões guardadas do perfil que está sendo fechado"""
+    from due_counts import due_counts
+    due_counts.invalidate()
+
+if hasattr(gui_hooks, "operation_did_execute"):
+    lifecycle.hook(gui_hooks.operation_did_execute, on_operation_did_execute)
+if hasattr(gui_hooks, "deck_conf_will_save_config"):
+    lifecycle.hook(gui_hooks.deck_conf_will_save_config, on_deck_conf_will_save_config)
+lifecycle.hook(gui_hooks.profile_did_open, invalidate_deck_index)
+
+# Grava escritas de configuração agrupadas antes de fechar o perfil
+def flush_config_writes():
+    """Grava imediatamente as escritas de configuração pendentes"""
+    from dss_config_writer import writer
+    writer.flush()
 
-card_max_timer = None
-card_inactivity_timer = None
+lifecycle.hook(gui_hooks.profile_will_close, flush_config_writes)
+lifecycle.hook(gui_hooks.profile_will_close, journal.flush)
+lifecycle.hook(gui_hooks.profile_will_close, answer_times.save)
 
 # Variáveis globais
 reminder_popup = None
@@ -160,13 +274,19 @@ anki_utils = None
 dont_stop_scheduler = None
 
 
-def show_lembrete():
-    """Mostra o lembrete para voltar a estudar"""
-    logger.info(tr('log_showing_reminder').format(time.ctime()))
+def show_lembrete(reason="schedule"):
+    """Mostra o lembrete para voltar a estudar
+
+    Args:
+        reason: "schedule" (frequência configurada), "inactivity" (inatividade na revisão)
+            ou "test" (botão Testar Lembrete das opções)
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(tr('log_showing_reminder').format(time.ctime()))
+    journal.record("reminder", reason=reason)
     
     # Verificar se o deck configurado existe
-    config = anki_utils.get_config()
-    deck_name = config.get('deck', '')
+    deck_name = anki_utils.get_config().deck
     
     # Se o deck configurado estiver vazio ou não existir, usar o primeiro deck disponível
     if not deck_name:
@@ -174,8 +294,8 @@ def show_lembrete():
             decks = anki_utils.get_decks()
             if decks:
                 deck_name = decks[0].name
-                config['deck'] = deck_name
-                logger.info(tr('log_empty_deck').format(deck_name))
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(tr('log_empty_deck').format(deck_name))
             else:
                 logger.warning(tr('log_no_deck'))
                 showInfo(tr("no_deck"))
@@ -184,13 +304,91 @@ def show_lembrete():
             logger.error(tr('error_get_decks').format(str(e)))
             return
     
-    reminder_popup.show_popup()
+    get_reminder_popup().show_popup()
+
+
+def prefetch_due_counts():
+    """Pré-carrega em segundo plano as contagens do deck configurado, as da lista
+    de decks e a classificação de urgência, pouco antes do lembrete"""
+    if mw.col is None:
+        return
+    from due_counts import due_counts
+    config = anki_utils.get_config()
+    deck_id = anki_utils.deck_id(config.deck)
+    if deck_id is not None:
+        due_counts.request(mw, mw.col, deck_id)
+    due_counts.request_all(mw, mw.col, anki_utils.deck_index().entries)
+    if config.suggest_urgent_deck:
+        from deck_ranking import deck_ranking
+        deck_ranking.request(mw, mw.col)
 
 
 def hide_lembrete():
     """Esconde o lembrete"""
-    logger.info(tr('log_hiding_reminder').format(time.ctime()))
-    reminder_popup.hide_card()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(tr('log_hiding_reminder').format(time.ctime()))
+    if reminder_popup is not None:
+        reminder_popup.hide_card()
+
+
+def get_reminder_popup():
+    """Retorna o popup, construindo-o se necessário (modo sob demanda ou primeiro uso)"""
+    global reminder_popup
+    if reminder_popup is None:
+        from gui.popup import ReminderPopup
+        reminder_popup = ReminderPopup(mw, timer_engine=get_timer_engine())
+        reminder_popup.hidden.connect(on_reminder_popup_hidden)
+        lifecycle.register("reminder_popup", dispose_reminder_popup, Lifecycle.PROFILE)
+    return reminder_popup
+
+
+def on_reminder_popup_hidden():
+    """No modo de pouca memória, destrói o popup ao escondê-lo; ele é refeito no próximo lembrete"""
+    if reminder_popup is None or anki_utils.get_config().popup_lifecycle != "low_memory":
+        return
+    dispose_reminder_popup()
+
+
+def dispose_reminder_popup():
+    """Destrói o popup, se existir; o próximo uso constrói um novo"""
+    global reminder_popup
+    if reminder_popup is None:
+        return
+    popup, reminder_popup = reminder_popup, None
+    popup.hidden.disconnect(on_reminder_popup_hidden)
+    popup.hide()
+    popup.deleteLater()
+
+
+# Exportação periódica das métricas (OpenMetrics) para agentes de monitoramento locais
+METRICS_PATH = os.path.join(addon_dir, "metrics.prom")
+METRICS_EXPORT_INTERVAL_SECS = 60
+metrics_export_timer = None
+
+
+def export_metrics():
+    """Grava o arquivo de métricas e agenda a próxima exportação enquanto a coleta estiver ligada"""
+    global metrics_export_timer
+    if not metrics.enabled:
+        return
+    try:
+        metrics.write_openmetrics(METRICS_PATH)
+    except Exception as e:
+        logger.error(f"Erro ao exportar métricas: {str(e)}")
+    metrics_export_timer = get_timer_engine().schedule(METRICS_EXPORT_INTERVAL_SECS, export_metrics, metrics_export_timer)
+
+
+def on_metrics_toggled(enabled):
+    """Inicia ou cancela a exportação periódica quando a coleta é ligada/desligada"""
+    global metrics_export_timer
+    if enabled:
+        metrics_export_timer = get_timer_engine().schedule(METRICS_EXPORT_INTERVAL_SECS, export_metrics, metrics_export_timer)
+    elif timer_engine is not None:
+        timer_engine.cancel(metrics_export_timer)
+
+
+metrics.listeners.append(on_metrics_toggled)
+lifecycle.register("metrics_listener", lambda: metrics.listeners.remove(on_metrics_toggled))
 
 
 def show_options():
@@ -198,42 +396,169 @@ def show_options():
     if dont_stop_scheduler is None:
         showInfo("O addon ainda não foi completamente inicializado. Por favor, aguarde um momento e tente novamente.")
         return
+    from gui.options import ReminderOptions
     reminder_options = ReminderOptions(mw, dont_stop_scheduler)
-    return reminder_options.exec()
+    result = reminder_options.exec()
+    # Filho da janela principal: sem isso, cada diálogo (e o seu combo ligado ao
+    # modelo de decks) ficaria vivo até o fim da sessão
+    reminder_options.deleteLater()
+    return result
+
+
+options_action = None
 
 
 def init_addon():
-    """Inicializa o addon"""
-    global reminder_popup, anki_utils, dont_stop_scheduler
+    """Inicializa o addon
+    
+    Etapa síncrona, executada a cada abertura de perfil: configuração do perfil,
+    agendador e menu. Pode ser chamada de novo sem teardown_addon: o agendador e a
+    ação do menu são criados uma única vez e reaproveitados.
+    Índice de decks, popup e tempos de resposta ficam para init_addon_deferred,
+    quando o loop de eventos estiver ocioso.
+    """
+    global anki_utils, dont_stop_scheduler, options_action
     logger.info(tr('log_initializing'))
     
     try:
-        # Inicializa utilitários
-        anki_utils = AnkiUtils()
+        from anki_utils import AnkiUtils, set_profile, profile_slug
+        from dont_stop_scheduler import DontStopScheduler
         
-        # Verifica e resolve conflitos de configuração
-        anki_utils.check_config_conflict()
+        # Cada perfil tem a sua configuração e o seu diário de eventos, em user_files,
+        # que é preservada nas atualizações do addon
+        set_profile(mw.pm.name)
+        journal.open(os.path.join(addon_dir, "user_files", f"journal-{profile_slug(mw.pm.name)}"))
+        if anki_utils is None:
+            anki_utils = AnkiUtils()
+        config = anki_utils.get_config()
+        metrics.set_enabled(config.metrics_enabled)
         
-        # Inicializa o popup e o agendador
-        reminder_popup = ReminderPopup(mw)
-        dont_stop_scheduler = DontStopScheduler(
-            alarm_func=show_lembrete,
-            cancel_func=hide_lembrete,
-            anki_utils=anki_utils
-        )
+        if dont_stop_scheduler is None:
+            dont_stop_scheduler = DontStopScheduler(
+                alarm_func=show_lembrete,
+                cancel_func=hide_lembrete,
+                anki_utils=anki_utils,
+                prefetch_func=prefetch_due_counts,
+                timer_engine=get_timer_engine()
+            )
+            lifecycle.register("scheduler", release_scheduler)
         
         # Configura o menu de opções
-        action = QAction(tr("options_menu"), mw)
-        action.triggered.connect(show_options)
-        mw.form.menuTools.addAction(action)
+        if options_action is None:
+            options_action = QAction(tr("options_menu"), mw)
+            options_action.triggered.connect(show_options)
+            mw.form.menuTools.addAction(options_action)
+            lifecycle.register("options_action", release_options_action)
+
+        # O que pertence ao perfil é encerrado por teardown_addon
+        lifecycle.register("schedule", dont_stop_scheduler.stop_schedule, Lifecycle.PROFILE)
+        lifecycle.register("inactivity_monitor", stop_inactivity_monitor, Lifecycle.PROFILE)
+        lifecycle.register("deck_ranking", invalidate_deck_ranking, Lifecycle.PROFILE)
+        lifecycle.register("due_counts", invalidate_due_counts, Lifecycle.PROFILE)
         
-        # Inicia o agendador
-        dont_stop_scheduler.start_schedule()
+        # Aplica a frequência do perfil e inicia o agendador, se habilitado
+        dont_stop_scheduler.update_state(config)
         
+        # O restante roda depois que a janela principal for mostrada
+        QTimer.singleShot(0, init_addon_deferred)
+        
+    except Exception as e:
+        logger.error(tr('error_init_addon').format(str(e)))
+
+
+def teardown_addon():
+    """Encerra o que pertence ao perfil que está sendo fechado: para o agendador e o
+    monitor de inatividade e destrói o popup (ligado à coleção do perfil)"""
+    lifecycle.teardown(Lifecycle.PROFILE)
+    logger.info("Addon encerrado para o perfil")
+
+
+def release_scheduler():
+    """Destrói o agendador e seus timers"""
+    global dont_stop_scheduler
+    scheduler, dont_stop_scheduler = dont_stop_scheduler, None
+    if scheduler is not None:
+        scheduler.dispose()
+
+
+def release_options_action():
+    """Remove a ação do menu Ferramentas"""
+    global options_action
+    action, options_action = options_action, None
+    if action is not None:
+        mw.form.menuTools.removeAction(action)
+        action.deleteLater()
+
+
+def unload_addon():
+    """Libera tudo o que o addon criou: objetos do perfil e do addon, timers,
+    threads e hooks. Usada quando o addon é removido ou atualizado."""
+    lifecycle.teardown()
+    logger.info("Addon descarregado")
+
+
+def on_addon_will_change(module):
+    """Remoção ou atualização deste addon: grava o estado agora e descarrega em seguida
+    (fora do hook em andamento, cuja lista de callbacks seria alterada durante a iteração)"""
+    if module != __name__:
+        return
+    flush_config_writes()
+    journal.flush()
+    answer_times.save()
+    QTimer.singleShot(0, unload_addon)
+
+
+def on_addons_will_delete(dialog, ids):
+    for module in ids:
+        on_addon_will_change(module)
+
+
+def on_addon_will_install(manager, module):
+    on_addon_will_change(module)
+
+
+def release_config_writer():
+    """Grava as escritas pendentes e destrói o timer do escritor de configuração"""
+    from dss_config_writer import writer
+    writer.dispose()
+
+
+# Recursos que vivem enquanto o addon estiver carregado
+lifecycle.register("journal", journal.close)
+lifecycle.register("config_writer", release_config_writer)
+lifecycle.register("answer_times", answer_times.save)
+
+
+def init_addon_deferred():
+    """Etapa adiada da inicialização: decks, popup e tempos de resposta"""
+    if mw.col is None:
+        # O perfil foi fechado antes desta etapa
+        return
+    try:
+        # Constrói o índice de decks e, no modo pré-carregado, o popup
+        anki_utils.deck_index()
+        if anki_utils.get_config().popup_lifecycle == "prewarmed":
+            get_reminder_popup().prewarm()
+
+        load_answer_times()
     except Exception as e:
         logger.error(tr('error_init_addon').format(str(e)))
 
 
+def load_answer_times():
+    """Carrega os tempos de resposta do perfil; sem estado salvo, semeia a partir do revlog"""
+    from anki_utils import profile_slug
+    path = os.path.join(addon_dir, "user_files", f"answer_times-{profile_slug(mw.pm.name)}.bin")
+    if answer_times.load(path) or mw.col is None:
+        return
+    from aqt.operations import QueryOp
+    QueryOp(
+        parent=mw,
+        op=answer_times.seed,
+        success=answer_times.apply_seed,
+    ).failure(lambda e: logger.error(f"Erro ao semear os tempos de resposta: {str(e)}")).run_in_background()
+
+
 # Adiciona a ação de configuração ao gerenciador de addons
 mw.addonManager.setConfigAction(__name__, lambda: show_options())
 
@@ -244,7 +569,12 @@ mw.addonManager.setConfigUpdatedAction(__name__, lambda: dont_stop_scheduler.upd
 try:
     # Tenta usar o sistema de hooks mais recente
     from aqt import gui_hooks
-    gui_hooks.profile_did_open.append(init_addon)
+    # O idioma é resolvido novamente a cada abertura de perfil (antes de init_addon)
+    lifecycle.hook(gui_hooks.profile_did_open, invalidate_language)
+    lifecycle.hook(gui_hooks.profile_did_open, init_addon)
+    lifecycle.hook(gui_hooks.profile_will_close, teardown_addon)
+    lifecycle.hook(gui_hooks.addons_dialog_will_delete_addons, on_addons_will_delete)
+    lifecycle.hook(gui_hooks.addon_manager_will_install_addon, on_addon_will_install)
 except (ImportError, AttributeError):
     # Fallback para inicialização direta
     try:
@@ -0,0 +1,64 @@
+# Copyright 2025 Carlos Duarte
+import functools
+from aqt.qt import QObject, QInputEvent
+from dss_clock import now
+from dss_log_pipeline import get_logger
+
+
+class ActivityTracker(QObject):
+    """
+    Filtro de eventos Qt que registra o instante (monotônico, contando o tempo
+    de suspensão) da última interação do usuário: teclado, mouse, rolagem e toque (QInputEvent).
+    O filtro apenas grava um timestamp; quem decide sobre inatividade é
+    uma verificação periódica que lê last_activity.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = get_logger(__name__)
+        self.last_activity = now()
+        self._watched = {}  # id(widget) -> widget
+
+    def eventFilter(self, obj, event):
+        # isinstance evita event.type(), que cria um enum Python a cada evento
+        if isinstance(event, QInputEvent):
+            self.last_activity = now()
+        return False
+
+    def touch(self):
+        """Registra atividade vinda de hooks do Anki (ex.: resposta mostrada)"""
+        self.last_activity = now()
+
+    def idle_seconds(self):
+        """Segundos desde a última atividade registrada"""
+        return now() - self.last_activity
+
+    def watch(self, widget):
+        """Instala o filtro no widget (uma única vez por widget)"""
+        if widget is None or id(widget) in self._watched:
+            return
+        widget.installEventFilter(self)
+        widget.destroyed.connect(functools.partial(self._forget, id(widget)))
+        self._watched[id(widget)] = widget
+
+    def watch_reviewer(self, mw):
+        """Instala o filtro na janela principal e no webview do revisor (incluindo o focus proxy,
+        que é quem recebe teclado e mouse no QtWebEngine)"""
+        self.watch(mw)
+        web = getattr(getattr(mw, "reviewer", None), "web", None)
+        if web is not None:
+            self.watch(web)
+            self.watch(web.focusProxy())
+
+    def unwatch_all(self):
+        """Remove o filtro de todos os widgets observados"""
+        for widget in self._watched.values():
+            try:
+                widget.removeEventFilter(self)
+            except RuntimeError:
+                pass
+        self._watched = {}
+
+    def _forget(self, key, obj=None):
+        """Descarta a referência a um widget destruído"""
+        self._watched.pop(key, None)
@@ -0,0 +1,175 @@
+# Copyright 2025 Carlos Duarte
+import math
+from dss_log_pipeline import get_logger
+
+logger = get_logger(__name__)
+
+WINDOW_LOCATIONS = ("bottom_right", "bottom_left", "center", "sequential")
+POPUP_LIFECYCLES = ("prewarmed", "low_memory")
+POPUP_SCREENS = ("primary", "main_window")  # Tela principal ou a que contém a janela do Anki
+# O que fazer com lembretes cujo prazo passou sem o addon rodar (computador suspenso):
+# "skip" descarta e mantém a fase, "fire_once" mostra um só e mantém a fase,
+# "reschedule" descarta e recomeça o intervalo a partir de agora
+MISSED_REMINDER_POLICIES = ("skip", "fire_once", "reschedule")
+
+DEFAULT_CONFIG = {
+    "deck": "",
+    "frequency": 1,  # Valor padrão de 1 minuto
+    "enabled": True,
+    "window_location": "bottom_right",
+    "popup_screen": "primary",
+    "inactivity_after_max_answer": False,
+    "inactivity_extra_minutes": 1,  # Valor padrão de 1 minuto
+    "popup_lifecycle": "prewarmed",  # "prewarmed" ou "low_memory"
+    "metrics_enabled": False,
+    "suggest_urgent_deck": True,  # Pré-seleciona no popup o deck com trabalho mais urgente
+    "low_power_timers": False,  # Alinha todos os prazos a uma grade de timer_granularity_secs
+    "timer_granularity_secs": 60,
+    "missed_reminder_policy": "reschedule"
+}
+
+
+def _is_bool(value):
+    return isinstance(value, bool)
+
+
+def _is_positive_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def _is_positive_number(value):
+    """Inteiro ou fracionário (ex.: frequência de 1.5 minuto, aceita desde as primeiras versões)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value) and value > 0
+
+
+# Validação de cada opção, feita uma única vez ao carregar
+VALIDATORS = {
+    "deck": lambda value: isinstance(value, str),
+    "frequency": _is_positive_number,
+    "enabled": _is_bool,
+    "window_location": lambda value: value in WINDOW_LOCATIONS,
+    "popup_screen": lambda value: value in POPUP_SCREENS,
+    "inactivity_after_max_answer": _is_bool,
+    "inactivity_extra_minutes": _is_positive_number,
+    "popup_lifecycle": lambda value: value in POPUP_LIFECYCLES,
+    "metrics_enabled": _is_bool,
+    "suggest_urgent_deck": _is_bool,
+    "low_power_timers": _is_bool,
+    "timer_granularity_secs": _is_positive_int,
+    "missed_reminder_policy": lambda value: value in MISSED_REMINDER_POLICIES,
+}
+
+
+class AddonConfig:
+    """
+    Configuração do addon já validada e imutável. As opções são atributos
+    (config.frequency, config.deck...); para alterar, use replace(), que
+    devolve uma nova instância.
+    """
+
+    __slots__ = tuple(DEFAULT_CONFIG)
+
+    def __init__(self, **values):
+        """Cria a configuração; opções ausentes ou inválidas recebem o valor padrão"""
+        for name, default in DEFAULT_CONFIG.items():
+            value = values.get(name, default)
+            if value is not default and not VALIDATORS[name](value):
+                logger.warning(f"Valor inválido para '{name}': {value!r}. Usando o padrão {default!r}")
+                value = default
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Cria a configuração a partir de um dicionário (chaves desconhecidas são ignoradas)"""
+        return cls(**{name: data[name] for name in DEFAULT_CONFIG if name in data})
+
+    def to_dict(self):
+        """Dicionário no formato dos arquivos .json, com a versão do esquema"""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["schema_version"] = SCHEMA_VERSION
+        return data
+
+    def replace(self, **changes):
+        """Retorna uma cópia com as opções informadas alteradas"""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return AddonConfig(**values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AddonConfig é imutável; use replace()")
+
+    def __eq__(self, other):
+        if not isinstance(other, AddonConfig):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"AddonConfig({values})"
+
+
+def _migrate_v0(data):
+    """
+    Versão 0 (arquivos sem schema_version): completa as opções que não existiam
+    quando o arquivo foi gravado e remove chaves desconhecidas.
+    """
+    return {name: data.get(name, default) for name, default in DEFAULT_CONFIG.items()}
+
+
+def _migrate_v1(data):
+    """Versão 1 -> 2: modo de baixo consumo dos timers"""
+    data = dict(data)
+    data.setdefault("low_power_timers", DEFAULT_CONFIG["low_power_timers"])
+    data.setdefault("timer_granularity_secs", DEFAULT_CONFIG["timer_granularity_secs"])
+    return data
+
+
+def _migrate_v2(data):
+    """Versão 2 -> 3: política para lembretes perdidos durante a suspensão"""
+    data = dict(data)
+    data.setdefault("missed_reminder_policy", DEFAULT_CONFIG["missed_reminder_policy"])
+    return data
+
+
+def _migrate_v3(data):
+    """Versão 3 -> 4: tela em que o popup é mostrado"""
+    data = dict(data)
+    data.setdefault("popup_screen", DEFAULT_CONFIG["popup_screen"])
+    return data
+
+
+# MIGRATIONS[n] converte um dicionário da versão n para a versão n + 1. Toda
+# mudança no formato (opção nova, renomeada ou com outro significado) ganha um
+# passo aqui, e os arquivos são atualizados no disco uma única vez
+MIGRATIONS = (
+    _migrate_v0,
+    _migrate_v1,
+    _migrate_v2,
+    _migrate_v3,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(data):
+    """
+    Atualiza um dicionário lido do disco até SCHEMA_VERSION.
+
+    Returns:
+        tuple: (dicionário atualizado, True se alguma migração foi aplicada)
+    """
+    version = data.get("schema_version", 0)
+    if not _is_positive_int(version):
+        version = 0
+    if version > SCHEMA_VERSION:
+        logger.warning(f"Configuração gravada por uma versão mais nova do addon (esquema {version})")
+        return data, False
+    if version == SCHEMA_VERSION:
+        return data, False
+    for step in MIGRATIONS[version:]:
+        data = step(data)
+    data["schema_version"] = SCHEMA_VERSION
+    logger.info("Configuração migrada do esquema %s para %s", version, SCHEMA_VERSION)
+    return data, True
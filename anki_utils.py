@@ -1,9 +1,70 @@
 # Copyright 2025 Carlos Duarte
 import aqt
-import logging
+import json
+import os
+from addon_config import AddonConfig, migrate
+from dss_config_writer import writer
+from deck_index import deck_index
+from dss_log_pipeline import get_logger
+from dss_metrics import instrument
 from translations import tr
 
 
+ADDON_DIR = os.path.dirname(__file__)
+USER_FILES_DIR = os.path.join(ADDON_DIR, "user_files")
+SETTINGS_PATH = os.path.join(ADDON_DIR, "settings.json")
+# Configuração compartilhada das versões anteriores; cada perfil herda dela na primeira abertura
+SHARED_USER_SETTINGS_PATH = os.path.join(ADDON_DIR, "settings_user.json")
+# Configuração do perfil aberto (ver set_profile)
+USER_SETTINGS_PATH = SHARED_USER_SETTINGS_PATH
+
+# Cache da configuração compartilhado por todas as instâncias de AnkiUtils.
+# Só é relido do disco quando o mtime/tamanho dos arquivos muda ou após set_config.
+_config_cache = {"stamp": None, "config": None}
+
+
+def _file_stamp(path):
+    """Retorna (mtime_ns, tamanho) do arquivo ou None se ele não existir"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _config_stamp():
+    """Assinatura dos dois arquivos de configuração usada para invalidar o cache"""
+    return (_file_stamp(USER_SETTINGS_PATH), _file_stamp(SETTINGS_PATH))
+
+
+def invalidate_config_cache():
+    """Descarta a configuração em cache, forçando nova leitura na próxima chamada"""
+    _config_cache["stamp"] = None
+    _config_cache["config"] = None
+
+
+def profile_slug(name):
+    """Nome do perfil do Anki em uma forma segura para nomes de arquivo"""
+    return "".join(c if c.isalnum() else "_" for c in (name or "default"))
+
+
+def set_profile(name):
+    """
+    Passa a ler e gravar a configuração do perfil informado, em
+    user_files/settings_user-<perfil>.json.
+
+    Args:
+        name: Nome do perfil do Anki (mw.pm.name)
+    """
+    global USER_SETTINGS_PATH
+    path = os.path.join(USER_FILES_DIR, f"settings_user-{profile_slug(name)}.json")
+    if path == USER_SETTINGS_PATH:
+        return
+    os.makedirs(USER_FILES_DIR, exist_ok=True)
+    USER_SETTINGS_PATH = path
+    invalidate_config_cache()
+
+
 class AnkiUtils:
     """
     Classe utilitária para interagir com a API do Anki.
@@ -11,7 +72,7 @@ class AnkiUtils:
     """
     
     def __init__(self):
-        self.logger = logging.getLogger(__name__.split('.')[0])
+        self.logger = get_logger(__name__)
 
     def main_window(self):
         """Retorna a janela principal do Anki"""
@@ -47,17 +108,44 @@ class AnkiUtils:
             self.logger.error(tr('error_get_selected_deck').format(str(e)))
             return ""
 
-    def get_decks(self):
-        """Retorna todos os decks disponíveis"""
+    @instrument("get_decks")
+    def get_decks(self, refresh=False):
+        """Retorna todos os decks disponíveis (DeckEntry com id, name, level e label)
+        
+        Usa o índice em cache, reconstruído apenas quando o conjunto de decks muda.
+        
+        Args:
+            refresh: Força a reconstrução do índice
+        """
+        return self.deck_index(refresh).entries
+
+    def deck_index(self, refresh=False):
+        """Retorna o índice de decks da coleção atual"""
         try:
-            decks = self.collection().decks
-            if decks is None:
+            collection = self.collection()
+            if collection.decks is None:
                 raise Exception(tr('exception_decks'))
-            return decks.all_names_and_ids()
+            if refresh:
+                deck_index.invalidate()
+            return deck_index.ensure(collection)
         except Exception as e:
             self.logger.error(tr('error_get_decks').format(str(e)))
             raise Exception(tr('exception_decks'))
 
+    def deck_id(self, name):
+        """Retorna o id do deck pelo nome completo, ou None se ele não existir"""
+        try:
+            deck_id = self.deck_index().id_for_name(name)
+        except Exception:
+            deck_id = None
+        if deck_id is None:
+            # O índice pode estar desatualizado (deck criado fora de uma operação do Anki)
+            deck = self.collection().decks.by_name(name)
+            if deck is not None:
+                deck_index.invalidate()
+                deck_id = deck['id']
+        return deck_id
+
     def scheduler(self):
         """Retorna o agendador do Anki"""
         try:
@@ -139,9 +227,9 @@ class AnkiUtils:
         try:
             collection = self.collection()
             if collection is not None:
-                deck = collection.decks.by_name(name)
-                if deck is not None:
-                    collection.decks.select(deck['id'])
+                deck_id = self.deck_id(name)
+                if deck_id is not None:
+                    collection.decks.select(deck_id)
                     try:
                         self.main_window().onOverview()
                     except AttributeError:
@@ -169,13 +257,13 @@ class AnkiUtils:
                 self.logger.error(tr('exception_collection'))
                 return False
                 
-            deck = collection.decks.by_name(name)
-            if deck is None:
+            deck_id = self.deck_id(name)
+            if deck_id is None:
                 self.logger.error(tr('log_deck_not_found').format(name))
                 return False
                 
             # Seleciona o deck
-            collection.decks.select(deck['id'])
+            collection.decks.select(deck_id)
             
             # Método 1: Tenta usar o método direto para iniciar o estudo
             try:
@@ -257,101 +345,102 @@ class AnkiUtils:
             self.logger.error(tr('error_get_current_card').format(str(e)))
             raise Exception(tr('exception_current_card'))
 
-    def merge_configs(self, default_config, user_config):
-        """Mescla configurações padrão com configurações do usuário, preservando valores do usuário"""
-        merged = default_config.copy()  # Começa com as configurações padrão
-        for key, value in user_config.items():
-            if key in merged:  # Se a chave existe nas configurações padrão
-                merged[key] = value  # Usa o valor do usuário
-        return merged
-
+    @instrument("get_config")
     def get_config(self):
-        """Obtém a configuração do addon, priorizando settings_user.json
+        """Obtém a configuração do addon (AddonConfig) do perfil aberto
         
-        - Primeiro tenta ler settings_user.json
-        - Se não existir, tenta ler settings.json
+        - Primeiro tenta ler a configuração do perfil
+        - Se não existir, herda settings_user.json (configuração compartilhada anterior)
+        - Se também não existir, tenta ler settings.json
         - Se nenhum existir, usa valores padrão
-        - Mescla com configurações padrão para garantir que novas opções sejam adicionadas
+        
+        Arquivos de versões anteriores do esquema são migrados (e o arquivo do perfil
+        regravado) uma única vez; a validação acontece só na leitura do disco. O
+        resultado fica em cache até que um dos arquivos mude no disco.
         """
-        import os
-        import json
-        settings_path = os.path.join(os.path.dirname(__file__), "settings.json")
-        user_settings_path = os.path.join(os.path.dirname(__file__), "settings_user.json")
-        default_config = {
-            "deck": "",
-            "frequency": 1,  # Valor padrão de 1 minuto
-            "enabled": True,
-            "window_location": "bottom_right",
-            "inactivity_after_max_answer": False,
-            "inactivity_extra_minutes": 1  # Valor padrão de 1 minuto
-        }
+        cached = _config_cache["config"]
+        if cached is not None and (writer.has_pending(USER_SETTINGS_PATH) or _config_stamp() == _config_cache["stamp"]):
+            return cached
         
         try:
-            # Primeiro tenta ler o arquivo do usuário
-            if os.path.exists(user_settings_path):
-                with open(user_settings_path, "r", encoding="utf-8") as f:
-                    user_config = json.load(f)
-                # Mescla com as configurações padrão
-                config = self.merge_configs(default_config, user_config)
-                # Se houve mudanças, atualiza o arquivo do usuário
-                if config != user_config:
-                    self.logger.info("Novas opções detectadas, atualizando settings_user.json")
-                    with open(user_settings_path, "w", encoding="utf-8") as f:
-                        json.dump(config, f, ensure_ascii=False, indent=4)
-                return config
-                
-            # Se não existir, tenta ler o arquivo padrão
-            if os.path.exists(settings_path):
-                with open(settings_path, "r", encoding="utf-8") as f:
-                    settings_config = json.load(f)
-                # Mescla com as configurações padrão
-                config = self.merge_configs(default_config, settings_config)
-                return config
-                
-            # Se nenhum existir, usa os valores padrão
-            return default_config
-            
+            config = self._load_config()
         except Exception as e:
             self.logger.error(tr('error_get_config').format(str(e)))
-            return default_config
+            return AddonConfig()
+        
+        # A assinatura é tirada depois da leitura, pois _load_config pode reescrever o arquivo
+        _config_cache["config"] = config
+        _config_cache["stamp"] = _config_stamp()
+        return config
+
+    def _load_config(self):
+        """Lê, migra e valida a configuração do disco, sem passar pelo cache"""
+        # Escritas agrupadas ainda não gravadas tornariam a leitura do disco obsoleta
+        if writer.has_pending():
+            writer.flush()
+        
+        # Primeiro tenta ler o arquivo do perfil; na primeira abertura, o compartilhado
+        for path in (USER_SETTINGS_PATH, SHARED_USER_SETTINGS_PATH):
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                user_config, migrated = migrate(json.load(f))
+            config = AddonConfig.from_dict(user_config)
+            # Grava a versão migrada (e validada) no arquivo do perfil, para não repetir
+            # a migração nem voltar a herdar o arquivo compartilhado
+            if migrated or path != USER_SETTINGS_PATH:
+                self.logger.info("Atualizando %s", os.path.basename(USER_SETTINGS_PATH))
+                writer.write(USER_SETTINGS_PATH, config.to_dict())
+            return config
+            
+        # Se não existir, tenta ler o arquivo padrão
+        if os.path.exists(SETTINGS_PATH):
+            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
+                settings_config, _ = migrate(json.load(f))
+            return AddonConfig.from_dict(settings_config)
+            
+        # Se nenhum existir, usa os valores padrão
+        return AddonConfig()
 
     def set_config(self, config):
-        """Salva a configuração do addon apenas em settings_user.json
+        """Salva a configuração do addon apenas no arquivo do perfil
         
-        - Salva apenas em settings_user.json
+        - Salva apenas no arquivo do perfil (user_files/settings_user-<perfil>.json)
         - settings.json é mantido como referência padrão
-        """
-        import os
-        import json
-        user_settings_path = os.path.join(os.path.dirname(__file__), "settings_user.json")
+        - A gravação é agrupada e atômica (ver ConfigWriter); o cache é atualizado na hora
         
+        Args:
+            config: AddonConfig, ou dicionário só com as opções a alterar (as demais
+                são mantidas; os valores são validados aqui)
+        """
         try:
+            if not isinstance(config, AddonConfig):
+                config = self.get_config().replace(**config)
+
             # Salva apenas no arquivo do usuário
-            with open(user_settings_path, "w", encoding="utf-8") as f:
-                json.dump(config, f, ensure_ascii=False, indent=4)
+            writer.write(USER_SETTINGS_PATH, config.to_dict())
                 
-            self.logger.info("Configurações salvas com sucesso em settings_user.json")
+            # Atualiza o cache com o que acabou de ser salvo
+            _config_cache["config"] = config
+            _config_cache["stamp"] = _config_stamp()
+            self.logger.info("Configurações salvas com sucesso em %s", os.path.basename(USER_SETTINGS_PATH))
             return True
         except Exception as e:
+            invalidate_config_cache()
             self.logger.error(tr('error_save_config').format(str(e)))
             return False
 
     def backup_config(self):
         """Cria um backup das configurações do usuário em settings.json"""
-        import os
-        import json
-        settings_path = os.path.join(os.path.dirname(__file__), "settings.json")
-        user_settings_path = os.path.join(os.path.dirname(__file__), "settings_user.json")
-        
         try:
-            if os.path.exists(user_settings_path):
+            writer.flush()
+            if os.path.exists(USER_SETTINGS_PATH):
                 # Lê as configurações do usuário
-                with open(user_settings_path, "r", encoding="utf-8") as f:
+                with open(USER_SETTINGS_PATH, "r", encoding="utf-8") as f:
                     config = json.load(f)
                     
                 # Salva no arquivo de backup (settings.json)
-                with open(settings_path, "w", encoding="utf-8") as f:
-                    json.dump(config, f, ensure_ascii=False, indent=4)
+                writer.write(SETTINGS_PATH, config)
                     
                 self.logger.info("Backup das configurações do usuário salvo com sucesso")
                 return True
@@ -362,20 +451,15 @@ class AnkiUtils:
 
     def restore_config(self):
         """Restaura as configurações do usuário de settings_user.json para settings.json"""
-        import os
-        import json
-        settings_path = os.path.join(os.path.dirname(__file__), "settings.json")
-        user_settings_path = os.path.join(os.path.dirname(__file__), "settings_user.json")
-        
         try:
-            if os.path.exists(user_settings_path):
+            writer.flush()
+            if os.path.exists(USER_SETTINGS_PATH):
                 # Lê as configurações do backup
-                with open(user_settings_path, "r", encoding="utf-8") as f:
+                with open(USER_SETTINGS_PATH, "r", encoding="utf-8") as f:
                     config = json.load(f)
                     
                 # Salva no arquivo principal
-                with open(settings_path, "w", encoding="utf-8") as f:
-                    json.dump(config, f, ensure_ascii=False, indent=4)
+                writer.write(SETTINGS_PATH, config)
                     
                 self.logger.info("Configurações do usuário restauradas com sucesso")
                 return True
@@ -383,40 +467,3 @@ class AnkiUtils:
         except Exception as e:
             self.logger.error(f"Erro ao restaurar configurações: {str(e)}")
             return False
-
-    def check_config_conflict(self):
-        """Verifica se há diferenças entre settings.json e settings_user.json e resolve o conflito"""
-        import os
-        import json
-        settings_path = os.path.join(os.path.dirname(__file__), "settings.json")
-        user_settings_path = os.path.join(os.path.dirname(__file__), "settings_user.json")
-        
-        try:
-            # Se nenhum dos arquivos existe, não há conflito
-            if not os.path.exists(settings_path) or not os.path.exists(user_settings_path):
-                return False
-                
-            # Lê ambos os arquivos
-            with open(settings_path, "r", encoding="utf-8") as f:
-                settings = json.load(f)
-            with open(user_settings_path, "r", encoding="utf-8") as f:
-                user_settings = json.load(f)
-                
-            # Verifica se há diferenças
-            if settings != user_settings:
-                self.logger.warning("Conflito detectado entre settings.json e settings_user.json")
-                
-                # Mescla as configurações, mantendo as do usuário e adicionando novas opções
-                merged_config = settings.copy()  # Começa com as configurações padrão
-                for key, value in user_settings.items():
-                    merged_config[key] = value  # Preserva os valores do usuário
-                    
-                self.logger.info("Mesclando configurações, preservando valores do usuário e adicionando novas opções")
-                self.set_config(merged_config)
-                    
-                return True
-                
-            return False
-        except Exception as e:
-            self.logger.error(f"Erro ao verificar conflito de configurações: {str(e)}")
-            return False
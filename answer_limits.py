@@ -0,0 +1,80 @@
+# Copyright 2025 Carlos Duarte
+from dss_log_pipeline import get_logger
+
+
+class AnswerLimitCache:
+    """
+    Tempo máximo de resposta (maxTaken, em segundos) de cada deck, definido no grupo
+    de opções do deck. Guarda dois mapas preenchidos sob demanda: deck -> grupo de
+    opções e grupo de opções -> limite, de modo que a consulta no hook de cada
+    cartão seja apenas uma busca em dicionário.
+
+    O primeiro mapa é descartado quando os decks mudam (um deck pode trocar de
+    grupo); o segundo, quando as opções de deck são salvas.
+    """
+
+    DEFAULT_CONF_ID = 1
+    DEFAULT_LIMIT_SECS = 120
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self._collection_key = None
+        self._deck_conf = {}  # deck_id -> id do grupo de opções
+        self._conf_limit = {}  # id do grupo de opções -> segundos
+
+    def invalidate(self):
+        """Descarta os dois mapas"""
+        self._deck_conf = {}
+        self._conf_limit = {}
+
+    def invalidate_decks(self):
+        """Descarta a associação deck -> grupo de opções"""
+        self._deck_conf = {}
+
+    def invalidate_configs(self):
+        """Descarta os limites guardados de cada grupo de opções"""
+        self._conf_limit = {}
+
+    def limit(self, collection, deck_id):
+        """
+        Retorna o tempo máximo de resposta (segundos) do deck.
+
+        Args:
+            collection: Coleção do Anki (mw.col)
+            deck_id: Deck de origem do cartão (card.odid or card.did)
+        """
+        key = id(collection)
+        if key != self._collection_key:
+            self.invalidate()
+            self._collection_key = key
+
+        conf_id = self._deck_conf.get(deck_id)
+        if conf_id is None:
+            conf_id = self._deck_conf[deck_id] = self._lookup_conf_id(collection, deck_id)
+        secs = self._conf_limit.get(conf_id)
+        if secs is None:
+            secs = self._conf_limit[conf_id] = self._lookup_limit(collection, conf_id)
+        return secs
+
+    def _lookup_conf_id(self, collection, deck_id):
+        """Grupo de opções do deck (decks filtrados não têm grupo; usa o padrão)"""
+        try:
+            deck = collection.decks.get(deck_id, default=False)
+            if deck and "conf" in deck:
+                return int(deck["conf"])  # pode estar salvo como string
+        except Exception as e:
+            self.logger.error(f"Erro ao obter as opções do deck {deck_id}: {str(e)}")
+        return self.DEFAULT_CONF_ID
+
+    def _lookup_limit(self, collection, conf_id):
+        """maxTaken do grupo de opções (o grupo padrão se ele não existir mais)"""
+        try:
+            conf = collection.decks.get_config(conf_id) or collection.decks.get_config(self.DEFAULT_CONF_ID)
+            if conf:
+                return conf.get("maxTaken", self.DEFAULT_LIMIT_SECS)
+        except Exception as e:
+            self.logger.error(f"Erro ao obter o tempo máximo de resposta: {str(e)}")
+        return self.DEFAULT_LIMIT_SECS
+
+
+answer_limits = AnswerLimitCache()
@@ -0,0 +1,188 @@
+# Copyright 2025 Carlos Duarte
+import os
+import struct
+import time
+from dss_config_writer import atomic_write
+from dss_log_pipeline import get_logger
+
+
+class P2Quantile:
+    """
+    Estimador de quantil online P² (Jain & Chlamtac, 1985): mantém apenas cinco
+    marcadores (alturas e posições), então a memória é constante e cada
+    observação custa O(1).
+    """
+
+    __slots__ = ("p", "count", "heights", "positions")
+
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []  # Até 5 observações: os próprios valores; depois, os 5 marcadores
+        self.positions = [1, 2, 3, 4, 5]
+
+    def _desired(self, i):
+        """Posição desejada do marcador i após count observações"""
+        p = self.p
+        return 1 + (self.count - 1) * (0, p / 2, p, (1 + p) / 2, 1)[i]
+
+    def add(self, x):
+        """Acrescenta uma observação"""
+        q = self.heights
+        self.count += 1
+        if self.count <= 5:
+            q.append(x)
+            if self.count == 5:
+                q.sort()
+            return
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in (1, 2, 3):
+            d = self._desired(i) - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                # Interpolação parabólica; se sair do intervalo dos vizinhos, linear
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def value(self):
+        """Estimativa atual do quantil, ou None sem observações"""
+        if not self.count:
+            return None
+        if self.count < 5:
+            values = sorted(self.heights)
+            return values[min(len(values) - 1, int(self.p * len(values)))]
+        return self.heights[2]
+
+
+class AnswerTimeModel:
+    """
+    Tempos de resposta por deck (deck de origem do cartão), resumidos por um
+    estimador P² do quantil QUANTILE. Alimentado a cada resposta, semeado a partir
+    do revlog quando não há estado salvo e persistido em um arquivo binário compacto
+    (RECORD.size bytes por deck).
+    """
+
+    QUANTILE = 0.95
+    MIN_SAMPLES = 20  # Abaixo disso, o limite global do Anki continua valendo
+
+    MAGIC = b"DSSQ"
+    HEADER = struct.Struct("<4sBf")  # magic, versão, quantil
+    RECORD = struct.Struct("<qI5f5I")  # deck_id, observações, 5 alturas, 5 posições
+    VERSION = 1
+
+    SEED_DAYS = 90
+    SEED_REVIEWS = 50000
+
+    # Tempo de cada resposta no revlog, do deck de origem do cartão, em ordem cronológica
+    SEED_SQL = """
+    select case when c.odid then c.odid else c.did end, r.time
+    from (select cid, time from revlog where id > ? and ease > 0 order by id desc limit ?) r
+    join cards c on c.id = r.cid
+    """
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.estimators = {}  # deck_id -> P2Quantile
+        self.path = None
+        self._dirty = False
+
+    def observe(self, deck_id, secs):
+        """Registra o tempo de resposta (segundos) de um cartão do deck"""
+        estimator = self.estimators.get(deck_id)
+        if estimator is None:
+            estimator = self.estimators[deck_id] = P2Quantile(self.QUANTILE)
+        estimator.add(secs)
+        self._dirty = True
+
+    def threshold(self, deck_id):
+        """Quantil do tempo de resposta do deck em segundos, ou None se houver poucas amostras"""
+        estimator = self.estimators.get(deck_id)
+        if estimator is None or estimator.count < self.MIN_SAMPLES:
+            return None
+        return estimator.value()
+
+    def seed(self, col):
+        """
+        Alimenta os estimadores com as respostas recentes do revlog (uma única consulta).
+        Pode rodar em segundo plano; retorna os estimadores sem alterar o modelo.
+        """
+        since_ms = int((time.time() - self.SEED_DAYS * 86400) * 1000)
+        rows = col.db.all(self.SEED_SQL, since_ms, self.SEED_REVIEWS)
+        estimators = {}
+        # A subconsulta traz as mais recentes primeiro; o P² recebe em ordem cronológica
+        for deck_id, time_ms in reversed(rows):
+            estimator = estimators.get(deck_id)
+            if estimator is None:
+                estimator = estimators[deck_id] = P2Quantile(self.QUANTILE)
+            estimator.add(time_ms / 1000)
+        return estimators
+
+    def apply_seed(self, estimators):
+        """Adota os estimadores semeados para os decks que ainda não têm estado"""
+        for deck_id, estimator in estimators.items():
+            self.estimators.setdefault(deck_id, estimator)
+        self._dirty = True
+
+    def load(self, path):
+        """Carrega o estado salvo; retorna False se o arquivo não existir ou for incompatível"""
+        self.path = path
+        self.estimators = {}
+        self._dirty = False
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        try:
+            magic, version, quantile = self.HEADER.unpack_from(data)
+            if magic != self.MAGIC or version != self.VERSION or abs(quantile - self.QUANTILE) > 1e-6:
+                return False
+            for record in self.RECORD.iter_unpack(data[self.HEADER.size:]):
+                deck_id, count = record[0], record[1]
+                estimator = P2Quantile(self.QUANTILE)
+                estimator.count = count
+                estimator.heights = list(record[2:2 + min(count, 5)])
+                estimator.positions = list(record[7:12])
+                self.estimators[deck_id] = estimator
+        except struct.error as e:
+            self.logger.error(f"Arquivo de tempos de resposta inválido: {str(e)}")
+            self.estimators = {}
+            return False
+        return True
+
+    def save(self):
+        """Grava o estado (se houver mudanças) de forma atômica"""
+        if not self._dirty or self.path is None:
+            return
+        parts = [self.HEADER.pack(self.MAGIC, self.VERSION, self.QUANTILE)]
+        pack = self.RECORD.pack
+        for deck_id, estimator in self.estimators.items():
+            heights = (estimator.heights + [0.0] * 5)[:5]
+            parts.append(pack(deck_id, estimator.count, *heights, *estimator.positions))
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            atomic_write(self.path, b"".join(parts))
+            self._dirty = False
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar tempos de resposta: {str(e)}")
+
+
+answer_times = AnswerTimeModel()
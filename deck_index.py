@@ -0,0 +1,110 @@
+# Copyright 2025 Carlos Duarte
+from dss_log_pipeline import get_logger
+
+
+class DeckEntry:
+    """Deck indexado: id, nome completo, posição, nível na hierarquia e rótulo indentado"""
+
+    __slots__ = ("id", "name", "row", "level", "label", "parent_id", "children")
+
+    def __init__(self, deck_id, name, row):
+        self.id = deck_id
+        self.row = row
+        self.name = name
+        self.level = name.count("::")
+        self.label = "   " * self.level + name.rsplit("::", 1)[-1] if self.level > 0 else name
+        self.parent_id = None
+        self.children = []
+
+    def __repr__(self):
+        return f"DeckEntry(id={self.id}, name={self.name!r})"
+
+
+class DeckIndex:
+    """
+    Índice em memória dos decks da coleção (nome -> id, id -> nome, árvore e rótulos).
+    É reconstruído apenas quando invalidado (mudança no conjunto de decks) ou
+    quando a coleção aberta muda.
+    """
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.entries = []  # na ordem de all_names_and_ids (hierárquica)
+        self.by_name = {}
+        self.by_id = {}
+        self.roots = []
+        self.version = 0  # incrementado a cada reconstrução
+        self._collection_key = None
+        self._dirty = True
+
+    def invalidate(self):
+        """Marca o índice para reconstrução no próximo acesso"""
+        self._dirty = True
+
+    def ensure(self, collection):
+        """
+        Garante que o índice reflete a coleção informada, reconstruindo se necessário.
+
+        Args:
+            collection: Coleção do Anki (mw.col)
+
+        Returns:
+            DeckIndex: O próprio índice
+        """
+        key = id(collection)
+        if self._dirty or key != self._collection_key:
+            self.rebuild(collection.decks.all_names_and_ids())
+            self._collection_key = key
+        return self
+
+    def rebuild(self, names_and_ids):
+        """Reconstrói o índice a partir de uma sequência de objetos com .id e .name"""
+        entries = [DeckEntry(deck.id, deck.name, row) for row, deck in enumerate(names_and_ids)]
+        by_name = {entry.name: entry for entry in entries}
+        roots = []
+        for entry in entries:
+            if entry.level:
+                parent = by_name.get(entry.name.rsplit("::", 1)[0])
+                if parent is not None:
+                    entry.parent_id = parent.id
+                    parent.children.append(entry)
+                    continue
+            roots.append(entry)
+        self.entries = entries
+        self.by_name = by_name
+        self.by_id = {entry.id: entry for entry in entries}
+        self.roots = roots
+        self.version += 1
+        self._dirty = False
+        self.logger.debug("Índice de decks reconstruído: %d decks", len(entries))
+
+    def id_for_name(self, name):
+        """Retorna o id do deck com o nome completo informado, ou None"""
+        entry = self.by_name.get(name)
+        return entry.id if entry is not None else None
+
+    def row_for_name(self, name):
+        """Retorna a posição do deck na lista de entradas, ou -1"""
+        entry = self.by_name.get(name)
+        return entry.row if entry is not None else -1
+
+    def name_for_id(self, deck_id):
+        """Retorna o nome completo do deck com o id informado, ou None"""
+        entry = self.by_id.get(deck_id)
+        return entry.name if entry is not None else None
+
+    def subtree_ids(self, deck_id):
+        """Retorna os ids do deck e de todos os seus descendentes"""
+        entry = self.by_id.get(deck_id)
+        if entry is None:
+            return []
+        ids = []
+        stack = [entry]
+        while stack:
+            current = stack.pop()
+            ids.append(current.id)
+            stack.extend(current.children)
+        return ids
+
+
+deck_index = DeckIndex()
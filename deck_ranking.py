@@ -0,0 +1,154 @@
+# Copyright 2025 Carlos Duarte
+import time
+from dss_log_pipeline import get_logger
+
+
+# Carga de cada deck (sem subdecks) em uma única passada pelo índice ix_cards_sched:
+# revisões atrasadas e total vencido (revisões até hoje + aprendizado vencido).
+# Filtrar no where, em vez de somar condições sobre todos os cartões, reduz a agregação
+# aos cartões vencidos
+WORKLOAD_SQL = """
+select did, sum(queue = 2 and due < ?), count()
+from cards
+where (queue = 2 and due <= ?) or (queue = 3 and due <= ?) or (queue in (1, 4) and due <= ?)
+group by did
+"""
+
+# Tempo médio de resposta (ms) por deck nas revisões mais recentes. O limite de
+# revisões evita buscar o deck de cada cartão em históricos muito grandes
+ANSWER_TIME_SQL = """
+select c.did, avg(r.time)
+from (select cid, time from revlog where id > ? order by id desc limit ?) r
+join cards c on c.id = r.cid
+group by c.did
+"""
+
+
+class DeckScore:
+    """Pontuação de urgência de um deck"""
+
+    __slots__ = ("deck_id", "overdue", "due_today", "score")
+
+    def __init__(self, deck_id, overdue, due_today, score):
+        self.deck_id = deck_id
+        self.overdue = overdue
+        self.due_today = due_today
+        self.score = score
+
+    def __repr__(self):
+        return f"DeckScore(deck_id={self.deck_id}, score={self.score:.1f})"
+
+
+class DeckRanking:
+    """
+    Classifica os decks pela urgência do trabalho pendente: minutos estimados
+    (cartões × tempo médio de resposta do deck no revlog), com revisões atrasadas
+    pesando OVERDUE_WEIGHT vezes mais que a carga do dia.
+
+    Os tempos médios vêm das últimas HISTORY_REVIEWS revisões (de no máximo
+    HISTORY_DAYS dias) e são calculados uma vez por dia; a carga é recalculada quando
+    a coleção muda (col.mod). Tudo roda em segundo plano (QueryOp).
+    """
+
+    OVERDUE_WEIGHT = 2.0
+    HISTORY_DAYS = 30
+    HISTORY_REVIEWS = 20000
+    DEFAULT_ANSWER_SECS = 10.0
+    MAX_AGE_SECS = 300
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self._answer_secs = None  # (chave do dia, dict deck_id -> segundos, média geral)
+        self._ranking = None  # (chave da coleção, instante monotônico, lista de DeckScore)
+        self._pending = None  # callbacks aguardando a classificação em andamento
+
+    def invalidate(self):
+        """Descarta a classificação e os tempos médios guardados"""
+        self._answer_secs = None
+        self._ranking = None
+
+    def get(self, collection):
+        """Retorna a classificação guardada (maior urgência primeiro), se ainda for válida"""
+        if self._ranking is None:
+            return None
+        key, stamp, ranking = self._ranking
+        if key != (id(collection), collection.mod) or time.monotonic() - stamp > self.MAX_AGE_SECS:
+            return None
+        return ranking
+
+    def request(self, parent, collection, callback=None):
+        """
+        Obtém a classificação; usa o cache ou a calcula em segundo plano.
+
+        Args:
+            parent: Widget pai da operação (normalmente mw)
+            collection: Coleção do Anki (mw.col)
+            callback: Função chamada na thread principal com a lista de DeckScore
+        """
+        ranking = self.get(collection)
+        if ranking is not None:
+            if callback is not None:
+                callback(ranking)
+            return
+        if self._pending is not None:
+            if callback is not None:
+                self._pending.append(callback)
+            return
+        self._pending = [callback] if callback is not None else []
+
+        from aqt.operations import QueryOp
+        QueryOp(
+            parent=parent,
+            op=self._compute,
+            success=self._on_result,
+        ).failure(self._on_failure).run_in_background()
+
+    def _compute(self, col):
+        """Executada em segundo plano: calcula a classificação de todos os decks"""
+        key = (id(col), col.mod)
+        today = col.sched.today
+        answer_secs, default_secs = self._answer_times(col, today)
+        learn_cutoff = int(time.time()) + col.get_config("collapseTime", 1200)
+
+        ranking = []
+        for did, overdue, due in col.db.all(WORKLOAD_SQL, today, today, today, learn_cutoff):
+            due_today = due - overdue
+            secs = answer_secs.get(did, default_secs)
+            score = (self.OVERDUE_WEIGHT * overdue + due_today) * secs / 60
+            ranking.append(DeckScore(did, overdue, due_today, score))
+        ranking.sort(key=lambda s: s.score, reverse=True)
+        return key, ranking
+
+    def _answer_times(self, col, today):
+        """Tempo médio de resposta (s) por deck, recalculado uma vez por dia"""
+        day_key = (id(col), today)
+        cached = self._answer_secs
+        if cached is not None and cached[0] == day_key:
+            return cached[1], cached[2]
+        since_ms = int((time.time() - self.HISTORY_DAYS * 86400) * 1000)
+        answer_secs = {
+            did: avg_ms / 1000
+            for did, avg_ms in col.db.all(ANSWER_TIME_SQL, since_ms, self.HISTORY_REVIEWS)
+        }
+        default_secs = (
+            sum(answer_secs.values()) / len(answer_secs) if answer_secs else self.DEFAULT_ANSWER_SECS
+        )
+        self._answer_secs = (day_key, answer_secs, default_secs)
+        return answer_secs, default_secs
+
+    def _on_result(self, result):
+        key, ranking = result
+        self._ranking = (key, time.monotonic(), ranking)
+        callbacks, self._pending = self._pending or [], None
+        for callback in callbacks:
+            try:
+                callback(ranking)
+            except Exception as e:
+                self.logger.error(f"Erro ao entregar a classificação dos decks: {str(e)}")
+
+    def _on_failure(self, error):
+        self._pending = None
+        self.logger.error(f"Erro ao classificar os decks: {str(error)}")
+
+
+deck_ranking = DeckRanking()
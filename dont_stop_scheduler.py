@@ -1,42 +1,55 @@
 # Copyright 2025 Carlos Duarte
-from aqt.qt import QTimer
 import time
-import logging
 from aqt import mw
+from addon_config import AddonConfig
+from dss_log_pipeline import get_logger
+from dss_metrics import instrument
 
 
 class DontStopScheduler:
     """
     Scheduler responsible for study reminder intervals.
-    Uses a QTimer to trigger reminders at configurable intervals.
+    Uses deadlines in the shared TimerEngine to trigger reminders at configurable intervals.
     """
 
-    def __init__(self, alarm_func, cancel_func, anki_utils):
+    # Antecedência (em segundos) com que prefetch_func é chamada antes de cada lembrete
+    PREFETCH_LEAD_SECS = 15
+
+    def __init__(self, alarm_func, cancel_func, anki_utils, prefetch_func=None, timer_engine=None):
         """
         Inicializa o agendador.
         
         Args:
-            alarm_func: Função a ser chamada quando o timer disparar
+            alarm_func: Função chamada com o motivo do lembrete ("schedule" ou "test")
             cancel_func: Função a ser chamada quando o timer for cancelado
             anki_utils: Instância do módulo aqt.utils
+            prefetch_func: Função chamada pouco antes de cada lembrete (ex.: pré-carregar contagens)
+            timer_engine: Motor de prazos compartilhado (um próprio é criado se omitido)
         """
         self.alarm_func = alarm_func
         self.cancel_func = cancel_func
+        self.prefetch_func = prefetch_func
         self.anki_utils = anki_utils
-        self.logger = logging.getLogger(__name__.split('.')[0])
+        self.logger = get_logger(__name__)
         
         # Lê a configuração inicial
         try:
             config = self.anki_utils.get_config()
-            frequency = config.get('frequency', 1)  # Valor padrão de 1 minuto
+            frequency = config.frequency
             self.schedule_interval = frequency * 60  # Converte minutos para segundos
-            self.logger.debug(f'Frequência inicial lida do config: {frequency} minutos')
+            self.missed_policy = config.missed_reminder_policy
+            self.logger.debug('Frequência inicial lida do config: %s minutos', frequency)
         except Exception as e:
             self.logger.error(f'Erro ao ler configuração inicial: {str(e)}')
             self.schedule_interval = 60  # Valor padrão em segundos (1 minuto)
+            self.missed_policy = "reschedule"
         
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.exec_schedule)
+        if timer_engine is None:
+            from dss_timer_engine import TimerEngine
+            timer_engine = TimerEngine()
+        self.timer_engine = timer_engine
+        self.alarm_handle = None  # Prazo do próximo lembrete
+        self.prefetch_handle = None  # Prazo do próximo pré-carregamento
         self.enabled = False
         self.paused = False
         self.in_review = False
@@ -44,11 +57,81 @@ class DontStopScheduler:
 
     def reset_and_start_timer(self):
         """Reseta e inicia o timer de lembrete com o intervalo atual."""
-        self.timer.stop()
+        self.stop_timers()
         if self.enabled:
-            interval_ms = self.schedule_interval * 1000
-            self.timer.start(interval_ms)
-            self.logger.debug(f"Timer de lembrete resetado para {self.schedule_interval // 60} minutos")
+            self.start_timers()
+            self.logger.debug("Timer de lembrete resetado para %d minutos", self.schedule_interval // 60)
+
+    def start_timers(self):
+        """Agenda o próximo lembrete e o pré-carregamento que o antecede"""
+        self.alarm_handle = self.timer_engine.schedule(self.schedule_interval, self.on_alarm, self.alarm_handle)
+        self.arm_prefetch()
+
+    def stop_timers(self):
+        """Cancela o próximo lembrete e o pré-carregamento"""
+        self.timer_engine.cancel(self.alarm_handle)
+        self.timer_engine.cancel(self.prefetch_handle)
+
+    def is_active(self):
+        """Indica se há um lembrete agendado"""
+        return self.timer_engine.is_pending(self.alarm_handle)
+
+    def dispose(self):
+        """Cancela os prazos; o agendador não pode mais ser usado"""
+        self.enabled = False
+        self.stop_timers()
+
+    def on_alarm(self):
+        """
+        Prazo do lembrete: agenda o próximo (o intervalo é periódico) e executa o atual.
+
+        Os prazos seguem a fase original (múltiplos do intervalo desde o início), sem
+        acumular o atraso de cada disparo. Se o prazo venceu muito atrasado (computador
+        suspenso), os lembretes perdidos não são disparados em rajada: missed_policy
+        decide entre mostrar um só, nenhum, ou recomeçar o intervalo agora.
+        """
+        interval = self.schedule_interval
+        lateness = self.timer_engine.lateness
+        # Próximo múltiplo do intervalo depois de agora, calculado em O(1)
+        delay = interval - lateness % interval
+        fire = True
+        if self.timer_engine.is_late(interval):
+            missed = int(lateness // interval) + 1
+            self.logger.info("Lembrete atrasado %.0f segundos (%d perdido(s)), política: %s", lateness, missed, self.missed_policy)
+            if self.missed_policy == "reschedule":
+                delay = interval
+                fire = False
+            elif self.missed_policy == "skip":
+                fire = False
+        self.alarm_handle = self.timer_engine.schedule(delay, self.on_alarm, self.alarm_handle)
+        # O pré-carregamento é rearmado a cada ciclo
+        self.arm_prefetch()
+        if fire:
+            self.exec_schedule()
+
+    def arm_prefetch(self):
+        """Agenda prefetch_func para pouco antes do próximo lembrete.
+
+        No modo de baixo consumo, um prazo a menos que granularity segundos do lembrete
+        cairia no mesmo despertar; nesse caso o pré-carregamento é omitido e as contagens
+        são pedidas pelo próprio popup.
+        """
+        if self.prefetch_func is None:
+            return
+        remaining = self.timer_engine.remaining(self.alarm_handle)
+        lead = min(self.PREFETCH_LEAD_SECS, self.schedule_interval / 2)
+        if remaining is None or lead < self.timer_engine.granularity:
+            self.timer_engine.cancel(self.prefetch_handle)
+            return
+        self.prefetch_handle = self.timer_engine.schedule(max(0, remaining - lead), self.exec_prefetch, self.prefetch_handle)
+
+    def exec_prefetch(self):
+        """Executa o pré-carregamento, se o lembrete puder ser mostrado no próximo disparo"""
+        try:
+            if self.enabled and not self.paused and self.anki_utils.get_config().enabled:
+                self.prefetch_func()
+        except Exception as e:
+            self.logger.error(f'Erro ao pré-carregar dados do lembrete: {str(e)}')
 
     def set_schedule(self, interval):
         """
@@ -58,7 +141,7 @@ class DontStopScheduler:
             interval: Intervalo em segundos
         """
         try:
-            self.logger.info("Definindo agendamento: %s" % time.ctime())
+            self.logger.info("Definindo agendamento: %s", time.ctime())
             
             if interval <= 0:
                 self.logger.warning(f"Intervalo inválido: {interval}. Usando o valor padrão de 60 segundos (1 minuto).")
@@ -71,23 +154,29 @@ class DontStopScheduler:
             self.logger.error(f"Erro ao definir o agendamento: {str(e)}")
             return False
 
-    def exec_schedule(self):
-        """Executa o agendamento"""
+    @instrument("exec_schedule")
+    def exec_schedule(self, reason="schedule"):
+        """
+        Executa o agendamento.
+
+        Args:
+            reason: "schedule" (prazo do agendador) ou "test" (botão Testar Lembrete),
+                repassado a alarm_func e registrado no diário
+        """
         try:
             config = self.anki_utils.get_config()
             
             # Verifica se o addon está habilitado
-            if not config.get('enabled', True):
+            if not config.enabled:
                 self.logger.info("Addon desabilitado, pulando lembrete")
                 return
 
             # Verifica se está em modo de revisão
             if mw.state == "review":
-                self.logger.debug(f'Em modo de revisão. Inatividade após resposta máxima: {config.get("inactivity_after_max_answer", False)}')
-                if config.get("inactivity_after_max_answer", False):
+                self.logger.debug('Em modo de revisão. Inatividade após resposta máxima: %s', config.inactivity_after_max_answer)
+                if config.inactivity_after_max_answer:
                     # Em revisão com inatividade ativada, usa o timer do cartão
-                    extra_minutes = config.get('inactivity_extra_minutes', 1)
-                    self.logger.info(f'Timer extra de inatividade configurado: {extra_minutes} minutos')
+                    self.logger.info('Timer extra de inatividade configurado: %s minutos', config.inactivity_extra_minutes)
                     return
                 else:
                     # Em revisão sem inatividade, não mostra popup
@@ -95,8 +184,8 @@ class DontStopScheduler:
                     return
             
             # Fora da revisão ou em revisão sem inatividade, mostra popup normal
-            self.logger.debug(f'Timer normal ativo com intervalo de {self.schedule_interval // 60} minutos')
-            self.alarm_func()
+            self.logger.debug('Timer normal ativo com intervalo de %d minutos', self.schedule_interval // 60)
+            self.alarm_func(reason)
             
         except Exception as e:
             self.logger.error(f'Erro ao executar agendamento: {str(e)}')
@@ -106,16 +195,14 @@ class DontStopScheduler:
         Inicia o agendamento.
         """
         try:
-            self.logger.info("Iniciando agendamento: %s" % time.ctime())
+            self.logger.info("Iniciando agendamento: %s", time.ctime())
             
-            if self.timer.isActive():
-                self.timer.stop()
-                
-            self.timer.start(self.schedule_interval * 1000)
+            self.stop_timers()
+            self.start_timers()
             self.enabled = True
             self.paused = False
             self.in_review = False
-            self.logger.info(f"Timer iniciado com intervalo de {self.schedule_interval // 60} minutos")
+            self.logger.info("Timer iniciado com intervalo de %d minutos", self.schedule_interval // 60)
             return True
         except Exception as e:
             self.logger.error(f"Erro ao iniciar o agendamento: {str(e)}")
@@ -127,10 +214,9 @@ class DontStopScheduler:
         Para o agendamento.
         """
         try:
-            self.logger.info("Parando agendamento: %s" % time.ctime())
+            self.logger.info("Parando agendamento: %s", time.ctime())
             
-            if self.timer.isActive():
-                self.timer.stop()
+            self.stop_timers()
                 
             try:
                 self.cancel_func()
@@ -148,49 +234,44 @@ class DontStopScheduler:
         Atualiza o estado do agendamento com base nas configurações.
         
         Args:
-            config: Dicionário com as configurações
+            config: AddonConfig (já validada ao ser carregada)
         """
         try:
-            if not isinstance(config, dict):
+            if not isinstance(config, AddonConfig):
                 self.logger.error(f"Configuração inválida: {config}")
                 return False
                 
-            # Obtém a frequência da configuração
-            self.logger.debug(f'Config recebida: {config}')
-            frequency = config.get('frequency', 1)  # Valor padrão de 1 minuto
-            self.logger.debug(f'Frequência obtida do config: {frequency}')
-            
-            # Obtém o tempo extra de inatividade
-            extra_minutes = config.get('inactivity_extra_minutes', 1)  # Valor padrão de 1 minuto
-            self.logger.info(f'Timer extra de inatividade configurado: {extra_minutes} minutos')
-            
-            # Verifica se a frequência é válida
-            if not isinstance(frequency, (int, float)) or frequency <= 0:
-                self.logger.warning(f"Frequência inválida: {frequency}. Usando o valor padrão de 1 minuto.")
-                frequency = 1
-                
-            # Verifica se o tempo extra é válido
-            if not isinstance(extra_minutes, (int, float)) or extra_minutes <= 0:
-                self.logger.warning(f"Tempo extra inválido: {extra_minutes}. Usando o valor padrão de 1 minuto.")
-                extra_minutes = 1
+            self.logger.debug('Config recebida: %s', config)
+
+            # Modo de baixo consumo: prazos alinhados a uma grade grossa e compartilhada
+            granularity = config.timer_granularity_secs if config.low_power_timers else 0
+            if self.timer_engine.granularity != granularity:
+                self.logger.info('Granularidade dos timers: %s segundos', granularity)
+                self.timer_engine.set_coalescing(granularity)
+                if self.enabled and not self.paused:
+                    self.start_timers()
+
+            self.missed_policy = config.missed_reminder_policy
+
+            frequency = config.frequency
+            self.logger.info('Timer extra de inatividade configurado: %s minutos', config.inactivity_extra_minutes)
                 
             # Converte minutos para segundos
             new_interval = frequency * 60
-            self.logger.debug(f'Novo intervalo em segundos: {new_interval}')
+            self.logger.debug('Novo intervalo em segundos: %s', new_interval)
             
             # Atualiza o intervalo se necessário
             if self.schedule_interval != new_interval:
-                self.logger.info(f'Timer normal atualizado: {self.schedule_interval // 60} -> {frequency} minutos')
+                self.logger.info('Timer normal atualizado: %d -> %s minutos', self.schedule_interval // 60, frequency)
                 self.schedule_interval = new_interval
                 if self.enabled:
                     self.start_schedule()
 
-            # Obtém o estado habilitado da configuração
-            enabled = config.get('enabled', True)  # Valor padrão True
+            enabled = config.enabled
             
             # Reinicia o agendamento se o estado habilitado/desabilitado mudou
             if self.enabled != enabled:
-                self.logger.debug(f'Estado habilitado mudou de [{self.enabled}] para [{enabled}]')
+                self.logger.debug('Estado habilitado mudou de [%s] para [%s]', self.enabled, enabled)
                 if enabled:
                     self.start_schedule()
                 else:
@@ -205,8 +286,7 @@ class DontStopScheduler:
         """Pausa o agendamento temporariamente"""
         try:
             self.logger.info("Pausando agendamento")
-            if self.timer.isActive():
-                self.timer.stop()
+            self.stop_timers()
             self.paused = True
             self.in_review = True
         except Exception as e:
@@ -217,11 +297,11 @@ class DontStopScheduler:
         try:
             self.logger.info("Retomando agendamento")
             if self.paused and self.enabled:
-                self.timer.start(self.schedule_interval * 1000)
+                self.start_timers()
                 self.paused = False
                 self.in_review = False
-                self.logger.info(f"Timer reiniciado com intervalo de {self.schedule_interval // 60} minutos")
+                self.logger.info("Timer reiniciado com intervalo de %d minutos", self.schedule_interval // 60)
             else:
-                self.logger.info("Não foi possível retomar o agendamento: paused={}, enabled={}".format(self.paused, self.enabled))
+                self.logger.info("Não foi possível retomar o agendamento: paused=%s, enabled=%s", self.paused, self.enabled)
         except Exception as e:
             self.logger.error(f"Erro ao retomar agendamento: {str(e)}")
\ No newline at end of file
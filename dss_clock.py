@@ -0,0 +1,23 @@
+# Copyright 2025 Carlos Duarte
+import functools
+import sys
+import time
+
+# Relógio monotônico que continua contando enquanto o computador está suspenso,
+# usado em todos os prazos e medições de inatividade do addon. Por ser monotônico,
+# não é afetado por ajustes do relógio do sistema (NTP, horário de verão, mudança
+# manual). time.monotonic não serve no Linux e no macOS, onde ele para durante a
+# suspensão: um prazo de 10 minutos venceria 10 minutos "acordados" depois.
+#
+# now() é chamado no filtro de eventos a cada interação; functools.partial sobre
+# a função C custa o mesmo que time.monotonic.
+if hasattr(time, "CLOCK_BOOTTIME"):
+    # Linux: CLOCK_MONOTONIC + tempo suspenso
+    now = functools.partial(time.clock_gettime, time.CLOCK_BOOTTIME)
+elif sys.platform == "darwin":
+    # macOS: o CLOCK_MONOTONIC do sistema inclui o tempo em repouso
+    # (time.monotonic usa mach_absolute_time, que não inclui)
+    now = functools.partial(time.clock_gettime, time.CLOCK_MONOTONIC)
+else:
+    # Windows e demais: time.monotonic
+    now = time.monotonic
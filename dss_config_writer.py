@@ -0,0 +1,167 @@
+# Copyright 2025 Carlos Duarte
+import atexit
+import json
+import os
+import stat
+import tempfile
+from aqt.qt import QTimer, QCoreApplication
+from dss_log_pipeline import get_logger
+
+
+# umask do processo, lido uma vez na importação (os.umask só lê trocando o valor)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(path, data):
+    """
+    Grava bytes em um arquivo temporário no mesmo diretório e o renomeia sobre o destino.
+    O arquivo gravado mantém as permissões do original (o mkstemp cria com 0600); um
+    arquivo novo recebe as permissões padrão, como se fosse criado com open().
+    """
+    directory = os.path.dirname(path) or "."
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ConfigWriter:
+    """
+    Único ponto de escrita dos arquivos de configuração do addon.
+    Agrupa rajadas de escritas em um único flush, ignora conteúdo idêntico
+    ao que já está no disco e grava de forma atômica (temp + fsync + rename).
+    """
+
+    def __init__(self, delay_ms=500):
+        """
+        Inicializa o escritor.
+
+        Args:
+            delay_ms: Janela (em milissegundos) para agrupar escritas antes do flush
+        """
+        self.delay_ms = delay_ms
+        self.logger = get_logger(__name__)
+        self._pending = {}  # caminho -> bytes ainda não gravados
+        self._on_disk = {}  # caminho -> (assinatura do arquivo, bytes conhecidos no disco)
+        self._timer = None
+
+    @staticmethod
+    def serialize(config):
+        """Serializa a configuração no mesmo formato usado nos arquivos .json"""
+        return json.dumps(config, ensure_ascii=False, indent=4).encode("utf-8")
+
+    def write(self, path, config):
+        """
+        Agenda a gravação de uma configuração.
+
+        Args:
+            path: Caminho do arquivo
+            config: Dicionário a ser gravado
+
+        Returns:
+            bool: True se uma gravação foi agendada, False se o conteúdo já era idêntico
+        """
+        data = self.serialize(config)
+        if self._pending.get(path) == data:
+            return False
+        if self._read_on_disk(path) == data:
+            # Uma escrita anterior ainda pendente seria desfeita por esta
+            self._pending.pop(path, None)
+            return False
+        self._pending[path] = data
+        self._schedule_flush()
+        return True
+
+    def has_pending(self, path=None):
+        """Indica se há escritas pendentes (para um caminho específico ou qualquer um)"""
+        if path is None:
+            return bool(self._pending)
+        return path in self._pending
+
+    def flush(self):
+        """Grava imediatamente todas as escritas pendentes"""
+        if self._timer is not None:
+            try:
+                self._timer.stop()
+            except RuntimeError:
+                # O QTimer já foi destruído (ex.: flush chamado pelo atexit)
+                pass
+        pending, self._pending = self._pending, {}
+        ok = True
+        for path, data in pending.items():
+            try:
+                atomic_write(path, data)
+                self._on_disk[path] = (self._stamp(path), data)
+            except Exception as e:
+                ok = False
+                self._on_disk.pop(path, None)
+                self.logger.error(f"Erro ao gravar {os.path.basename(path)}: {str(e)}")
+        return ok
+
+    def dispose(self):
+        """Grava as escritas pendentes e destrói o QTimer (recriado se houver nova escrita)"""
+        self.flush()
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            try:
+                timer.deleteLater()
+            except RuntimeError:
+                pass
+
+    @staticmethod
+    def _stamp(path):
+        """Retorna (mtime_ns, tamanho) do arquivo ou None se ele não existir"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_on_disk(self, path):
+        """Retorna o conteúdo atual do arquivo, relendo o disco só se ele mudou"""
+        stamp = self._stamp(path)
+        if stamp is None:
+            return None
+        known = self._on_disk.get(path)
+        if known is not None and known[0] == stamp:
+            return known[1]
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._on_disk[path] = (stamp, data)
+        return data
+
+    def _schedule_flush(self):
+        """Agenda o flush; sem loop de eventos Qt, grava imediatamente"""
+        if QCoreApplication.instance() is None:
+            self.flush()
+            return
+        if self._timer is None:
+            self._timer = QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self.flush)
+        if not self._timer.isActive():
+            self._timer.start(self.delay_ms)
+
+
+writer = ConfigWriter()
+
+# Garante que escritas agrupadas não se percam ao encerrar o Anki
+atexit.register(writer.flush)
@@ -0,0 +1,149 @@
+# Copyright 2025 Carlos Duarte
+import atexit
+import collections
+import glob
+import gzip
+import itertools
+import json
+import os
+import shutil
+import threading
+import time
+from dss_log_pipeline import get_logger
+
+
+class EventJournal:
+    """
+    Diário de eventos do addon (lembretes, "Depois", "Estudar Agora", revisões),
+    gravado como NDJSON: uma linha {"t": epoch, "e": evento, ...campos} por evento.
+
+    record() apenas enfileira uma tupla em memória; a serialização, a escrita em
+    disco, a rotação por tamanho e a compressão (gzip) ficam em uma thread de
+    trabalho, que grava em lotes a cada FLUSH_INTERVAL_SECS ou ao acumular
+    FLUSH_BATCH eventos. Sem eventos pendentes, a thread não acorda.
+    """
+
+    FILE_NAME = "journal.ndjson"
+    MAX_BYTES = 1024 * 1024
+    KEEP_ROTATED = 10
+    FLUSH_INTERVAL_SECS = 5.0
+    FLUSH_BATCH = 1000
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.directory = None
+        self._queue = collections.deque()  # append/popleft são seguros entre threads
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, self.FILE_NAME) if self.directory else None
+
+    def open(self, directory):
+        """
+        Define a pasta do diário e inicia a thread de gravação.
+        Eventos registrados antes disso ficam na fila e são gravados no primeiro lote;
+        ao trocar de pasta (outro perfil), os pendentes são gravados na anterior.
+        """
+        os.makedirs(directory, exist_ok=True)
+        if self.directory is not None and directory != self.directory:
+            self.flush()
+        self.directory = directory
+        self._stopping = False
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="dss-journal", daemon=True)
+            self._thread.start()
+
+    def record(self, event, **fields):
+        """Registra um evento (sem E/S; seguro para hooks e a thread principal)"""
+        queue = self._queue
+        queue.append((time.time(), event, fields))
+        # Acorda a thread no primeiro evento (ela dorme enquanto a fila está vazia)
+        # e ao completar um lote
+        size = len(queue)
+        if (size == 1 or size >= self.FLUSH_BATCH) and not self._wake.is_set():
+            self._wake.set()
+
+    def flush(self):
+        """Grava imediatamente os eventos pendentes na thread atual (ex.: ao fechar o perfil)"""
+        if self.directory is None:
+            return
+        try:
+            self._write_pending()
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar o diário de eventos: {str(e)}")
+
+    def close(self):
+        """Para a thread de gravação depois de gravar os eventos pendentes"""
+        self._stopping = True
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._thread = None
+        self.flush()
+
+    def rotated_files(self):
+        """Arquivos já rotacionados e comprimidos, do mais antigo para o mais novo"""
+        if self.directory is None:
+            return []
+        return sorted(glob.glob(os.path.join(self.directory, "journal-*.ndjson.gz")))
+
+    def _run(self):
+        """Laço da thread de gravação"""
+        while not self._stopping:
+            if not self._queue:
+                # Fila vazia: dorme até o próximo evento, sem despertares periódicos
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            self._wake.wait(self.FLUSH_INTERVAL_SECS)
+            self._wake.clear()
+            self.flush()
+
+    def _write_pending(self):
+        """Serializa e anexa ao arquivo os eventos da fila, em lotes de até FLUSH_BATCH;
+        rotaciona sempre que o arquivo passar do limite"""
+        with self._write_lock:
+            queue = self._queue
+            dumps = json.dumps
+            popleft = queue.popleft
+            while queue:
+                lines = []
+                append = lines.append
+                for _ in range(min(len(queue), self.FLUSH_BATCH)):
+                    timestamp, event, fields = popleft()
+                    fields["t"] = round(timestamp, 3)
+                    fields["e"] = event
+                    append(dumps(fields, ensure_ascii=False, separators=(",", ":")))
+                lines.append("")
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines))
+                    size = f.tell()
+                if size >= self.MAX_BYTES:
+                    self._rotate()
+
+    def _rotate(self):
+        """Comprime o arquivo atual em journal-<data>.ndjson.gz e descarta os mais antigos"""
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        for suffix in itertools.count():
+            rotated = os.path.join(self.directory, f"journal-{stamp}-{suffix:02d}.ndjson.gz")
+            if not os.path.exists(rotated):
+                break
+        with open(self.path, "rb") as src, gzip.open(rotated, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(self.path)
+        for old in self.rotated_files()[:-self.KEEP_ROTATED]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+journal = EventJournal()
+
+# Grava os eventos ainda na fila ao encerrar o Anki
+atexit.register(journal.flush)
@@ -0,0 +1,86 @@
+# Copyright 2025 Carlos Duarte
+from dss_log_pipeline import get_logger
+
+
+class Lifecycle:
+    """
+    Registro de tudo o que o addon cria e precisa liberar: QObjects, timers, hooks
+    do Anki, threads. Cada item tem um nome, uma função de liberação e um escopo:
+
+    - PROFILE: pertence ao perfil aberto; liberado em profile_will_close
+    - ADDON: vive enquanto o addon estiver carregado; liberado quando o addon é
+      removido ou atualizado
+
+    Registrar de novo um nome substitui o item anterior (sem liberá-lo), o que
+    torna idempotentes as inicializações que se repetem a cada perfil.
+    """
+
+    PROFILE = "profile"
+    ADDON = "addon"
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self._items = {}  # nome -> (escopo, função de liberação), na ordem de registro
+
+    def register(self, name, release, scope=ADDON):
+        """
+        Registra a função que libera o item.
+
+        Args:
+            name: Nome único do item
+            release: Função sem argumentos que libera o item
+            scope: PROFILE ou ADDON
+        """
+        self._items.pop(name, None)
+        self._items[name] = (scope, release)
+
+    def hook(self, hook, callback, scope=ADDON):
+        """Conecta callback a um hook do Anki (uma única vez) e registra a desconexão"""
+        hook.remove(callback)
+        hook.append(callback)
+        name = f"hook:{getattr(callback, '__qualname__', repr(callback))}@{id(hook)}"
+        self.register(name, lambda: hook.remove(callback), scope)
+
+    def qobject(self, name, obj, scope=ADDON, release=None):
+        """
+        Registra um QObject: a função de liberação (opcional) roda antes do deleteLater.
+        Timers são parados antes da destruição.
+        """
+        def dispose():
+            try:
+                if release is not None:
+                    release()
+                if hasattr(obj, "stop"):
+                    obj.stop()
+                obj.deleteLater()
+            except RuntimeError:
+                # O objeto C++ já foi destruído (ex.: junto com o pai)
+                pass
+        self.register(name, dispose, scope)
+
+    def names(self, scope=None):
+        """Nomes dos itens registrados (de um escopo ou todos)"""
+        return [name for name, (item_scope, _) in self._items.items() if scope in (None, item_scope)]
+
+    def release(self, name):
+        """Libera um único item, se registrado"""
+        item = self._items.pop(name, None)
+        if item is not None:
+            self._run(name, item[1])
+
+    def teardown(self, scope=None):
+        """
+        Libera, na ordem inversa do registro, os itens do escopo (ou todos, se None).
+        Falhas são registradas no log e não interrompem os demais.
+        """
+        for name in reversed(self.names(scope)):
+            self.release(name)
+
+    def _run(self, name, release):
+        try:
+            release()
+        except Exception as e:
+            self.logger.error(f"Erro ao liberar {name}: {str(e)}")
+
+
+lifecycle = Lifecycle()
@@ -0,0 +1,2 @@
+# Copyright 2025 Carlos Duarte
+# Catálogos de tradução, um módulo por idioma, carregados sob demanda por translations.tr
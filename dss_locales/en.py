@@ -0,0 +1,145 @@
+# Copyright 2025 Carlos Duarte
+strings = {
+    "app_title": "Don't Stop Studying! – Focus Alerts for Anki",
+    "popup_title": "Don't Stop Studying! – Focus Alerts for Anki",
+    "popup_message": "Time to get back to studying!",
+    "popup_subtitle": "Current deck",
+    "popup_deck": "Current deck: {deck}",
+    "study_now": "Study Now",
+    "later": "Later",
+    "no_deck": "No deck available. Please create a deck before using Don't Stop Studying!",
+    "no_deck_config": "No deck configured. Please set a deck in the addon options.",
+    "no_deck_check": "Could not check available decks. Try restarting Anki.",
+    "review_fail": "Could not start review for deck '{deck}'. Check if the deck exists and has cards to review.",
+    "review_error": "Error starting study. Check the log for more details.",
+    "popup_error": "Error showing reminder. Check the log for more details.",
+    "config_title": "Don't Stop Studying! – Focus Alerts for Anki Settings",
+    "deck_select": "Deck to study:",
+    "freq_select": "Reminder frequency:",
+    "enabled_check": "Enable reminders:",
+    "save": "Save",
+    "close": "Close",
+    "test_reminder": "Test Reminder",
+    "config_saved": "Settings saved successfully! Restart Anki to apply the changes.",
+    "config_save_error": "An error occurred while saving settings. Try restarting Anki.",
+    "config_scheduler_error": "Settings saved, but there was an error updating the scheduler. Try restarting Anki.",
+    "config_save_fail": "Could not save settings. Try restarting Anki.",
+    "get_decks_error": "Could not get the list of decks. Try restarting Anki.",
+    "no_deck_found": "No deck found. Please create a deck before using this addon.",
+    "options_menu": "Configure Don't Stop Studying! – Focus Alerts for Anki",
+    "confirm_save_title": "Confirm save",
+    "confirm_save_msg": "Do you really want to save the addon's settings?",
+    "yes": "Yes",
+    "no": "No",
+    "every_1_min": "Every 1 minute",
+    "every_2_min": "Every 2 minutes",
+    "every_3_min": "Every 3 minutes",
+    "every_5_min": "Every 5 minutes",
+    "every_10_min": "Every 10 minutes",
+    "every_15_min": "Every 15 minutes",
+    "every_20_min": "Every 20 minutes",
+    "every_25_min": "Every 25 minutes",
+    "every_30_min": "Every 30 minutes",
+    "every_45_min": "Every 45 minutes",
+    "every_60_min": "Every 60 minutes",
+    "every_90_min": "Every 90 minutes",
+    "every_120_min": "Every 120 minutes",
+    "default_frequency_warning": "Problem setting frequency based on configuration value. Setting to default (Every 30 minutes)",
+    "inactivity_reminder_label": "Reminder after card time (enables field below)",
+    "inactivity_extra_time_label": "Extra inactivity time (min, only if enabled above):",
+    "log_showing_reminder": "Showing reminder: {}",
+    "log_hiding_reminder": "Hiding reminder: {}",
+    "log_initializing": "Initializing Don't Stop Studying! – Focus Alerts for Anki...",
+    "log_empty_deck": "Configured deck was empty. Using first available deck: {}",
+    "log_no_deck": "No deck available. Cannot show reminder.",
+    "log_deck_not_found": "Deck '{}' not found",
+    "log_showing_popup": "Showing reminder popup...",
+    "error_get_decks": "Error getting decks: {}",
+    "error_init_addon": "Error initializing addon: {}",
+    "error_load_decks": "Error loading decks: {}",
+    "error_position_popup": "Error positioning popup: {}",
+    "error_start_study": "Error starting study: {}",
+    "error_show_popup": "Error showing popup: {}",
+    "error_get_config": "Error getting configuration: {}",
+    "error_get_reviewer": "Error getting reviewer: {}",
+    "error_get_collection": "Error getting collection: {}",
+    "error_get_selected_deck": "Error getting selected deck: {}",
+    "error_get_scheduler": "Error getting scheduler: {}",
+    "error_show_question": "Error showing question: {}",
+    "error_show_answer": "Error showing answer: {}",
+    "error_answer_card": "Error answering card: {}",
+    "error_overview_state": "Error moving to overview state: {}",
+    "error_review_state": "Error moving to review state: {}",
+    "error_get_question": "Error getting question: {}",
+    "error_get_answer": "Error getting answer: {}",
+    "error_get_current_card": "Error getting current card: {}",
+    "error_save_config": "Error saving configuration: {}",
+    "error_set_schedule": "Error setting schedule: {}",
+    "error_exec_schedule": "Error executing schedule: {}",
+    "error_start_schedule": "Error starting schedule: {}",
+    "error_cancel_function": "Error executing cancel function: {}",
+    "error_stop_schedule": "Error stopping schedule: {}",
+    "error_update_schedule": "Error updating schedule state: {}",
+    "exception_reviewer": "Reviewer not available",
+    "exception_collection": "Collection not available",
+    "exception_decks": "Decks not available",
+    "exception_scheduler": "Scheduler not available",
+    "exception_review_inactive": "Could not get current card because review is not active.",
+    "exception_current_card": "Card not available",
+    "window_location_label": "Window position:",
+    "window_location_bottom_right": "Bottom right corner",
+    "window_location_bottom_left": "Bottom left corner",
+    "window_location_center": "Center of screen",
+    "window_location_random": "Sequential (10s)",
+    "popup_screen_label": "Screen:",
+    "popup_screen_primary": "Primary screen",
+    "popup_screen_main_window": "Screen with the Anki window",
+    "popup_lifecycle_label": "Reminder window:",
+    "popup_lifecycle_prewarmed": "Pre-loaded (faster)",
+    "popup_lifecycle_low_memory": "On demand (less memory)",
+    "metrics_enabled_check": "Collect performance metrics",
+    "low_power_timers_check": "Low-power timers (fewer wakeups, less precise reminders)",
+    "diagnostics": "Diagnostics",
+    "diagnostics_title": "Diagnostics",
+    "diagnostics_metrics_tab": "Metrics",
+    "diagnostics_refresh": "Refresh",
+    "diagnostics_reset": "Reset",
+    "diagnostics_disabled": "Metrics collection is off. Enable it in the options to record data.",
+    "diagnostics_col_entry": "Entry point",
+    "diagnostics_col_calls": "Calls",
+    "diagnostics_col_errors": "Errors",
+    "diagnostics_col_mean": "Mean (ms)",
+    "diagnostics_log_tab": "Log",
+    "diagnostics_log_verbose": "Verbose log (DEBUG) until Anki restarts",
+    "diagnostics_log_empty": "No log records yet.",
+    "analytics_tab": "Reminders",
+    "analytics_loading": "Analyzing the event journal…",
+    "analytics_empty": "No scheduled reminders recorded yet.",
+    "analytics_error": "Could not analyze the event journal. Check the log for more details.",
+    "analytics_export": "Export CSV",
+    "analytics_exported": "Analysis exported.",
+    "analytics_col_metric": "Metric",
+    "analytics_col_value": "Value",
+    "analytics_col_hour": "Hour",
+    "analytics_col_shown": "Shown",
+    "analytics_col_studied": "Studied",
+    "analytics_col_conversion": "Conversion",
+    "analytics_reminders": "Reminders shown",
+    "analytics_studied": "Led to study",
+    "analytics_dismissed": "Dismissed (Later)",
+    "analytics_ignored": "No response",
+    "analytics_conversion": "Conversion rate",
+    "analytics_latency_mean": "Reminder to first card, mean (s)",
+    "analytics_latency_p50": "Reminder to first card, median (s, up to)",
+    "analytics_latency_p90": "Reminder to first card, p90 (s, up to)",
+    "analytics_longest_streak": "Longest Later streak",
+    "analytics_current_streak": "Current Later streak",
+    "analytics_inactivity_alerts": "Inactivity alerts",
+    "due_counts": "New {new} · Learning {learn} · Review {review}",
+    "suggest_urgent_deck_check": "Suggest the deck with the most urgent work",
+    "due_counts_loading": "Loading counts…",
+    "unsaved_changes_title": "Unsaved changes",
+    "unsaved_changes_msg": "There are unsaved changes. Do you want to save before exiting?",
+    "unsaved_changes_test_msg": "There are unsaved changes. Do you want to save before testing?",
+    "cancel": "Cancel",
+}
@@ -0,0 +1,145 @@
+# Copyright 2025 Carlos Duarte
+strings = {
+    "app_title": "Don't Stop Studying! – Focus Alerts for Anki",
+    "popup_title": "Don't Stop Studying! – Focus Alerts for Anki",
+    "popup_message": "Hora de voltar a estudar!",
+    "popup_subtitle": "Deck atual",
+    "popup_deck": "Deck atual: {deck}",
+    "study_now": "Estudar Agora",
+    "later": "Mais Tarde",
+    "no_deck": "Nenhum deck disponível. Por favor, crie um deck antes de usar o Don't Stop Studying! – Focus Alerts for Anki",
+    "no_deck_config": "Nenhum deck configurado. Por favor, configure um deck nas opções do addon.",
+    "no_deck_check": "Não foi possível verificar os decks disponíveis. Tente reiniciar o Anki.",
+    "review_fail": "Não foi possível iniciar a revisão do deck '{deck}'. Verifique se o deck existe e tem cartões para revisar.",
+    "review_error": "Erro ao iniciar o estudo. Verifique o log para mais detalhes.",
+    "popup_error": "Erro ao mostrar o lembrete. Verifique o log para mais detalhes.",
+    "config_title": "Configurações do Don't Stop Studying! – Focus Alerts for Anki",
+    "deck_select": "Deck para estudo:",
+    "freq_select": "Frequência do lembrete:",
+    "enabled_check": "Ativar lembretes:",
+    "save": "Salvar",
+    "close": "Fechar",
+    "test_reminder": "Testar Lembrete",
+    "config_saved": "Configurações salvas com sucesso! Reinicie o Anki para aplicar as alterações.",
+    "config_save_error": "Ocorreu um erro ao salvar as configurações. Tente reiniciar o Anki.",
+    "config_scheduler_error": "Configurações salvas, mas houve um erro ao atualizar o agendador. Tente reiniciar o Anki.",
+    "config_save_fail": "Não foi possível salvar as configurações. Tente reiniciar o Anki.",
+    "get_decks_error": "Não foi possível obter a lista de decks. Tente reiniciar o Anki.",
+    "no_deck_found": "Nenhum deck encontrado. Por favor, crie um deck antes de usar este addon.",
+    "options_menu": "Configurar Don't Stop Studying! – Focus Alerts for Anki",
+    "confirm_save_title": "Confirmar salvamento",
+    "confirm_save_msg": "Deseja realmente salvar as configurações do addon?",
+    "yes": "Sim",
+    "no": "Não",
+    "every_1_min": "A cada 1 minuto",
+    "every_2_min": "A cada 2 minutos",
+    "every_3_min": "A cada 3 minutos",
+    "every_5_min": "A cada 5 minutos",
+    "every_10_min": "A cada 10 minutos",
+    "every_15_min": "A cada 15 minutos",
+    "every_20_min": "A cada 20 minutos",
+    "every_25_min": "A cada 25 minutos",
+    "every_30_min": "A cada 30 minutos",
+    "every_45_min": "A cada 45 minutos",
+    "every_60_min": "A cada 60 minutos",
+    "every_90_min": "A cada 90 minutos",
+    "every_120_min": "A cada 120 minutos",
+    "default_frequency_warning": "Problema ao definir a frequência com base no valor de configuração. Definindo para o padrão (A cada 30 minutos)",
+    "inactivity_reminder_label": "Lembrete após tempo do cartão (ativa o campo abaixo)",
+    "inactivity_extra_time_label": "Tempo extra de inatividade (min, só se ativado acima):",
+    "log_showing_reminder": "Mostrando lembrete: {}",
+    "log_hiding_reminder": "Escondendo lembrete: {}",
+    "log_initializing": "Inicializando Don't Stop Studying! – Focus Alerts for Anki...",
+    "log_empty_deck": "Deck configurado estava vazio. Usando o primeiro deck disponível: {}",
+    "log_no_deck": "Nenhum deck disponível. Não é possível mostrar o lembrete.",
+    "log_deck_not_found": "Deck '{}' não encontrado.",
+    "log_showing_popup": "Mostrando popup de lembrete...",
+    "error_get_decks": "Erro ao obter decks: {}",
+    "error_init_addon": "Erro ao inicializar o addon: {}",
+    "error_load_decks": "Erro ao carregar decks: {}",
+    "error_position_popup": "Erro ao posicionar o popup: {}",
+    "error_start_study": "Erro ao iniciar o estudo: {}",
+    "error_show_popup": "Erro ao mostrar popup: {}",
+    "error_get_config": "Erro ao obter a configuração: {}",
+    "error_get_reviewer": "Erro ao obter o revisor: {}",
+    "error_get_collection": "Erro ao obter a coleção: {}",
+    "error_get_selected_deck": "Erro ao obter o deck selecionado: {}",
+    "error_get_scheduler": "Erro ao obter o agendador: {}",
+    "error_show_question": "Erro ao mostrar a pergunta: {}",
+    "error_show_answer": "Erro ao mostrar a resposta: {}",
+    "error_answer_card": "Erro ao responder o cartão: {}",
+    "error_overview_state": "Erro ao mover para o estado de visão geral: {}",
+    "error_review_state": "Erro ao mover para o estado de revisão: {}",
+    "error_get_question": "Erro ao obter a pergunta: {}",
+    "error_get_answer": "Erro ao obter a resposta: {}",
+    "error_get_current_card": "Erro ao obter o cartão atual: {}",
+    "error_save_config": "Erro ao salvar a configuração: {}",
+    "error_set_schedule": "Erro ao definir o agendamento: {}",
+    "error_exec_schedule": "Erro ao executar o agendamento: {}",
+    "error_start_schedule": "Erro ao iniciar o agendamento: {}",
+    "error_cancel_function": "Erro ao executar a função de cancelamento: {}",
+    "error_stop_schedule": "Erro ao parar o agendamento: {}",
+    "error_update_schedule": "Erro ao atualizar o estado do agendamento: {}",
+    "exception_reviewer": "Revisor não disponível",
+    "exception_collection": "Coleção não disponível",
+    "exception_decks": "Decks não disponíveis",
+    "exception_scheduler": "Agendador não disponível",
+    "exception_review_inactive": "Não foi possível obter o cartão atual porque a revisão não está ativa.",
+    "exception_current_card": "Cartão não disponível",
+    "window_location_label": "Posição da janela:",
+    "window_location_bottom_right": "Canto inferior direito",
+    "window_location_bottom_left": "Canto inferior esquerdo",
+    "window_location_center": "Centro da tela",
+    "window_location_random": "Sequencial (10s)",
+    "popup_screen_label": "Tela:",
+    "popup_screen_primary": "Tela principal",
+    "popup_screen_main_window": "Tela com a janela do Anki",
+    "popup_lifecycle_label": "Janela de lembrete:",
+    "popup_lifecycle_prewarmed": "Pré-carregada (mais rápida)",
+    "popup_lifecycle_low_memory": "Sob demanda (menos memória)",
+    "metrics_enabled_check": "Coletar métricas de desempenho",
+    "low_power_timers_check": "Timers de baixo consumo (menos despertares, lembretes menos precisos)",
+    "diagnostics": "Diagnóstico",
+    "diagnostics_title": "Diagnóstico",
+    "diagnostics_metrics_tab": "Métricas",
+    "diagnostics_refresh": "Atualizar",
+    "diagnostics_reset": "Zerar",
+    "diagnostics_disabled": "A coleta de métricas está desligada. Ative-a nas opções para registrar dados.",
+    "diagnostics_col_entry": "Ponto",
+    "diagnostics_col_calls": "Chamadas",
+    "diagnostics_col_errors": "Erros",
+    "diagnostics_col_mean": "Média (ms)",
+    "diagnostics_log_tab": "Log",
+    "diagnostics_log_verbose": "Log detalhado (DEBUG) até reiniciar o Anki",
+    "diagnostics_log_empty": "Nenhum registro de log ainda.",
+    "analytics_tab": "Lembretes",
+    "analytics_loading": "Analisando o diário de eventos…",
+    "analytics_empty": "Nenhum lembrete agendado registrado ainda.",
+    "analytics_error": "Não foi possível analisar o diário de eventos. Verifique o log para mais detalhes.",
+    "analytics_export": "Exportar CSV",
+    "analytics_exported": "Análise exportada.",
+    "analytics_col_metric": "Métrica",
+    "analytics_col_value": "Valor",
+    "analytics_col_hour": "Hora",
+    "analytics_col_shown": "Mostrados",
+    "analytics_col_studied": "Estudados",
+    "analytics_col_conversion": "Conversão",
+    "analytics_reminders": "Lembretes mostrados",
+    "analytics_studied": "Levaram ao estudo",
+    "analytics_dismissed": "Dispensados (Depois)",
+    "analytics_ignored": "Sem resposta",
+    "analytics_conversion": "Taxa de conversão",
+    "analytics_latency_mean": "Lembrete até o primeiro cartão, média (s)",
+    "analytics_latency_p50": "Lembrete até o primeiro cartão, mediana (s, até)",
+    "analytics_latency_p90": "Lembrete até o primeiro cartão, p90 (s, até)",
+    "analytics_longest_streak": "Maior sequência de Depois",
+    "analytics_current_streak": "Sequência atual de Depois",
+    "analytics_inactivity_alerts": "Alertas de inatividade",
+    "due_counts": "Novos {new} · Aprendendo {learn} · Revisão {review}",
+    "suggest_urgent_deck_check": "Sugerir o deck com o trabalho mais urgente",
+    "due_counts_loading": "Carregando contagens…",
+    "unsaved_changes_title": "Alterações não salvas",
+    "unsaved_changes_msg": "Existem alterações não salvas. Deseja salvar antes de sair?",
+    "unsaved_changes_test_msg": "Existem alterações não salvas. Deseja salvar antes de testar?",
+    "cancel": "Cancelar",
+}
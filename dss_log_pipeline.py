@@ -0,0 +1,181 @@
+# Copyright 2025 Carlos Duarte
+import atexit
+import collections
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limita cada mensagem a BURST registros por janela de WINDOW_SECS. A mensagem
+    é identificada pelo ponto do código que a gerou (arquivo e linha), o que vale
+    também para mensagens montadas com f-strings. Os registros excedentes são
+    descartados e contados; o total é anexado ao primeiro registro aceito da
+    janela seguinte.
+    """
+
+    WINDOW_SECS = 60.0
+    BURST = 10
+    MAX_KEYS = 1024  # Limite de chaves em memória; ao passar dele, as janelas recomeçam
+
+    def __init__(self):
+        super().__init__()
+        self._windows = {}  # (arquivo, linha) -> [início da janela, aceitos, suprimidos]
+
+    def filter(self, record):
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is not None and now - window[0] < self.WINDOW_SECS:
+            if window[1] < self.BURST:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+        if window is not None and window[2]:
+            record.msg = f"{record.msg} [+{window[2]} mensagens iguais suprimidas]"
+        elif len(self._windows) >= self.MAX_KEYS:
+            self._windows.clear()
+        self._windows[key] = [now, 1, 0]
+        return True
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que não formata a mensagem na thread que chamou o log: o
+    registro vai para a fila com a mensagem e os argumentos originais, e a
+    formatação fica para a thread do QueueListener.
+    """
+
+    def prepare(self, record):
+        # Os argumentos passados ao logger do addon são valores simples (números,
+        # textos, configurações imutáveis), seguros para formatar em outra thread
+        return record
+
+
+class DeferredFlushStreamHandler(logging.StreamHandler):
+    """StreamHandler que não descarrega o stream a cada registro (ver BatchingQueueListener)"""
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener que descarrega os handlers só quando a fila esvazia: uma rajada
+    de registros vira uma única escrita no console. Descarregar a cada registro
+    faz a thread disputar o GIL com a thread principal a cada chamada de sistema.
+    """
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
+
+class RingBufferHandler(logging.Handler):
+    """Guarda os registros mais recentes em memória, formatados só quando exibidos"""
+
+    def __init__(self, capacity):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def lines(self):
+        """Registros guardados, do mais antigo ao mais recente, já formatados"""
+        format = self.format
+        return [format(record) for record in list(self.records)]
+
+
+# Logger pai de todos os registros do addon. Os módulos são importados pelo
+# nome (o diretório do addon está no sys.path), então __name__ não identifica
+# o addon: cada módulo usa um filho deste logger (ver get_logger)
+ADDON_LOGGER = "dont_stop_studying"
+
+
+def get_logger(module_name):
+    """Logger do módulo, filho do logger do addon (ex.: dont_stop_studying.dss_timer_engine)"""
+    return logging.getLogger(f"{ADDON_LOGGER}.{module_name}")
+
+
+class LogPipeline:
+    """
+    Saída de log do addon fora da thread principal.
+
+    Um único handler fica no logger do addon (ADDON_LOGGER), que recebe os
+    registros de todos os módulos: um QueueHandler que apenas enfileira o
+    registro (depois do limite por mensagem). Um QueueListener, em uma thread
+    própria, formata e entrega os registros ao console, em lotes, e a um buffer
+    circular com os RING_CAPACITY mais recentes, exibido no painel de diagnóstico.
+    """
+
+    RING_CAPACITY = 500
+    FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    DATE_FORMAT = "%H:%M:%S"
+
+    def __init__(self):
+        self.ring_buffer = RingBufferHandler(self.RING_CAPACITY)
+        self.ring_buffer.setFormatter(logging.Formatter(self.FORMAT, self.DATE_FORMAT))
+        self.level = logging.WARNING
+        self.logger = logging.getLogger(ADDON_LOGGER)
+        self._handler = None
+        self._listener = None
+
+    def start(self, stream=None, level=logging.WARNING):
+        """
+        Liga o logger do addon à fila e inicia a thread de saída.
+
+        Args:
+            stream: Destino do console (sys.stdout se omitido)
+            level: Nível mínimo dos registros
+        """
+        self.stop()
+        console = DeferredFlushStreamHandler(stream or sys.stdout)
+        console.setFormatter(logging.Formatter(self.FORMAT, self.DATE_FORMAT))
+        log_queue = queue.SimpleQueue()
+        self._handler = LazyQueueHandler(log_queue)
+        self._handler.addFilter(RateLimitFilter())
+        self._listener = BatchingQueueListener(log_queue, console, self.ring_buffer)
+        self._listener.start()
+        self.logger.addHandler(self._handler)
+        # Sem propagar: o registro não chega também aos handlers do Anki
+        self.logger.propagate = False
+        self.set_level(level)
+
+    def set_level(self, level):
+        """Altera o nível mínimo dos registros do addon (os módulos herdam do logger do addon)"""
+        self.level = level
+        self.logger.setLevel(level)
+
+    def stop(self):
+        """Desliga o logger do addon da fila e para a thread, depois de entregar os registros pendentes"""
+        if self._handler is not None:
+            self.logger.removeHandler(self._handler)
+            self.logger.propagate = True
+            self._handler = None
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.flush()
+
+    def recent_lines(self):
+        """Registros recentes formatados (do mais antigo ao mais recente)"""
+        return self.ring_buffer.lines()
+
+
+log_pipeline = LogPipeline()
+
+# Entrega os registros ainda na fila ao encerrar o Anki
+atexit.register(log_pipeline.stop)
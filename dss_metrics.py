@@ -0,0 +1,155 @@
+# Copyright 2025 Carlos Duarte
+import bisect
+import functools
+import time
+from dss_log_pipeline import get_logger
+
+# Limites superiores (em segundos) dos buckets dos histogramas de latência
+LATENCY_BUCKETS = (
+    0.000001, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+class Metric:
+    """Contadores de chamadas e erros e histograma de latência de um ponto instrumentado"""
+
+    __slots__ = ("name", "calls", "errors", "total", "buckets")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # último bucket: +Inf
+
+    def observe(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def reset(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def quantile(self, q):
+        """Estima um quantil (0-1) por interpolação linear dentro do bucket"""
+        if not self.calls:
+            return 0.0
+        target = q * self.calls
+        seen = 0
+        lower = 0.0
+        for i, count in enumerate(self.buckets):
+            upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else lower
+            if count and seen + count >= target:
+                return lower + (upper - lower) * (target - seen) / count
+            seen += count
+            lower = upper
+        return lower
+
+
+class MetricsRegistry:
+    """
+    Registro dos pontos instrumentados do addon.
+    Desligado por padrão: nesse caso cada chamada instrumentada custa apenas a
+    verificação de um atributo.
+    """
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.enabled = False
+        self.metrics = {}
+        self.listeners = []  # funções chamadas com o novo estado ao ligar/desligar
+
+    def metric(self, name):
+        """Retorna (criando se necessário) a métrica com o nome informado"""
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = Metric(name)
+        return metric
+
+    def set_enabled(self, enabled):
+        """Liga ou desliga a coleta e avisa os interessados (ex.: exportação periódica)"""
+        enabled = bool(enabled)
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        for listener in self.listeners:
+            try:
+                listener(enabled)
+            except Exception as e:
+                self.logger.error(f"Erro ao notificar mudança nas métricas: {str(e)}")
+
+    def reset(self):
+        for metric in self.metrics.values():
+            metric.reset()
+
+    def instrument(self, name):
+        """Decorador que conta chamadas, erros e latência da função"""
+        metric = self.metric(name)
+        registry = self
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not registry.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                except BaseException:
+                    metric.errors += 1
+                    raise
+                finally:
+                    metric.observe(time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """Linhas (nome, chamadas, erros, média, p50, p95, p99) com latências em ms"""
+        rows = []
+        for name in sorted(self.metrics):
+            metric = self.metrics[name]
+            mean = metric.total / metric.calls if metric.calls else 0.0
+            rows.append((
+                name, metric.calls, metric.errors, mean * 1000,
+                metric.quantile(0.5) * 1000, metric.quantile(0.95) * 1000, metric.quantile(0.99) * 1000,
+            ))
+        return rows
+
+    def to_openmetrics(self, prefix="dont_stop_studying"):
+        """Serializa todas as métricas no formato de texto OpenMetrics"""
+        lines = [
+            f"# TYPE {prefix}_calls counter",
+            f"# HELP {prefix}_calls Chamadas por ponto instrumentado.",
+        ]
+        for name in sorted(self.metrics):
+            lines.append(f'{prefix}_calls_total{{entry="{name}"}} {self.metrics[name].calls}')
+        lines.append(f"# TYPE {prefix}_errors counter")
+        lines.append(f"# HELP {prefix}_errors Exceções propagadas por ponto instrumentado.")
+        for name in sorted(self.metrics):
+            lines.append(f'{prefix}_errors_total{{entry="{name}"}} {self.metrics[name].errors}')
+        lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+        lines.append(f"# HELP {prefix}_latency_seconds Latência por ponto instrumentado.")
+        for name in sorted(self.metrics):
+            metric = self.metrics[name]
+            cumulative = 0
+            for i, count in enumerate(metric.buckets):
+                cumulative += count
+                bound = repr(LATENCY_BUCKETS[i]) if i < len(LATENCY_BUCKETS) else "+Inf"
+                lines.append(f'{prefix}_latency_seconds_bucket{{entry="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_latency_seconds_count{{entry="{name}"}} {metric.calls}')
+            lines.append(f'{prefix}_latency_seconds_sum{{entry="{name}"}} {metric.total!r}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_openmetrics(self, path):
+        """Grava o arquivo OpenMetrics de forma atômica"""
+        from dss_config_writer import atomic_write
+        atomic_write(path, self.to_openmetrics().encode("utf-8"))
+
+
+registry = MetricsRegistry()
+instrument = registry.instrument
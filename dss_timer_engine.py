@@ -0,0 +1,218 @@
+# Copyright 2025 Carlos Duarte
+import heapq
+import itertools
+import math
+from aqt.qt import QTimer, Qt
+from dss_clock import now
+from dss_log_pipeline import get_logger
+from dss_metrics import instrument
+
+
+class TimerEngine:
+    """
+    Motor de prazos do addon.
+    Mantém todos os prazos pendentes em um min-heap ordenado por tempo monotônico
+    (dss_clock.now, que conta o tempo de suspensão) e usa um único QTimer, sempre
+    armado para o prazo mais próximo; sem prazos pendentes, o timer fica parado.
+
+    O QTimer do Qt para durante a suspensão, então um prazo que venceu com o
+    computador suspenso é executado no primeiro despertar depois de retomado,
+    com atraso. Durante a execução de cada prazo, lateness informa esse atraso
+    e is_late() diz se ele indica uma lacuna (suspensão, bloqueio longo) e não
+    apenas a imprecisão normal do timer.
+
+    No modo de baixo consumo (set_coalescing), os prazos são adiados para o
+    próximo múltiplo de granularity segundos: prazos próximos vencem no mesmo
+    despertar e são executados juntos. Prazos da interface que precisam da
+    hora certa (rotação do popup, verificação de inatividade) são agendados
+    com coalesce=False e não são arredondados.
+    """
+
+    # Entradas canceladas ficam no heap até serem descartadas; acima deste
+    # limite (e da metade do heap) o heap é reconstruído
+    COMPACT_THRESHOLD = 64
+
+    # Atraso mínimo (em segundos) para um prazo ser considerado perdido; abaixo
+    # disso (e de LATE_FRACTION do intervalo, a tolerância do CoarseTimer) é só
+    # a imprecisão do timer
+    LATE_GAP_SECS = 60
+    LATE_FRACTION = 0.1
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self._heap = []  # [prazo, sequência, handle, callback, alinhado à grade]
+        self._entries = {}  # handle -> entrada ativa no heap
+        self._handles = itertools.count(1)
+        self._sequence = itertools.count()
+        self._cancelled = 0
+        self._armed_deadline = None
+        self.granularity = 0  # 0: prazos exatos
+        self.lateness = 0.0  # Atraso (s) do prazo em execução; 0 fora dos callbacks
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def schedule(self, delay_secs, callback, handle=None, coalesce=True):
+        """
+        Agenda uma função para ser chamada após um intervalo.
+
+        Args:
+            delay_secs: Intervalo em segundos a partir de agora
+            callback: Função sem argumentos a ser chamada no prazo
+            handle: Handle existente a ser reaproveitado (o prazo anterior é cancelado)
+            coalesce: False mantém o prazo exato mesmo no modo de baixo consumo
+
+        Returns:
+            int: Handle do prazo, usado para cancelar ou reagendar
+        """
+        if handle is None:
+            handle = next(self._handles)
+        else:
+            self._discard(handle)
+        deadline = now() + delay_secs
+        coalesce = coalesce and self.granularity > 0
+        if coalesce:
+            deadline = math.ceil(deadline / self.granularity) * self.granularity
+        entry = [deadline, next(self._sequence), handle, callback, coalesce]
+        self._entries[handle] = entry
+        heapq.heappush(self._heap, entry)
+        self._rearm()
+        return handle
+
+    def reschedule(self, handle, delay_secs, callback=None, coalesce=True):
+        """
+        Move um prazo para daqui a delay_secs, mantendo o mesmo handle.
+
+        Args:
+            handle: Handle retornado por schedule (None cria um novo prazo)
+            delay_secs: Novo intervalo em segundos a partir de agora
+            callback: Nova função; se omitida, mantém a do prazo anterior
+            coalesce: False mantém o prazo exato mesmo no modo de baixo consumo
+
+        Returns:
+            int: Handle do prazo
+        """
+        if callback is None:
+            entry = self._entries.get(handle)
+            if entry is None:
+                raise ValueError(f"Prazo inexistente: {handle}")
+            callback = entry[3]
+        return self.schedule(delay_secs, callback, handle, coalesce)
+
+    def cancel(self, handle):
+        """
+        Cancela um prazo pendente.
+
+        Returns:
+            bool: True se havia um prazo pendente com esse handle
+        """
+        if not self._discard(handle):
+            return False
+        self._rearm()
+        return True
+
+    def is_pending(self, handle):
+        """Indica se o handle ainda tem um prazo pendente"""
+        return handle in self._entries
+
+    def remaining(self, handle):
+        """Segundos restantes até o prazo, ou None se não estiver pendente"""
+        entry = self._entries.get(handle)
+        if entry is None:
+            return None
+        return max(0.0, entry[0] - now())
+
+    def is_late(self, interval_secs):
+        """
+        Indica se o prazo em execução venceu bem depois do esperado (ex.: o
+        computador foi suspenso), e não só com a imprecisão normal do timer.
+
+        Args:
+            interval_secs: Intervalo com que o prazo foi agendado
+        """
+        return self.lateness >= max(self.LATE_GAP_SECS, interval_secs * self.LATE_FRACTION)
+
+    def clear(self):
+        """Cancela todos os prazos e para o timer"""
+        self._heap.clear()
+        self._entries.clear()
+        self._cancelled = 0
+        self._armed_deadline = None
+        self._timer.stop()
+
+    def set_coalescing(self, granularity_secs):
+        """
+        Liga (granularity_secs > 0) ou desliga (0) o modo de baixo consumo.
+        Vale para os prazos agendados a partir de então; enquanto o próximo
+        prazo estiver alinhado à grade, o QTimer é um VeryCoarseTimer, que o
+        sistema pode alinhar a outros despertares.
+        """
+        self.granularity = max(0, granularity_secs)
+        self._rearm()
+
+    def dispose(self):
+        """Cancela todos os prazos e destrói o QTimer; o motor não pode mais ser usado"""
+        self.clear()
+        self._timer.deleteLater()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _discard(self, handle):
+        """Marca a entrada do handle como cancelada, sem tocar no heap (O(1))"""
+        entry = self._entries.pop(handle, None)
+        if entry is None:
+            return False
+        entry[3] = None
+        self._cancelled += 1
+        if self._cancelled > self.COMPACT_THRESHOLD and self._cancelled * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if e[3] is not None]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+        return True
+
+    def _rearm(self):
+        """Arma o QTimer para o prazo ativo mais próximo, ou o para se não houver nenhum"""
+        heap = self._heap
+        while heap and heap[0][3] is None:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        if not heap:
+            self._armed_deadline = None
+            self._timer.stop()
+            return
+        deadline = heap[0][0]
+        # Prazos exatos não podem esperar o arredondamento em segundos do VeryCoarseTimer
+        timer_type = Qt.TimerType.VeryCoarseTimer if heap[0][4] and self.granularity else Qt.TimerType.CoarseTimer
+        if timer_type != self._timer.timerType():
+            # O tipo só vale a partir do próximo start
+            self._timer.setTimerType(timer_type)
+            self._armed_deadline = None
+        if deadline == self._armed_deadline and self._timer.isActive():
+            return
+        self._armed_deadline = deadline
+        delay_ms = max(0, math.ceil((deadline - now()) * 1000))
+        self._timer.start(delay_ms)
+
+    @instrument("timer_engine_wakeup")
+    def _on_timeout(self):
+        """Executa todos os prazos vencidos e rearma o timer"""
+        self._armed_deadline = None
+        current = now()
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= current:
+            entry = heapq.heappop(heap)
+            if entry[3] is None:
+                self._cancelled -= 1
+                continue
+            del self._entries[entry[2]]
+            due.append((entry[0], entry[3]))
+        for deadline, callback in due:
+            self.lateness = current - deadline
+            try:
+                callback()
+            except Exception as e:
+                self.logger.error(f"Erro ao executar prazo agendado: {str(e)}")
+        self.lateness = 0.0
+        self._rearm()
@@ -0,0 +1,210 @@
+# Copyright 2025 Carlos Duarte
+import time
+from dss_log_pipeline import get_logger
+
+
+# Contagens próprias de todos os decks em uma única passada pela tabela de cartões.
+# Filas: 0 novo, 1 aprendendo (due em segundos), 2 revisão (due em dias),
+# 3 aprendendo entre dias (due em dias), 4 pré-visualização; negativas = suspenso/enterrado
+ALL_COUNTS_SQL = """
+select did,
+       sum(queue = 0),
+       sum((queue in (1, 4) and due <= ?) or (queue = 3 and due <= ?)),
+       sum(queue = 2 and due <= ?)
+from cards
+where queue >= 0
+group by did
+"""
+
+
+def batched_due_counts(col):
+    """
+    Contagens próprias (sem subdecks) de todos os decks, em uma única consulta SQL.
+    Não aplica os limites diários das opções do deck.
+
+    Returns:
+        dict: deck_id -> (novos, aprendendo, revisão)
+    """
+    today = col.sched.today
+    learn_cutoff = int(time.time()) + col.get_config("collapseTime", 1200)
+    return {
+        did: (new, learn, review)
+        for did, new, learn, review in col.db.all(ALL_COUNTS_SQL, learn_cutoff, today, today)
+    }
+
+
+def roll_up(entries, own_counts):
+    """
+    Soma as contagens de cada deck às de todos os seus ancestrais.
+
+    Args:
+        entries: DeckEntry do índice de decks (com parent_id e level)
+        own_counts: dict deck_id -> (novos, aprendendo, revisão) sem subdecks
+
+    Returns:
+        dict: deck_id -> (novos, aprendendo, revisão) incluindo subdecks
+    """
+    totals = {entry.id: list(own_counts.get(entry.id, (0, 0, 0))) for entry in entries}
+    # Dos níveis mais profundos para a raiz: cada deck já tem seus filhos somados
+    # quando é somado ao pai
+    for entry in sorted(entries, key=lambda e: e.level, reverse=True):
+        if entry.parent_id is not None:
+            parent, child = totals[entry.parent_id], totals[entry.id]
+            parent[0] += child[0]
+            parent[1] += child[1]
+            parent[2] += child[2]
+    return {deck_id: tuple(counts) for deck_id, counts in totals.items()}
+
+
+class DueCountCache:
+    """
+    Contagens de cartões (novos, aprendendo, revisão) por deck, incluindo subdecks.
+    As contagens são calculadas em segundo plano (QueryOp) e guardadas por deck,
+    valendo enquanto a coleção não for modificada (col.mod) e por no máximo
+    MAX_AGE_SECS, já que cartões em aprendizado vencem com o passar do tempo.
+    As listas de decks usam request_all, que calcula todos os decks de uma vez.
+    """
+
+    MAX_AGE_SECS = 300
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self._cache = {}  # deck_id -> (chave da coleção, instante monotônico, contagens)
+        self._pending = {}  # deck_id -> callbacks aguardando a consulta em andamento
+        self._all = None  # (chave da coleção, instante monotônico, contagens de todos os decks)
+        self._all_pending = None  # callbacks aguardando a consulta de todos os decks
+
+    def invalidate(self):
+        """Descarta todas as contagens guardadas"""
+        self._cache.clear()
+        self._all = None
+
+    def get(self, collection, deck_id):
+        """
+        Retorna as contagens guardadas para o deck, se ainda forem válidas.
+
+        Args:
+            collection: Coleção do Anki (mw.col)
+            deck_id: Id do deck
+
+        Returns:
+            tuple: (novos, aprendendo, revisão) ou None
+        """
+        cached = self._cache.get(deck_id)
+        if cached is None:
+            return None
+        key, stamp, counts = cached
+        if key != self._collection_key(collection) or time.monotonic() - stamp > self.MAX_AGE_SECS:
+            return None
+        return counts
+
+    def request(self, parent, collection, deck_id, callback=None):
+        """
+        Obtém as contagens do deck; usa o cache ou dispara uma consulta em segundo plano.
+
+        Args:
+            parent: Widget pai da operação (normalmente mw)
+            collection: Coleção do Anki (mw.col)
+            deck_id: Id do deck
+            callback: Função chamada na thread principal com as contagens (ou None)
+        """
+        counts = self.get(collection, deck_id)
+        if counts is not None:
+            if callback is not None:
+                callback(counts)
+            return
+        callbacks = self._pending.get(deck_id)
+        if callbacks is not None:
+            # Já existe uma consulta para esse deck; apenas aguarda o resultado
+            if callback is not None:
+                callbacks.append(callback)
+            return
+        self._pending[deck_id] = [callback] if callback is not None else []
+
+        from aqt.operations import QueryOp
+        QueryOp(
+            parent=parent,
+            op=lambda col: self._compute(col, deck_id),
+            success=lambda result: self._on_result(deck_id, result),
+        ).failure(lambda e: self._on_failure(deck_id, e)).run_in_background()
+
+    def get_all(self, collection):
+        """Retorna as contagens (com subdecks) de todos os decks, se ainda forem válidas"""
+        if self._all is None:
+            return None
+        key, stamp, counts = self._all
+        if key != self._collection_key(collection) or time.monotonic() - stamp > self.MAX_AGE_SECS:
+            return None
+        return counts
+
+    def request_all(self, parent, collection, entries, callback=None):
+        """
+        Obtém as contagens de todos os decks com uma única consulta em segundo plano.
+
+        Args:
+            parent: Widget pai da operação (normalmente mw)
+            collection: Coleção do Anki (mw.col)
+            entries: DeckEntry do índice de decks, usados para somar os subdecks
+            callback: Função chamada na thread principal com dict deck_id -> contagens
+        """
+        counts = self.get_all(collection)
+        if counts is not None:
+            if callback is not None:
+                callback(counts)
+            return
+        if self._all_pending is not None:
+            if callback is not None:
+                self._all_pending.append(callback)
+            return
+        self._all_pending = [callback] if callback is not None else []
+
+        from aqt.operations import QueryOp
+        QueryOp(
+            parent=parent,
+            op=lambda col: (self._collection_key(col), roll_up(entries, batched_due_counts(col))),
+            success=self._on_all_result,
+        ).failure(self._on_all_failure).run_in_background()
+
+    def _collection_key(self, collection):
+        """Identifica o estado da coleção: objeto aberto + hora da última modificação"""
+        return (id(collection), collection.mod)
+
+    def _compute(self, col, deck_id):
+        """Executada em segundo plano: calcula as contagens do deck e de seus subdecks"""
+        key = self._collection_key(col)
+        node = col.sched.deck_due_tree(deck_id)
+        if node is None:
+            return key, None
+        return key, (node.new_count, node.learn_count, node.review_count)
+
+    def _on_result(self, deck_id, result):
+        """Guarda o resultado e entrega às funções que estavam aguardando"""
+        key, counts = result
+        if counts is not None:
+            self._cache[deck_id] = (key, time.monotonic(), counts)
+        for callback in self._pending.pop(deck_id, []):
+            try:
+                callback(counts)
+            except Exception as e:
+                self.logger.error(f"Erro ao entregar contagens do deck {deck_id}: {str(e)}")
+
+    def _on_all_result(self, result):
+        key, counts = result
+        self._all = (key, time.monotonic(), counts)
+        callbacks, self._all_pending = self._all_pending or [], None
+        for callback in callbacks:
+            try:
+                callback(counts)
+            except Exception as e:
+                self.logger.error(f"Erro ao entregar contagens dos decks: {str(e)}")
+
+    def _on_all_failure(self, error):
+        self._all_pending = None
+        self.logger.error(f"Erro ao calcular contagens dos decks: {str(error)}")
+
+    def _on_failure(self, deck_id, error):
+        self._pending.pop(deck_id, None)
+        self.logger.error(f"Erro ao calcular contagens do deck {deck_id}: {str(error)}")
+
+
+due_counts = DueCountCache()
@@ -0,0 +1,173 @@
+# Copyright 2025 Carlos Duarte
+import weakref
+from aqt.qt import QAbstractListModel, QModelIndex, QComboBox, Qt
+from deck_index import deck_index
+from dss_lifecycle import Lifecycle, lifecycle
+from translations import tr
+
+
+class DeckListModel(QAbstractListModel):
+    """
+    Modelo de lista de decks compartilhado pelos combos do popup e das opções.
+    Lê direto do DeckIndex, sem criar itens por deck. As linhas são expostas em
+    lotes (fetchMore) à medida que a lista aberta é rolada, então o layout da
+    view não percorre todos os decks. As contagens de cartões de cada deck
+    são preenchidas depois, quando a consulta em segundo plano termina.
+
+    Popup e opções podem estar abertos ao mesmo tempo: ao reconstruir o
+    modelo, o deck selecionado em cada combo ligado a ele é restaurado pelo id.
+    """
+
+    BATCH_SIZE = 100
+
+    def __init__(self, index=deck_index, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self._entries = []
+        self._loaded = 0
+        self._version = None
+        self._counts = {}  # deck_id -> (novos, aprendendo, revisão), incluindo subdecks
+        self._combos = weakref.WeakSet()  # combos ligados ao modelo (attach_deck_model)
+
+    def attach(self, combo):
+        """Passa a restaurar a seleção do combo quando o modelo for reconstruído"""
+        self._combos.add(combo)
+
+    def sync(self):
+        """Atualiza o modelo se o índice de decks foi reconstruído (O(1) caso contrário)"""
+        if self._version == self.index.version:
+            return False
+        selections = self._save_selections()
+        self.beginResetModel()
+        self._entries = self.index.entries
+        self._loaded = min(len(self._entries), self.BATCH_SIZE)
+        self._version = self.index.version
+        self.endResetModel()
+        self._restore_selections(selections)
+        return True
+
+    def _save_selections(self):
+        """Id do deck selecionado em cada combo ligado (None sem seleção); os sinais
+        dos combos ficam bloqueados até _restore_selections"""
+        selections = []
+        for combo in list(self._combos):
+            try:
+                row = combo.currentIndex()
+                combo.blockSignals(True)
+            except RuntimeError:
+                # O combo já foi destruído
+                continue
+            deck_id = self._entries[row].id if 0 <= row < len(self._entries) else None
+            selections.append((combo, deck_id))
+        return selections
+
+    def _restore_selections(self, selections):
+        """Seleciona de novo, pelo id, o deck de cada combo (a linha pode ter mudado)"""
+        for combo, deck_id in selections:
+            row = -1
+            if deck_id is not None:
+                name = self.index.name_for_id(deck_id)
+                if name:
+                    row = self.row_for_name(name)
+            try:
+                combo.setCurrentIndex(row)
+                combo.blockSignals(False)
+            except RuntimeError:
+                pass
+
+    def set_counts(self, counts):
+        """Recebe as contagens de todos os decks e atualiza as linhas já carregadas"""
+        self._counts = counts
+        if self._loaded:
+            self.dataChanged.emit(
+                self.createIndex(0, 0), self.createIndex(self._loaded - 1, 0),
+                [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole],
+            )
+
+    def refresh_counts(self):
+        """Solicita as contagens de todos os decks (cache ou uma única consulta em segundo plano)"""
+        from aqt import mw
+        if mw.col is None:
+            return
+        from due_counts import due_counts
+        due_counts.request_all(mw, mw.col, self.index.entries, self.set_counts)
+
+    def row_for_name(self, name):
+        """Retorna a linha do deck pelo nome completo (carregando-a se preciso), ou -1"""
+        row = self.index.row_for_name(name)
+        if row >= self._loaded and row < len(self._entries):
+            self._load_until(row + self.BATCH_SIZE)
+        return row
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._loaded < len(self._entries)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self._load_until(self._loaded + self.BATCH_SIZE)
+
+    def _load_until(self, count):
+        """Expõe as linhas até count (limitado ao total de decks)"""
+        count = min(count, len(self._entries))
+        if count <= self._loaded:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, count - 1)
+        self._loaded = count
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._loaded
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            counts = self._counts.get(entry.id)
+            if counts is None:
+                return entry.label
+            return f"{entry.label}  ({counts[0]} · {counts[1]} · {counts[2]})"
+        if role == Qt.ItemDataRole.UserRole:
+            return entry.name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            counts = self._counts.get(entry.id)
+            if counts is not None:
+                return tr("due_counts", new=counts[0], learn=counts[1], review=counts[2])
+        return None
+
+
+_shared_model = None
+
+
+def shared_deck_model():
+    """Retorna a instância única do modelo, criada no primeiro uso e destruída
+    ao fechar o perfil (guarda os decks e as contagens da coleção)"""
+    global _shared_model
+    if _shared_model is None:
+        _shared_model = DeckListModel()
+        lifecycle.qobject("deck_model", _shared_model, Lifecycle.PROFILE, release=_forget_shared_model)
+    return _shared_model
+
+
+def _forget_shared_model():
+    global _shared_model
+    _shared_model = None
+
+
+def attach_deck_model(combo):
+    """Configura um QComboBox para usar o modelo compartilhado sem varrer todas as linhas"""
+    model = shared_deck_model()
+    combo.setModel(model)
+    model.attach(combo)
+    # Evita que o sizeHint do combo percorra todos os decks para medir o texto
+    combo.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+    combo.setMinimumContentsLength(20)
+    view = combo.view()
+    if hasattr(view, "setUniformItemSizes"):
+        view.setUniformItemSizes(True)
+    return combo.model()
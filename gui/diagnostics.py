@@ -0,0 +1,214 @@
+# Copyright 2025 Carlos Duarte
+from aqt.qt import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+    QTabWidget, QTableWidget, QTableWidgetItem, QWidget, QAbstractItemView,
+    QFileDialog, QPlainTextEdit, QCheckBox
+)
+from aqt.utils import tooltip
+import logging
+from dss_journal import journal
+from journal_analytics import analyze_journal, write_csv
+from dss_log_pipeline import get_logger, log_pipeline
+from dss_metrics import registry as metrics
+from translations import tr
+
+
+class DiagnosticsDialog(QDialog):
+    """Painel de diagnóstico do addon (métricas de desempenho, análise dos lembretes e log recente)"""
+
+    def __init__(self, parent):
+        super().__init__(parent=parent)
+        self.logger = get_logger(__name__)
+        self.setWindowTitle(tr("diagnostics_title"))
+        self.resize(720, 420)
+
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self._build_metrics_tab(), tr("diagnostics_metrics_tab"))
+        self.tabs.addTab(self._build_analytics_tab(), tr("analytics_tab"))
+        self.tabs.addTab(self._build_log_tab(), tr("diagnostics_log_tab"))
+
+        self.close_btn = QPushButton(text=tr("close"))
+        self.close_btn.clicked.connect(self.close)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.tabs)
+        layout.addWidget(self.close_btn)
+
+        self.refresh_metrics()
+        self.refresh_analytics()
+        self.refresh_log()
+
+    def _build_metrics_tab(self):
+        """Tabela com chamadas, erros e latências de cada ponto instrumentado"""
+        tab = QWidget()
+        self.metrics_status = QLabel(tr("diagnostics_disabled"))
+        self.metrics_table = QTableWidget(0, 7)
+        self.metrics_table.setHorizontalHeaderLabels([
+            tr("diagnostics_col_entry"), tr("diagnostics_col_calls"), tr("diagnostics_col_errors"),
+            tr("diagnostics_col_mean"), "p50 (ms)", "p95 (ms)", "p99 (ms)",
+        ])
+        self.metrics_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.metrics_table.verticalHeader().setVisible(False)
+
+        refresh_btn = QPushButton(text=tr("diagnostics_refresh"))
+        refresh_btn.clicked.connect(self.refresh_metrics)
+        reset_btn = QPushButton(text=tr("diagnostics_reset"))
+        reset_btn.clicked.connect(self.reset_metrics)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(refresh_btn)
+        buttons.addWidget(reset_btn)
+
+        layout = QVBoxLayout(tab)
+        layout.addWidget(self.metrics_status)
+        layout.addWidget(self.metrics_table)
+        layout.addLayout(buttons)
+        return tab
+
+    def _build_log_tab(self):
+        """Registros recentes do log do addon, guardados em memória"""
+        tab = QWidget()
+        self.log_view = QPlainTextEdit()
+        self.log_view.setReadOnly(True)
+        self.log_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+
+        self.log_verbose_check = QCheckBox(tr("diagnostics_log_verbose"))
+        self.log_verbose_check.setChecked(log_pipeline.level <= logging.DEBUG)
+        self.log_verbose_check.toggled.connect(self.on_log_verbose_toggled)
+        refresh_btn = QPushButton(text=tr("diagnostics_refresh"))
+        refresh_btn.clicked.connect(self.refresh_log)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.log_verbose_check)
+        buttons.addStretch()
+        buttons.addWidget(refresh_btn)
+
+        layout = QVBoxLayout(tab)
+        layout.addWidget(self.log_view)
+        layout.addLayout(buttons)
+        return tab
+
+    def _build_analytics_tab(self):
+        """Resumo da análise do diário de eventos e efetividade por hora do dia"""
+        tab = QWidget()
+        self.analytics_status = QLabel(tr("analytics_loading"))
+        self.analytics_summary = QTableWidget(0, 2)
+        self.analytics_summary.setHorizontalHeaderLabels([tr("analytics_col_metric"), tr("analytics_col_value")])
+        self.analytics_hours = QTableWidget(0, 4)
+        self.analytics_hours.setHorizontalHeaderLabels([
+            tr("analytics_col_hour"), tr("analytics_col_shown"),
+            tr("analytics_col_studied"), tr("analytics_col_conversion"),
+        ])
+        for table in (self.analytics_summary, self.analytics_hours):
+            table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            table.verticalHeader().setVisible(False)
+
+        refresh_btn = QPushButton(text=tr("diagnostics_refresh"))
+        refresh_btn.clicked.connect(self.refresh_analytics)
+        self.export_btn = QPushButton(text=tr("analytics_export"))
+        self.export_btn.clicked.connect(self.export_analytics)
+        self.export_btn.setEnabled(False)
+
+        tables = QHBoxLayout()
+        tables.addWidget(self.analytics_summary)
+        tables.addWidget(self.analytics_hours)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(refresh_btn)
+        buttons.addWidget(self.export_btn)
+
+        layout = QVBoxLayout(tab)
+        layout.addWidget(self.analytics_status)
+        layout.addLayout(tables)
+        layout.addLayout(buttons)
+        self.analytics = None
+        return tab
+
+    def refresh_analytics(self):
+        """Analisa o diário em segundo plano e preenche as tabelas quando terminar"""
+        from aqt.operations import QueryOp
+        self.analytics_status.setText(tr("analytics_loading"))
+        self.analytics_status.setVisible(True)
+        QueryOp(
+            parent=self,
+            op=lambda col: analyze_journal(journal),
+            success=self.show_analytics,
+        ).without_collection().failure(self.on_analytics_failed).run_in_background()
+
+    def show_analytics(self, stats):
+        """Preenche as tabelas com o resultado da análise"""
+        try:
+            self.analytics = stats
+            self.analytics_status.setVisible(stats.reminders == 0)
+            self.analytics_status.setText(tr("analytics_empty"))
+            rows = stats.summary_rows()
+            self.analytics_summary.setRowCount(len(rows))
+            for row, (key, value) in enumerate(rows):
+                self.analytics_summary.setItem(row, 0, QTableWidgetItem(tr(key)))
+                self.analytics_summary.setItem(row, 1, QTableWidgetItem(value))
+            hours = stats.hour_rows()
+            self.analytics_hours.setRowCount(len(hours))
+            for row, (hour, shown, studied, rate) in enumerate(hours):
+                cells = [f"{hour:02d}h", str(shown), str(studied), f"{rate * 100:.1f}%"]
+                for column, text in enumerate(cells):
+                    self.analytics_hours.setItem(row, column, QTableWidgetItem(text))
+            self.analytics_summary.resizeColumnsToContents()
+            self.analytics_hours.resizeColumnsToContents()
+            self.export_btn.setEnabled(True)
+        except RuntimeError:
+            # O painel foi fechado antes de a análise terminar
+            pass
+
+    def on_analytics_failed(self, error):
+        self.logger.error(f'Erro ao analisar o diário de eventos: {str(error)}')
+        try:
+            self.analytics_status.setText(tr("analytics_error"))
+        except RuntimeError:
+            pass
+
+    def export_analytics(self):
+        """Exporta a última análise para um arquivo CSV escolhido pelo usuário"""
+        if self.analytics is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, tr("analytics_export"), "reminders.csv", "CSV (*.csv)")
+        if not path:
+            return
+        try:
+            write_csv(self.analytics, path, tr)
+            tooltip(tr("analytics_exported"))
+        except Exception as e:
+            self.logger.error(f'Erro ao exportar a análise: {str(e)}')
+            tooltip(tr("analytics_error"))
+
+    def refresh_metrics(self):
+        """Recarrega a tabela a partir do registro de métricas"""
+        try:
+            self.metrics_status.setVisible(not metrics.enabled)
+            rows = metrics.summary()
+            self.metrics_table.setRowCount(len(rows))
+            for row, values in enumerate(rows):
+                name, calls, errors, mean, p50, p95, p99 = values
+                cells = [name, str(calls), str(errors)] + [f"{v:.3f}" for v in (mean, p50, p95, p99)]
+                for column, text in enumerate(cells):
+                    self.metrics_table.setItem(row, column, QTableWidgetItem(text))
+            self.metrics_table.resizeColumnsToContents()
+        except Exception as e:
+            self.logger.error(f'Erro ao carregar métricas: {str(e)}')
+
+    def reset_metrics(self):
+        """Zera todos os contadores e histogramas"""
+        metrics.reset()
+        self.refresh_metrics()
+
+    def refresh_log(self):
+        """Recarrega os registros recentes e rola até o fim"""
+        lines = log_pipeline.recent_lines()
+        self.log_view.setPlainText("\n".join(lines) if lines else tr("diagnostics_log_empty"))
+        scrollbar = self.log_view.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+
+    def on_log_verbose_toggled(self, checked):
+        """Liga ou desliga o log detalhado (DEBUG) até o Anki ser reiniciado"""
+        log_pipeline.set_level(logging.DEBUG if checked else logging.WARNING)
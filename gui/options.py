@@ -4,8 +4,11 @@ from aqt.qt import (
     QCheckBox, QSpinBox, QFrame, Qt, QApplication
 )
 from aqt.utils import showInfo, tooltip
+from addon_config import AddonConfig
 from anki_utils import AnkiUtils
-import logging
+from gui.deck_model import attach_deck_model
+from dss_log_pipeline import get_logger
+from dss_metrics import registry as metrics
 from translations import tr
 
 class ReminderOptions(QDialog):
@@ -14,23 +17,18 @@ class ReminderOptions(QDialog):
         super().__init__(parent=parent)
         self.anki_utils = AnkiUtils()
         self.dont_stop_scheduler = dont_stop_scheduler
-        self.logger = logging.getLogger(__name__.split('.')[0])
+        self.logger = get_logger(__name__)
         self.has_changes = False  # Flag para rastrear alterações
         
         try:
             self.config = self.anki_utils.get_config()
         except Exception as e:
             self.logger.error(f'Erro ao obter a configuração: {str(e)}')
-            self.config = {
-                "deck": "",
-                "frequency": 1,  # Valor padrão de 1 minuto
-                "enabled": True,
-                "window_location": "bottom_right"
-            }
+            self.config = AddonConfig()
         
         # Configuração da janela
         self.setWindowTitle(tr("config_title"))
-        self.setFixedSize(400, 400)
+        self.setFixedSize(400, 555)
         self.setStyleSheet("""
             QDialog {
                 background-color: #f5f5f5;
@@ -62,6 +60,7 @@ class ReminderOptions(QDialog):
         # Seleção de Deck
         self.deck_select_text = QLabel(text=tr("deck_select"))
         self.deck_select = QComboBox()
+        self.deck_model = attach_deck_model(self.deck_select)
         
         # Obter todos os decks disponíveis
         try:
@@ -73,29 +72,18 @@ class ReminderOptions(QDialog):
                 self.close()
                 return
             
-            # Adicionar todos os decks ao combobox
-            for deck in decks:
-                deck_name = deck.name if hasattr(deck, "name") else deck[0]
-                level = deck_name.count("::")
-                display_name = "   " * level + deck_name.split("::")[-1] if level > 0 else deck_name
-                self.deck_select.addItem(display_name, deck_name)
+            # O modelo compartilhado lê direto do índice; nada é adicionado item a item
+            self.deck_model.sync()
+            self.deck_model.refresh_counts()
             
             # Verificar se o deck configurado existe na lista
-            configured_deck = self.config.get('deck', '')
-
-            # Procurar pelo nome completo do deck nos dados do combobox
-            deck_index = -1
-            for i in range(self.deck_select.count()):
-                if self.deck_select.itemData(i) == configured_deck:
-                    deck_index = i
-                    break
+            configured_deck = self.config.deck
+            deck_index = self.deck_model.row_for_name(configured_deck)
 
-            # Se o deck configurado não existir, adicionar ao combobox com indentação hierárquica
+            # Se o deck configurado não existir, mantém o nome como texto de exibição sem seleção
             if deck_index == -1:
-                level = configured_deck.count("::")
-                display_name = "   " * level + configured_deck.split("::")[-1] if level > 0 else configured_deck
-                self.deck_select.addItem(display_name, configured_deck)
-                self.deck_select.setCurrentIndex(self.deck_select.count() - 1)
+                self.deck_select.setCurrentIndex(-1)
+                self.deck_select.setPlaceholderText(configured_deck)
             else:
                 self.deck_select.setCurrentIndex(deck_index)
         except Exception as e:
@@ -104,6 +92,10 @@ class ReminderOptions(QDialog):
             self.close()
             return
 
+        # Sugerir o deck mais urgente no popup
+        self.suggest_urgent_deck_check = QCheckBox(tr("suggest_urgent_deck_check"))
+        self.suggest_urgent_deck_check.setChecked(self.config.suggest_urgent_deck)
+
         # Frequência
         self.freq_select_text = QLabel(text=tr("freq_select"))
         self.freq_select_map = {
@@ -125,8 +117,8 @@ class ReminderOptions(QDialog):
         for frequency in self.freq_select_map.keys():
             self.freq_select.addItem(frequency)
         try:
-            freq_select_idx = list(self.freq_select_map.values()).index(self.config['frequency'])
-        except (ValueError, KeyError) as e:
+            freq_select_idx = list(self.freq_select_map.values()).index(self.config.frequency)
+        except ValueError as e:
             self.logger.warning(tr('default_frequency_warning'))
             freq_select_idx = 4  # Padrão para 30 minutos
         finally:
@@ -136,14 +128,14 @@ class ReminderOptions(QDialog):
         self.enabled_check_text = QLabel(text=tr("enabled_check"))
         self.enabled_check = QCheckBox()
         try:
-            self.enabled_check.setChecked(self.config.get('enabled', True))
+            self.enabled_check.setChecked(self.config.enabled)
         except Exception as e:
             self.logger.error(f'Erro ao definir o estado do checkbox: {str(e)}')
             self.enabled_check.setChecked(True)  # Valor padrão
 
         # --- Inatividade após tempo máximo do cartão ---
         self.inactivity_after_max_answer_check = QCheckBox(tr("inactivity_reminder_label"))
-        self.inactivity_after_max_answer_check.setChecked(self.config.get('inactivity_after_max_answer', False))
+        self.inactivity_after_max_answer_check.setChecked(self.config.inactivity_after_max_answer)
 
         self.inactivity_divider = QFrame()
         self.inactivity_divider.setFrameShape(QFrame.Shape.HLine)
@@ -154,10 +146,27 @@ class ReminderOptions(QDialog):
         for freq_label, freq_value in self.freq_select_map.items():
             self.inactivity_extra_minutes_select.addItem(freq_label, freq_value)
         # Seleciona o valor salvo na configuração, se existir
-        inactivity_extra_minutes = self.config.get('inactivity_extra_minutes', 3)
+        inactivity_extra_minutes = self.config.inactivity_extra_minutes
         idx = list(self.freq_select_map.values()).index(inactivity_extra_minutes) if inactivity_extra_minutes in self.freq_select_map.values() else 0
         self.inactivity_extra_minutes_select.setCurrentIndex(idx)
 
+        # --- Métricas de desempenho ---
+        self.metrics_enabled_check = QCheckBox(tr("metrics_enabled_check"))
+        self.metrics_enabled_check.setChecked(self.config.metrics_enabled)
+        self.low_power_timers_check = QCheckBox(tr("low_power_timers_check"))
+        self.low_power_timers_check.setChecked(self.config.low_power_timers)
+        self.diagnostics_btn = QPushButton(text=tr("diagnostics"))
+        self.diagnostics_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #607D8B;
+                color: white;
+            }
+            QPushButton:hover {
+                background-color: #455A64;
+            }
+        """)
+        self.diagnostics_btn.clicked.connect(self.show_diagnostics)
+
         # Botão Salvar
         self.ok_btn = QPushButton(text=tr("save"))
         self.ok_btn.clicked.connect(self.confirm_and_update_config)
@@ -192,8 +201,9 @@ class ReminderOptions(QDialog):
         self.grid = QGridLayout()
         self.grid.addWidget(self.deck_select_text, 0, 0)
         self.grid.addWidget(self.deck_select, 0, 1)
-        self.grid.addWidget(self.freq_select_text, 1, 0)
-        self.grid.addWidget(self.freq_select, 1, 1)
+        self.grid.addWidget(self.suggest_urgent_deck_check, 1, 0, 1, 2)
+        self.grid.addWidget(self.freq_select_text, 2, 0)
+        self.grid.addWidget(self.freq_select, 2, 1)
 
         # Adiciona o controle de posição da janela
         window_location_label = QLabel(tr("window_location_label"))
@@ -204,45 +214,77 @@ class ReminderOptions(QDialog):
         self.window_location_select.addItem(tr("window_location_random"), "sequential")
         
         # Define a posição atual
-        current_location = self.config.get("window_location", "bottom_right")
+        current_location = self.config.window_location
         index = self.window_location_select.findData(current_location)
         if index >= 0:
             self.window_location_select.setCurrentIndex(index)
             
-        self.grid.addWidget(window_location_label, 2, 0)
-        self.grid.addWidget(self.window_location_select, 2, 1)
-        self.grid.addWidget(self.enabled_check_text, 3, 0)
-        self.grid.addWidget(self.enabled_check, 3, 1)
+        self.grid.addWidget(window_location_label, 3, 0)
+        self.grid.addWidget(self.window_location_select, 3, 1)
+
+        # Tela em que o popup é mostrado
+        popup_screen_label = QLabel(tr("popup_screen_label"))
+        self.popup_screen_select = QComboBox()
+        self.popup_screen_select.addItem(tr("popup_screen_primary"), "primary")
+        self.popup_screen_select.addItem(tr("popup_screen_main_window"), "main_window")
+        index = self.popup_screen_select.findData(self.config.popup_screen)
+        if index >= 0:
+            self.popup_screen_select.setCurrentIndex(index)
+
+        self.grid.addWidget(popup_screen_label, 4, 0)
+        self.grid.addWidget(self.popup_screen_select, 4, 1)
+
+        # Política de ciclo de vida do popup
+        popup_lifecycle_label = QLabel(tr("popup_lifecycle_label"))
+        self.popup_lifecycle_select = QComboBox()
+        self.popup_lifecycle_select.addItem(tr("popup_lifecycle_prewarmed"), "prewarmed")
+        self.popup_lifecycle_select.addItem(tr("popup_lifecycle_low_memory"), "low_memory")
+        index = self.popup_lifecycle_select.findData(self.config.popup_lifecycle)
+        if index >= 0:
+            self.popup_lifecycle_select.setCurrentIndex(index)
+
+        self.grid.addWidget(popup_lifecycle_label, 5, 0)
+        self.grid.addWidget(self.popup_lifecycle_select, 5, 1)
+        self.grid.addWidget(self.enabled_check_text, 6, 0)
+        self.grid.addWidget(self.enabled_check, 6, 1)
 
         # Linha divisória antes do grupo
         self.inactivity_group_divider_top = QFrame()
         self.inactivity_group_divider_top.setFrameShape(QFrame.Shape.HLine)
         self.inactivity_group_divider_top.setFrameShadow(QFrame.Shadow.Sunken)
-        self.grid.addWidget(self.inactivity_group_divider_top, 4, 0, 1, 2)
+        self.grid.addWidget(self.inactivity_group_divider_top, 7, 0, 1, 2)
 
-        self.grid.addWidget(self.inactivity_after_max_answer_check, 5, 0, 1, 2)
-        self.grid.addWidget(self.inactivity_extra_minutes_label, 6, 0)
-        self.grid.addWidget(self.inactivity_extra_minutes_select, 6, 1)
+        self.grid.addWidget(self.inactivity_after_max_answer_check, 8, 0, 1, 2)
+        self.grid.addWidget(self.inactivity_extra_minutes_label, 9, 0)
+        self.grid.addWidget(self.inactivity_extra_minutes_select, 9, 1)
 
         # Linha divisória depois do grupo
         self.inactivity_group_divider_bottom = QFrame()
         self.inactivity_group_divider_bottom.setFrameShape(QFrame.Shape.HLine)
         self.inactivity_group_divider_bottom.setFrameShadow(QFrame.Shadow.Sunken)
-        self.grid.addWidget(self.inactivity_group_divider_bottom, 7, 0, 1, 2)
+        self.grid.addWidget(self.inactivity_group_divider_bottom, 10, 0, 1, 2)
 
-        self.grid.addWidget(self.show_card_btn, 8, 0, 1, 2)
-        self.grid.addWidget(self.ok_btn, 9, 0)
-        self.grid.addWidget(self.close_btn, 9, 1)
+        self.grid.addWidget(self.metrics_enabled_check, 11, 0)
+        self.grid.addWidget(self.diagnostics_btn, 11, 1)
+        self.grid.addWidget(self.low_power_timers_check, 12, 0, 1, 2)
+        self.grid.addWidget(self.show_card_btn, 13, 0, 1, 2)
+        self.grid.addWidget(self.ok_btn, 14, 0)
+        self.grid.addWidget(self.close_btn, 14, 1)
 
         self.setLayout(self.grid)
 
         # Conectar sinais de mudança
         self.deck_select.currentIndexChanged.connect(self.on_deck_changed)
+        self.suggest_urgent_deck_check.stateChanged.connect(self.on_suggest_urgent_deck_changed)
         self.freq_select.currentIndexChanged.connect(self.on_frequency_changed)
         self.enabled_check.stateChanged.connect(self.on_enabled_changed)
         self.window_location_select.currentIndexChanged.connect(self.on_window_location_changed)
+        self.popup_screen_select.currentIndexChanged.connect(self.on_popup_screen_changed)
+        self.popup_lifecycle_select.currentIndexChanged.connect(self.on_popup_lifecycle_changed)
         self.inactivity_after_max_answer_check.stateChanged.connect(self.on_inactivity_changed)
         self.inactivity_extra_minutes_select.currentIndexChanged.connect(self.on_extra_minutes_changed)
+        self.metrics_enabled_check.stateChanged.connect(self.on_metrics_enabled_changed)
+        self.low_power_timers_check.stateChanged.connect(self.on_low_power_timers_changed)
 
     def center_on_screen(self):
         """Centraliza a janela de opções na tela principal do Anki"""
@@ -278,23 +320,29 @@ class ReminderOptions(QDialog):
         self.logger.info('Atualizando configuração...')
         try:
             freq_value = self.freq_select_map[self.freq_select.currentText()]
-            self.logger.debug(f'Valor da frequência selecionada: {freq_value}')
+            self.logger.debug('Valor da frequência selecionada: %s', freq_value)
             
-            self.config = {
-                "deck": self.deck_select.currentData() or self.deck_select.currentText(),
-                "frequency": freq_value,
-                "enabled": self.enabled_check.checkState() == Qt.CheckState.Checked,
-                "window_location": self.window_location_select.currentData(),
-                "inactivity_after_max_answer": self.inactivity_after_max_answer_check.isChecked(),
-                "inactivity_extra_minutes": self.inactivity_extra_minutes_select.currentData()
-            }
-            self.logger.debug(f'Config a ser salva: {self.config}')
+            self.config = self.config.replace(
+                deck=self.deck_select.currentData() or self.config.deck,
+                suggest_urgent_deck=self.suggest_urgent_deck_check.isChecked(),
+                frequency=freq_value,
+                enabled=self.enabled_check.checkState() == Qt.CheckState.Checked,
+                window_location=self.window_location_select.currentData(),
+                popup_screen=self.popup_screen_select.currentData(),
+                inactivity_after_max_answer=self.inactivity_after_max_answer_check.isChecked(),
+                inactivity_extra_minutes=self.inactivity_extra_minutes_select.currentData(),
+                popup_lifecycle=self.popup_lifecycle_select.currentData(),
+                metrics_enabled=self.metrics_enabled_check.isChecked(),
+                low_power_timers=self.low_power_timers_check.isChecked()
+            )
+            self.logger.debug('Config a ser salva: %s', self.config)
             
             success = self.anki_utils.set_config(self.config)
             if success:
                 try:
                     self.dont_stop_scheduler.update_state(self.config)
-                    self.logger.debug("Novo valor de configuração: %s" % self.anki_utils.get_config())
+                    metrics.set_enabled(self.config.metrics_enabled)
+                    self.logger.debug("Novo valor de configuração: %s", self.anki_utils.get_config())
                     tooltip(tr("config_saved"))
                     self.has_changes = False  # Reseta a flag de alterações
                 except Exception as e:
@@ -310,13 +358,17 @@ class ReminderOptions(QDialog):
 
     def resizeEvent(self, event):
         # Impede redimensionamento manual da janela
-        self.setFixedSize(400, 400)
+        self.setFixedSize(400, 555)
         super().resizeEvent(event)
 
     def on_deck_changed(self, index):
         """Marca que houve alteração no deck selecionado"""
         self.has_changes = True
 
+    def on_suggest_urgent_deck_changed(self, state):
+        """Marca que houve alteração na sugestão do deck mais urgente"""
+        self.has_changes = True
+
     def on_frequency_changed(self, index):
         """Marca que houve alteração na frequência"""
         self.has_changes = True
@@ -329,6 +381,14 @@ class ReminderOptions(QDialog):
         """Marca que houve alteração na posição da janela"""
         self.has_changes = True
 
+    def on_popup_screen_changed(self, index):
+        """Marca que houve alteração na tela do popup"""
+        self.has_changes = True
+
+    def on_popup_lifecycle_changed(self, index):
+        """Marca que houve alteração no ciclo de vida do popup"""
+        self.has_changes = True
+
     def on_inactivity_changed(self, state):
         """Marca que houve alteração no estado de inatividade"""
         self.has_changes = True
@@ -337,6 +397,19 @@ class ReminderOptions(QDialog):
         """Marca que houve alteração nos minutos extras"""
         self.has_changes = True
 
+    def on_metrics_enabled_changed(self, state):
+        """Marca que houve alteração na coleta de métricas"""
+        self.has_changes = True
+
+    def on_low_power_timers_changed(self, state):
+        """Marca que houve alteração no modo de baixo consumo dos timers"""
+        self.has_changes = True
+
+    def show_diagnostics(self):
+        """Abre o painel de diagnóstico"""
+        from gui.diagnostics import DiagnosticsDialog
+        DiagnosticsDialog(self).exec()
+
     def closeEvent(self, event):
         """Verifica se há alterações não salvas antes de fechar"""
         if self.has_changes:
@@ -383,7 +456,8 @@ class ReminderOptions(QDialog):
                 return
         
         try:
-            self.dont_stop_scheduler.exec_schedule()
+            # Marcado como teste: não entra na conversão dos lembretes
+            self.dont_stop_scheduler.exec_schedule(reason="test")
         except Exception as e:
             self.logger.error(f'Erro ao executar o agendador: {str(e)}')
             QMessageBox.warning(self, tr("options_menu"), tr("popup_error"))
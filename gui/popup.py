@@ -2,32 +2,58 @@
 from aqt.qt import (
     QDialog, QWidget, QGridLayout, QPushButton,
     QHBoxLayout, QLabel, QVBoxLayout, QComboBox,
-    Qt, QApplication, QTimer
+    Qt, QApplication, pyqtSignal
 )
 from aqt.utils import showInfo, tooltip
 from anki_utils import AnkiUtils
-import logging
+from deck_ranking import deck_ranking
+from due_counts import due_counts
+from dss_journal import journal
+from gui.deck_model import attach_deck_model
+from gui.screen_anchors import ScreenAnchors
+from dss_log_pipeline import get_logger
+from dss_metrics import instrument
 from translations import tr
 
 
 class ReminderPopup(QDialog):
 
-    def __init__(self, parent):
+    # Emitido sempre que o popup é escondido (Depois, Estudar Agora ou cancelamento)
+    hidden = pyqtSignal()
+
+    # Intervalo (em segundos) entre as trocas de posição no modo sequencial
+    ROTATION_SECS = 10
+
+    def __init__(self, parent, timer_engine=None):
         super().__init__(parent=parent)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Window)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setModal(True)
-        self.resize(400, 260)  # Aumentei a largura total
+        self.resize(400, 285)  # Aumentei a largura total
 
         self.anki_utils = AnkiUtils()
-        self.logger = logging.getLogger(__name__.split('.')[0])
+        self.logger = get_logger(__name__)
         self.position_index = 0  # Índice para controlar a sequência de posições
         self.positions = ["bottom_right", "bottom_left", "center"]  # Sequência fixa de posições
+        self.screen_anchors = ScreenAnchors(self.frameGeometry().size(), self)
+        self.window_location = "bottom_right"  # Cópias das opções de posição (sem ler a configuração ao posicionar)
+        self.popup_screen = "primary"
+        try:
+            self.set_position_options(self.anki_utils.get_config())
+        except Exception as e:
+            self.logger.error(f'Erro ao ler as opções de posição: {str(e)}')
+        self._counts_deck_id = None  # Deck cujas contagens o popup está aguardando/mostrando
+        self._awaiting_ranking = False  # Pré-seleção pendente da classificação em segundo plano
+        if timer_engine is None:
+            from dss_timer_engine import TimerEngine
+            timer_engine = TimerEngine()
+        self.timer_engine = timer_engine
+        self._rotation = None  # Prazo da próxima troca de posição (modo sequencial)
 
         # Container central
         self.central_widget = QWidget(self)
         self.central_widget.setObjectName("central_widget")
-        self.central_widget.setGeometry(10, 10, 380, 240)  # Aumentei a largura do container
+        self.central_widget.setGeometry(10, 10, 380, 265)  # Aumentei a largura do container
         self.central_widget.setStyleSheet("""
             #central_widget {
                 background: white;
@@ -93,8 +119,9 @@ class ReminderPopup(QDialog):
         combo_layout = QHBoxLayout(combo_container)
         combo_layout.setContentsMargins(0, 0, 0, 0)
 
-        # Combo de decks
+        # Combo de decks (modelo compartilhado com a janela de opções)
         self.deck_select = QComboBox()
+        self.deck_model = attach_deck_model(self.deck_select)
         self.deck_select.setFixedWidth(320)
         self.deck_select.setStyleSheet("""
             QComboBox {
@@ -120,6 +147,16 @@ class ReminderPopup(QDialog):
         combo_layout.addWidget(self.deck_select, alignment=Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(combo_container)
 
+        # Contagens do deck selecionado (calculadas em segundo plano)
+        self.counts_label = QLabel("")
+        self.counts_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.counts_label.setStyleSheet("""
+            font-size: 13px;
+            color: #666;
+            margin-top: -5px;
+        """)
+        layout.addWidget(self.counts_label)
+
         # Container para botões
         button_container = QWidget()
         button_layout = QHBoxLayout(button_container)
@@ -163,7 +200,7 @@ class ReminderPopup(QDialog):
                 background-color: #d32f2f;
             }
         """)
-        self.dismiss_button.clicked.connect(self.hide_card)
+        self.dismiss_button.clicked.connect(self.dismiss)
         button_layout.addWidget(self.dismiss_button)
 
         layout.addWidget(button_container)
@@ -172,61 +209,144 @@ class ReminderPopup(QDialog):
         # Preencher decks
         try:
             config = self.anki_utils.get_config()
-            deck_name = config.get('deck', '')
-            decks = self.anki_utils.get_decks()
-            deck_names = [deck.name for deck in decks]
-            self.deck_select.addItems(deck_names)
-            if deck_name in deck_names:
-                self.deck_select.setCurrentText(deck_name)
+            self.anki_utils.deck_index()
+            self.deck_model.sync()
+            row = self.deck_model.row_for_name(config.deck)
+            if row != -1:
+                self.deck_select.setCurrentIndex(row)
         except Exception as e:
             self.logger.error(f'Erro ao carregar decks: {str(e)}')
+        self.deck_select.currentIndexChanged.connect(self.on_deck_changed)
+
+    def set_position_options(self, config):
+        """Guarda as opções de posição da configuração, usadas por set_card_position"""
+        if config.window_location != self.window_location:
+            self.position_index = 0  # Recomeça a sequência ao trocar de posição
+        self.window_location = config.window_location
+        self.popup_screen = config.popup_screen
 
     def set_card_position(self):
-        """Posiciona o popup conforme a configuração em settings.json"""
+        """Posiciona o popup conforme as opções de posição (consulta às posições em cache)"""
         try:
-            screen_geometry = QApplication.instance().primaryScreen().availableGeometry()
-            geo = self.frameGeometry()
-            
-            location = self.anki_utils.get_config().get("window_location", "bottom_right")
+            location = self.window_location
             
             # Se for posição sequencial, usa a sequência fixa
             if location == "sequential":
                 location = self.positions[self.position_index]
                 self.position_index = (self.position_index + 1) % len(self.positions)
             
-            if location == "bottom_right":
-                x = screen_geometry.x() + screen_geometry.width() - geo.width() - 20
-                y = screen_geometry.y() + screen_geometry.height() - geo.height() - 20
-                self.move(x, y)
-            elif location == "bottom_left":
-                x = screen_geometry.x() + 20
-                y = screen_geometry.y() + screen_geometry.height() - geo.height() - 20
-                self.move(x, y)
-            else:  # center
-                center_point = screen_geometry.center()
-                geo.moveCenter(center_point)
-                self.move(geo.topLeft())
+            # Tela de destino: a principal ou a que contém a janela do Anki
+            screen = None
+            if self.popup_screen == "main_window" and self.parentWidget() is not None:
+                screen = self.parentWidget().screen()
+            point = self.screen_anchors.anchor(location, screen)
+            if point is None:
+                raise RuntimeError("nenhuma tela disponível")
+            self.move(point)
                 
-            # Configura o timer para posição sequencial
-            if self.anki_utils.get_config().get("window_location") == "sequential":
-                if not hasattr(self, 'sequence_position_timer'):
-                    self.sequence_position_timer = QTimer()
-                    self.sequence_position_timer.timeout.connect(self.set_card_position)
-                if not self.sequence_position_timer.isActive():
-                    self.sequence_position_timer.start(10000)  # 10 segundos
-            elif hasattr(self, 'sequence_position_timer'):
-                self.sequence_position_timer.stop()
-                self.position_index = 0  # Reseta o índice quando sai do modo sequencial
+            # Configura o timer para posição sequencial (fora da grade do modo de baixo consumo)
+            if self.window_location == "sequential":
+                self._rotation = self.timer_engine.schedule(
+                    self.ROTATION_SECS, self.set_card_position, self._rotation, coalesce=False
+                )
+            else:
+                self.timer_engine.cancel(self._rotation)
                 
         except Exception as e:
             self.logger.error(f'Erro ao posicionar o popup: {str(e)}')
             self.move(100, 100)
 
+    def prewarm(self):
+        """Deixa a janela escondida totalmente polida e com layout calculado,
+        para que show_popup seja apenas mover e mostrar"""
+        try:
+            self.ensurePolished()
+            for widget in self.findChildren(QWidget):
+                widget.ensurePolished()
+            self.central_widget.layout().activate()
+            self.winId()  # Cria a janela nativa antecipadamente
+        except Exception as e:
+            self.logger.error(f'Erro ao pré-carregar o popup: {str(e)}')
+
+    def hideEvent(self, event):
+        """Para os timers auxiliares enquanto o popup está escondido"""
+        self.timer_engine.cancel(self._rotation)
+        # Resultados que chegarem depois de escondido são descartados
+        self._counts_deck_id = None
+        self._awaiting_ranking = False
+        super().hideEvent(event)
+        self.hidden.emit()
+
     def on_deck_changed(self, idx):
-        # Atualize aqui o comportamento ao trocar o deck, se necessário
-        pass
+        """Atualiza as contagens ao trocar o deck"""
+        # A escolha do usuário prevalece sobre a classificação que ainda não chegou
+        self._awaiting_ranking = False
+        if self.isVisible():
+            self.request_due_counts()
+
+    def select_deck(self, deck_name):
+        """Seleciona o deck no combo sem contar como escolha do usuário"""
+        row = self.deck_model.row_for_name(deck_name)
+        if row == -1:
+            return False
+        self.deck_select.blockSignals(True)
+        self.deck_select.setCurrentIndex(row)
+        self.deck_select.blockSignals(False)
+        return True
+
+    def preselect_urgent_deck(self, ranking):
+        """Seleciona o primeiro deck da classificação de urgência"""
+        if not ranking:
+            return False
+        deck_name = self.anki_utils.deck_index().name_for_id(ranking[0].deck_id)
+        return bool(deck_name) and self.select_deck(deck_name)
+
+    def on_deck_ranking(self, ranking):
+        """Recebe a classificação em segundo plano; ignora se o popup foi escondido
+        ou o usuário já escolheu um deck"""
+        if not self._awaiting_ranking:
+            return
+        self._awaiting_ranking = False
+        if self.preselect_urgent_deck(ranking):
+            self.request_due_counts()
+
+    def request_due_counts(self):
+        """Mostra as contagens do deck selecionado; fora do cache, mostra 'carregando'
+        e atualiza o texto quando a consulta em segundo plano terminar"""
+        try:
+            from aqt import mw
+            deck_name = self.deck_select.currentData() or self.deck_select.currentText()
+            deck_id = self.anki_utils.deck_id(deck_name) if deck_name else None
+            self._counts_deck_id = deck_id
+            if deck_id is None or mw.col is None:
+                self.counts_label.setText("")
+                return
+            counts = due_counts.get(mw.col, deck_id)
+            if counts is not None:
+                self.set_due_counts(counts)
+                return
+            self.counts_label.setText(tr("due_counts_loading"))
+            due_counts.request(mw, mw.col, deck_id, lambda counts: self.on_due_counts(deck_id, counts))
+        except Exception as e:
+            self.logger.error(f'Erro ao obter contagens do deck: {str(e)}')
+            self.counts_label.setText("")
+
+    def on_due_counts(self, deck_id, counts):
+        """Recebe as contagens em segundo plano; ignora se o deck selecionado já mudou"""
+        if deck_id == self._counts_deck_id:
+            self.set_due_counts(counts)
+
+    def set_due_counts(self, counts):
+        """Mostra (novos, aprendendo, revisão) no rótulo de contagens"""
+        if counts is None:
+            self.counts_label.setText("")
+            return
+        new, learn, review = counts
+        self.counts_label.setText(tr("due_counts", new=new, learn=learn, review=review))
+
     def start_study(self):
         # Inicia o estudo do deck selecionado, dá foco ao Anki e fecha o popup
+        journal.record("study_now", deck=self.deck_select.currentData() or self.deck_select.currentText())
         try:
             from aqt import mw
             
@@ -241,7 +361,7 @@ class ReminderPopup(QDialog):
             else:
                 # Se não estiver na tela de revisão, muda para ela
                 deck_name = self.deck_select.currentData() or self.deck_select.currentText()
-                deck_id = mw.col.decks.id(deck_name)
+                deck_id = self.anki_utils.deck_id(deck_name) or mw.col.decks.id(deck_name)
                 mw.col.decks.select(deck_id)
                 mw.moveToState("review")
                 
@@ -258,6 +378,11 @@ class ReminderPopup(QDialog):
             self.logger.error(f'Erro ao iniciar o estudo: {str(e)}')
         self.close()
 
+    def dismiss(self):
+        """Botão 'Depois': registra a dispensa no diário e esconde o popup"""
+        journal.record("later", deck=self.deck_select.currentData() or self.deck_select.currentText())
+        self.hide_card()
+
     def hide_card(self):
         """Esconde o popup e dá foco ao Anki"""
         try:
@@ -270,6 +395,7 @@ class ReminderPopup(QDialog):
         except Exception as e:
             self.logger.error(f'Erro ao esconder popup: {str(e)}')
 
+    @instrument("show_popup")
     def show_popup(self):
         """Mostra o popup de lembrete"""
         self.logger.info('Mostrando popup de lembrete...')
@@ -277,17 +403,28 @@ class ReminderPopup(QDialog):
             # Toca um beep suave
             QApplication.beep()
             
+            from aqt import mw
             config = self.anki_utils.get_config()
-            deck_name = config.get('deck', '')
+            deck_name = config.deck
+            ranking = None
             try:
-                decks = self.anki_utils.get_decks()
-                deck_names = [deck.name for deck in decks]
-                if not deck_name or deck_name not in deck_names:
+                index = self.anki_utils.deck_index()
+                decks = index.entries
+                ranking = deck_ranking.get(mw.col)
+                if not deck_name or index.id_for_name(deck_name) is None:
                     if decks:
-                        deck_name = decks[0].name
-                        config['deck'] = deck_name
-                        self.anki_utils.set_config(config)
-                        self.logger.info(f'Deck configurado não encontrado. Usando o primeiro deck disponível: {deck_name}')
+                        # Sem deck configurado válido: o mais urgente, se já classificado, é só
+                        # pré-selecionado (a classificação muda a todo momento e não substitui
+                        # a escolha do usuário); senão, o primeiro deck passa a ser o configurado
+                        urgent_name = ranking and index.name_for_id(ranking[0].deck_id)
+                        if urgent_name:
+                            deck_name = urgent_name
+                            self.logger.info('Deck configurado não encontrado. Pré-selecionando o deck mais urgente: %s', deck_name)
+                        else:
+                            deck_name = decks[0].name
+                            config = config.replace(deck=deck_name)
+                            self.anki_utils.set_config(config)
+                            self.logger.info('Deck configurado não encontrado. Usando o primeiro deck disponível: %s', deck_name)
                     else:
                         self.logger.warning('Nenhum deck disponível. Não é possível mostrar o lembrete.')
                         tooltip(tr("no_deck"))
@@ -297,16 +434,18 @@ class ReminderPopup(QDialog):
                 if not deck_name:
                     tooltip(tr("no_deck_check"))
                     return
-            self.deck_select.blockSignals(True)
-            self.deck_select.clear()
-            for deck in decks:
-                level = deck.name.count("::")
-                display_name = "   " * level + deck.name.split("::")[-1] if level > 0 else deck.name
-                self.deck_select.addItem(display_name, deck.name)
-            idx = self.deck_select.findData(deck_name)
-            if idx != -1:
-                self.deck_select.setCurrentIndex(idx)
-            self.deck_select.blockSignals(False)
+            self.deck_model.sync()
+            self.select_deck(deck_name)
+            if config.suggest_urgent_deck:
+                # Com a classificação em cache a seleção é imediata; senão, chega em segundo plano
+                if ranking is not None:
+                    self.preselect_urgent_deck(ranking)
+                else:
+                    self._awaiting_ranking = True
+                    deck_ranking.request(mw, mw.col, self.on_deck_ranking)
+            self.deck_model.refresh_counts()
+            self.request_due_counts()
+            self.set_position_options(config)
             self.set_card_position()
             self.show()
         except Exception as e:
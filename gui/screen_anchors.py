@@ -0,0 +1,87 @@
+# Copyright 2025 Carlos Duarte
+from aqt.qt import QObject, QGuiApplication, QRect, QPoint, QScreen, pyqtSlot
+from dss_log_pipeline import get_logger
+
+
+class ScreenAnchors(QObject):
+    """
+    Posições do popup em cada tela, calculadas uma única vez.
+
+    Para cada tela guarda o canto superior esquerdo do popup em cada posição
+    (bottom_right, bottom_left, center), a partir da área disponível da tela.
+    O cache só é refeito quando uma tela é conectada ou removida, quando a tela
+    principal muda ou quando a área disponível de alguma tela muda; posicionar
+    o popup é uma consulta a um dicionário.
+    """
+
+    MARGIN = 20  # Distância (em pixels) das bordas da tela
+
+    def __init__(self, size, parent=None):
+        """
+        Args:
+            size: Tamanho (QSize) do popup
+            parent: QObject dono do cache (as conexões somem junto com ele)
+        """
+        super().__init__(parent)
+        self.logger = get_logger(__name__)
+        self.size = size
+        self._anchors = None  # QScreen -> {posição: QPoint}; None é a tela principal
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(self.invalidate)
+        app.primaryScreenChanged.connect(self.invalidate)
+        for screen in app.screens():
+            screen.availableGeometryChanged.connect(self.invalidate)
+
+    def anchor(self, location, screen=None):
+        """
+        Canto superior esquerdo do popup na posição informada.
+
+        Args:
+            location: "bottom_right", "bottom_left" ou "center"
+            screen: QScreen de destino (a principal se None ou desconhecida)
+
+        Returns:
+            QPoint, ou None se não houver nenhuma tela
+        """
+        anchors = self._anchors
+        if anchors is None:
+            anchors = self._anchors = self._compute()
+        points = anchors.get(screen) or anchors.get(None)
+        if points is None:
+            return None
+        return points[location]
+
+    # Slots declarados: as conexões a sinais da aplicação são desfeitas pelo Qt
+    # quando o cache é destruído, sem deixar proxies para trás
+    @pyqtSlot()
+    def invalidate(self):
+        """Descarta as posições calculadas; são refeitas na próxima consulta"""
+        self._anchors = None
+
+    @pyqtSlot(QScreen)
+    def on_screen_added(self, screen):
+        """Passa a observar a nova tela e descarta o cache"""
+        screen.availableGeometryChanged.connect(self.invalidate)
+        self.invalidate()
+
+    def _compute(self):
+        """Calcula as posições do popup em todas as telas"""
+        app = QGuiApplication.instance()
+        width, height = self.size.width(), self.size.height()
+        anchors = {}
+        for screen in app.screens():
+            area = screen.availableGeometry()
+            left = area.x() + self.MARGIN
+            right = area.x() + area.width() - width - self.MARGIN
+            bottom = area.y() + area.height() - height - self.MARGIN
+            centered = QRect(0, 0, width, height)
+            centered.moveCenter(area.center())
+            anchors[screen] = {
+                "bottom_right": QPoint(right, bottom),
+                "bottom_left": QPoint(left, bottom),
+                "center": centered.topLeft(),
+            }
+        anchors[None] = anchors.get(app.primaryScreen())
+        self.logger.debug("Posições do popup calculadas para %d tela(s)", len(anchors) - 1)
+        return anchors
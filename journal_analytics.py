@@ -0,0 +1,217 @@
+# Copyright 2025 Carlos Duarte
+import csv
+import gzip
+import json
+import os
+import time
+from dss_log_pipeline import get_logger
+
+logger = get_logger(__name__)
+
+# Limites (em segundos) do histograma de tempo entre o lembrete e o primeiro cartão respondido
+LATENCY_BUCKETS = (10, 30, 60, 120, 300, 600, 900, 1800, 3600)
+
+
+def journal_files(journal):
+    """Arquivos do diário em ordem cronológica: os rotacionados (.gz) e depois o atual"""
+    paths = list(journal.rotated_files())
+    if journal.path and os.path.exists(journal.path):
+        paths.append(journal.path)
+    return paths
+
+
+def iter_events(paths):
+    """Gera os eventos (dicts) de cada arquivo, linha a linha, sem carregar os arquivos na memória"""
+    # raw_decode evita o trabalho extra de json.loads (validação de espaços ao redor do objeto)
+    decode = json.JSONDecoder().raw_decode
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        try:
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield decode(line)[0]
+                    except ValueError:
+                        # Linha truncada (ex.: Anki fechado durante a gravação)
+                        continue
+        except OSError as e:
+            logger.error(f"Erro ao ler {os.path.basename(path)}: {str(e)}")
+
+
+class ReminderStats:
+    """Resultado da análise: conversão, latência, sequências de "Depois" e efetividade por hora"""
+
+    def __init__(self):
+        self.events = 0
+        self.reminders = 0
+        self.inactivity_alerts = 0
+        self.studied = 0
+        self.dismissed = 0
+        self.ignored = 0
+        self.latency_count = 0
+        self.latency_sum = 0.0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.longest_dismissal_streak = 0
+        self.current_dismissal_streak = 0
+        self.shown_by_hour = [0] * 24
+        self.studied_by_hour = [0] * 24
+
+    @property
+    def conversion_rate(self):
+        return self.studied / self.reminders if self.reminders else 0.0
+
+    @property
+    def mean_latency(self):
+        return self.latency_sum / self.latency_count if self.latency_count else None
+
+    def latency_quantile(self, q):
+        """Limite superior (s) do intervalo do histograma que contém o quantil q, ou None"""
+        if not self.latency_count:
+            return None
+        target = q * self.latency_count
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), self.latency_histogram):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+    def summary_rows(self):
+        """Linhas (chave de tradução, valor formatado) do resumo"""
+        def secs(value):
+            if value is None:
+                return "-"
+            return "> 3600" if value == float("inf") else f"{value:.0f}"
+        return [
+            ("analytics_reminders", str(self.reminders)),
+            ("analytics_studied", str(self.studied)),
+            ("analytics_dismissed", str(self.dismissed)),
+            ("analytics_ignored", str(self.ignored)),
+            ("analytics_conversion", f"{self.conversion_rate * 100:.1f}%"),
+            ("analytics_latency_mean", secs(self.mean_latency)),
+            ("analytics_latency_p50", secs(self.latency_quantile(0.5))),
+            ("analytics_latency_p90", secs(self.latency_quantile(0.9))),
+            ("analytics_longest_streak", str(self.longest_dismissal_streak)),
+            ("analytics_current_streak", str(self.current_dismissal_streak)),
+            ("analytics_inactivity_alerts", str(self.inactivity_alerts)),
+        ]
+
+    def hour_rows(self):
+        """Linhas (hora, mostrados, estudados, conversão) das horas com algum lembrete"""
+        return [
+            (hour, shown, studied, studied / shown)
+            for hour, (shown, studied) in enumerate(zip(self.shown_by_hour, self.studied_by_hour))
+            if shown
+        ]
+
+
+class ReminderAnalyzer:
+    """
+    Analisa o diário em uma única passada, com memória constante: cada lembrete fica
+    pendente até o próximo e só então é contabilizado.
+
+    Um lembrete agendado conta como convertido se for seguido de "Estudar Agora" ou de
+    um cartão respondido em até CONVERSION_WINDOW_SECS; como dispensado se for seguido
+    de "Depois"; e como ignorado caso contrário. Alertas de inatividade e lembretes de
+    teste (botão Testar Lembrete) ficam pendentes, para que os cliques no popup não
+    sejam atribuídos ao lembrete anterior, mas não entram nas estatísticas.
+    """
+
+    CONVERSION_WINDOW_SECS = 1800
+
+    def __init__(self):
+        self.stats = ReminderStats()
+        self._pending = None  # [instante, hora local, motivo, desfecho, latência]
+
+    def feed(self, events):
+        """Consome um iterável de eventos do diário"""
+        stats = self.stats
+        for event in events:
+            stats.events += 1
+            kind = event.get("e")
+            timestamp = event.get("t")
+            if timestamp is None:
+                continue
+            pending = self._pending
+            if kind == "reminder":
+                self._settle()
+                self._pending = [timestamp, time.localtime(timestamp).tm_hour, event.get("reason", "schedule"), None, None]
+            elif kind == "inactivity_alert":
+                stats.inactivity_alerts += 1
+            elif pending is None:
+                continue
+            elif kind == "study_now":
+                pending[3] = "study"
+            elif kind == "later":
+                if pending[3] is None:
+                    pending[3] = "later"
+            elif kind == "answer" and pending[4] is None:
+                latency = timestamp - pending[0]
+                if pending[3] == "study" or (pending[3] is None and latency <= self.CONVERSION_WINDOW_SECS):
+                    pending[3] = "study"
+                    pending[4] = latency
+        return self
+
+    def result(self):
+        """Contabiliza o último lembrete pendente e retorna as estatísticas"""
+        self._settle()
+        return self.stats
+
+    def _settle(self):
+        """Contabiliza o lembrete pendente"""
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        _, hour, reason, outcome, latency = pending
+        if reason != "schedule":
+            # Alertas de inatividade acontecem durante a revisão e os testes são do
+            # próprio usuário nas opções; nenhum dos dois entra na conversão
+            return
+        stats = self.stats
+        stats.reminders += 1
+        stats.shown_by_hour[hour] += 1
+        if outcome == "study":
+            stats.studied += 1
+            stats.studied_by_hour[hour] += 1
+            stats.current_dismissal_streak = 0
+            if latency is not None:
+                stats.latency_count += 1
+                stats.latency_sum += latency
+                bucket = 0
+                while bucket < len(LATENCY_BUCKETS) and latency > LATENCY_BUCKETS[bucket]:
+                    bucket += 1
+                stats.latency_histogram[bucket] += 1
+        elif outcome == "later":
+            stats.dismissed += 1
+            stats.current_dismissal_streak += 1
+            if stats.current_dismissal_streak > stats.longest_dismissal_streak:
+                stats.longest_dismissal_streak = stats.current_dismissal_streak
+        else:
+            stats.ignored += 1
+            stats.current_dismissal_streak = 0
+
+
+def analyze_journal(journal):
+    """Grava os eventos pendentes e analisa todos os arquivos do diário"""
+    journal.flush()
+    return ReminderAnalyzer().feed(iter_events(journal_files(journal))).result()
+
+
+def write_csv(stats, path, labels):
+    """
+    Exporta as estatísticas em CSV: o resumo (métrica, valor) e a tabela por hora.
+
+    Args:
+        stats: ReminderStats
+        path: Caminho do arquivo
+        labels: Função que traduz as chaves do resumo (ex.: tr)
+    """
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["metric", "value"])
+        for key, value in stats.summary_rows():
+            writer.writerow([labels(key), value])
+        writer.writerow([])
+        writer.writerow(["hour", "shown", "studied", "conversion"])
+        for hour, shown, studied, rate in stats.hour_rows():
+            writer.writerow([hour, shown, studied, f"{rate:.3f}"])
@@ -0,0 +1,68 @@
+# Copyright 2025 Carlos Duarte
+"""
+Benchmark do acesso à configuração: chamadas por segundo de get_config().
+
+Compara o caminho normal (configuração em cache, validada só pela assinatura
+dos arquivos: dois os.stat) com a leitura completa do disco a cada chamada
+(abrir, decodificar, migrar e validar), que era o custo de toda chamada antes
+do cache. Também mede set_config, cujas escritas são agrupadas pelo escritor.
+
+Uso:
+    python tests/bench_config.py [--calls 20000]
+"""
+import argparse
+import sys
+import time
+
+import harness
+
+
+def rate(func, calls):
+    """Chamadas por segundo e microssegundos por chamada"""
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    elapsed = time.perf_counter() - started
+    return calls / elapsed, elapsed / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    harness.start()
+    addon = harness.load_addon()
+    from fake_collection import FakeCollection
+    harness.open_profile(FakeCollection(), "Benchmark")
+    import anki_utils
+    utils = addon.anki_utils
+    utils.get_config()
+
+    def uncached():
+        anki_utils._config_cache["config"] = None
+        return utils.get_config()
+
+    config = utils.get_config()
+    toggled = [config.replace(frequency=10), config.replace(frequency=20)]
+
+    def write():
+        toggled.reverse()
+        utils.set_config(toggled[0])
+
+    print(f"{args.calls} chamadas")
+    for name, func in (("get_config (cache)", utils.get_config),
+                       ("get_config (disco)", uncached),
+                       ("set_config (agrupado)", write)):
+        per_sec, per_call = rate(func, args.calls)
+        print(f"  {name:24} {per_sec:12,.0f} chamadas/s  {per_call:7.2f} us/chamada")
+
+    utils.set_config(config)
+    harness.close_profile()
+    addon.unload_addon()
+    harness.process_events()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# Copyright 2025 Carlos Duarte
+"""
+Benchmark do diário de eventos: custo de record() e vazão da gravação
+(serialização, escrita, rotação e gzip) para um milhão de eventos.
+
+Mede record() com a thread de gravação ativa, esvaziando a fila em lotes, e
+com a fila apenas acumulando (diário ainda sem pasta); depois grava essa fila
+de uma vez na thread atual. Ao final confere que todas as linhas chegaram ao
+disco, somando o arquivo atual e os rotacionados. Tudo em uma pasta temporária.
+
+Uso:
+    python tests/bench_journal.py [--events 1000000]
+"""
+import argparse
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import harness
+
+
+def record_events(journal, events):
+    """Registra eventos parecidos com os de uma revisão; devolve os segundos gastos"""
+    record = journal.record
+    started = time.perf_counter()
+    for i in range(events):
+        record("review", deck="Default", ease=3, card=i)
+    return time.perf_counter() - started
+
+
+def count_lines(journal):
+    """Linhas gravadas no arquivo atual e nos rotacionados"""
+    total = 0
+    for rotated in journal.rotated_files():
+        with gzip.open(rotated, "rb") as f:
+            total += sum(1 for _ in f)
+    if os.path.exists(journal.path):
+        with open(journal.path, "rb") as f:
+            total += sum(1 for _ in f)
+    return total
+
+
+def new_journal(EventJournal):
+    journal = EventJournal()
+    journal.KEEP_ROTATED = 10 ** 6  # mantém todos os arquivos para conferir as linhas
+    return journal
+
+
+def report(name, events, elapsed):
+    print(f"  {name:34} {events / elapsed:12,.0f} eventos/s  {elapsed / events * 1e6:6.2f} us/evento")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=1000000)
+    args = parser.parse_args()
+
+    harness.start()
+    from dss_journal import EventJournal
+    root = tempfile.mkdtemp(prefix="dss-bench-journal-")
+    ok = True
+    try:
+        print(f"{args.events:,} eventos")
+
+        # Thread de gravação ativa: a fila é esvaziada em lotes enquanto se registra
+        journal = new_journal(EventJournal)
+        journal.open(os.path.join(root, "ativo"))
+        started = time.perf_counter()
+        elapsed = record_events(journal, args.events)
+        report("record() com a fila esvaziada", args.events, elapsed)
+        journal.close()
+        journal.flush()
+        report("até o último evento em disco", args.events, time.perf_counter() - started)
+        lines = count_lines(journal)
+        print(f"  {'linhas gravadas':34} {lines:12,}  arquivos rotacionados: {len(journal.rotated_files())}")
+        ok &= lines == args.events
+
+        # Sem pasta: a fila só acumula; depois é gravada de uma vez na thread atual
+        journal = new_journal(EventJournal)
+        rss_before = harness.rss_kb()
+        elapsed = record_events(journal, args.events)
+        queued_kb = harness.rss_kb() - rss_before
+        report("record() com a fila acumulando", args.events, elapsed)
+        print(f"  {'memória da fila (RSS)':34} {queued_kb:12,.0f} KB")
+        journal.directory = os.path.join(root, "fila")
+        os.makedirs(journal.directory)
+        started = time.perf_counter()
+        journal.flush()
+        report("gravação (json, escrita, gzip)", args.events, time.perf_counter() - started)
+        lines = count_lines(journal)
+        print(f"  {'linhas gravadas':34} {lines:12,}  arquivos rotacionados: {len(journal.rotated_files())}")
+        ok &= lines == args.events
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    if not ok:
+        print("ERRO: faltam linhas no diário")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# Copyright 2025 Carlos Duarte
+"""
+Benchmark do ciclo de vida do popup: tempo até visível e o que fica na
+memória enquanto ele está escondido, nos modos "prewarmed" e "low_memory".
+
+Abre um perfil com N decks e, para cada modo, mostra e esconde o popup
+várias vezes pelo mesmo caminho do lembrete (get_reminder_popup().show_popup()).
+O tempo até visível vai da chamada até a janela estar visível, com os eventos
+pendentes entregues; a retenção compara objetos Python e widgets com o popup
+escondido contra o estado sem popup.
+
+Uso:
+    python tests/bench_popup.py [--decks 1000] [--cycles 20]
+"""
+import argparse
+import gc
+import statistics
+import sys
+import time
+
+import harness
+
+
+def quiet_qt_messages():
+    """Descarta o aviso da plataforma offscreen a cada raise_() do popup"""
+    from aqt.qt import qInstallMessageHandler
+
+    def handler(mode, context, message):
+        if "does not support raise" not in message:
+            sys.stderr.write(message + "\n")
+
+    qInstallMessageHandler(handler)
+
+
+def widget_count():
+    from aqt.qt import QWidget
+    gc.collect()
+    return sum(1 for o in gc.get_objects() if isinstance(o, QWidget))
+
+
+def build_collection(decks):
+    from fake_collection import FakeCollection
+    col = FakeCollection()
+    for i in range(decks):
+        deck_id = col.decks.id(f"Assunto {i // 50:02d}::Deck {i:04d}")
+        col.add_cards(deck_id, 2)
+    return col
+
+
+def measure(addon, cycles):
+    """Mediana do tempo até visível (ms) e retenção com o popup escondido"""
+    addon.dispose_reminder_popup()
+    harness.process_events()
+    harness.resource_counts()
+    base_objects, base_widgets = harness.resource_counts()["objects"], widget_count()
+    if addon.anki_utils.get_config().popup_lifecycle == "prewarmed":
+        addon.get_reminder_popup().prewarm()
+        harness.process_events()
+    times = []
+    for _ in range(cycles):
+        started = time.perf_counter()
+        popup = addon.get_reminder_popup()
+        popup.show_popup()
+        harness.process_events()
+        times.append((time.perf_counter() - started) * 1000)
+        assert popup.isVisible()
+        popup.hide_card()
+        harness.process_events()
+    # A referência local manteria vivo o último popup do modo low_memory
+    del popup
+    addon.journal.flush()
+    return (statistics.median(times),
+            harness.resource_counts()["objects"] - base_objects,
+            widget_count() - base_widgets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--decks", type=int, default=1000)
+    parser.add_argument("--cycles", type=int, default=20)
+    args = parser.parse_args()
+
+    harness.start()
+    quiet_qt_messages()
+    addon = harness.load_addon()
+    harness.open_profile(build_collection(args.decks), "Benchmark")
+    harness.configure(addon, suggest_urgent_deck=False)
+
+    print(f"{args.decks} decks, mediana de {args.cycles} ciclos mostrar/esconder")
+    print(f"  {'modo':12} {'até visível':>12} {'objetos retidos':>16} {'widgets retidos':>16}")
+    for mode in ("prewarmed", "low_memory"):
+        harness.configure(addon, popup_lifecycle=mode)
+        visible_ms, objects, widgets = measure(addon, args.cycles)
+        print(f"  {mode:12} {visible_ms:9.2f} ms {objects:+16d} {widgets:+16d}")
+
+    harness.close_profile()
+    addon.unload_addon()
+    harness.process_events()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# Copyright 2025 Carlos Duarte
+"""
+Benchmark das sessões de revisão: custo dos hooks do revisor por cartão.
+
+Abre um perfil com uma coleção de teste (decks com velocidades de resposta
+diferentes), entra na revisão e passa N cartões por reviewer_did_show_question,
+reviewer_did_show_answer e reviewer_did_answer_card, com o monitor de
+inatividade ligado. Para cada hook, mostra os percentis da latência; para a
+sessão, as alocações medidas pelo tracemalloc (em uma segunda passada, já que
+o tracemalloc deixa tudo mais lento) e a variação de QObjects, QTimers e
+objetos Python (depois de gravar o diário).
+
+Uso:
+    python tests/bench_review.py [--cards 1000 10000 100000] [--log-level DEBUG]
+                                 [--console null|file|slow]
+
+--console troca a saída do log do addon: null (descarta), file (arquivo
+temporário, como o terminal do Anki redirecionado) ou slow (cada escrita
+bloqueia 1 ms, como um console lento).
+"""
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import harness
+
+HOOKS = ("reviewer_did_show_question", "reviewer_did_show_answer", "reviewer_did_answer_card")
+
+# Decks com tempos de resposta (ms) típicos diferentes: o limite de inatividade
+# muda a cada troca de deck
+DECKS = {
+    "Idiomas::Inglês": (2000, 5000),
+    "Idiomas::Alemão": (15000, 40000),
+    "Medicina": (60000, 90000),
+}
+CARDS_PER_DECK = 200
+
+
+class SlowStream:
+    """Console lento: cada escrita bloqueia a thread por 1 ms"""
+
+    def write(self, text):
+        time.sleep(0.001)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def build_collection():
+    from fake_collection import FakeCollection
+    col = FakeCollection()
+    rng = random.Random(1)
+    cards = []
+    for name, times in DECKS.items():
+        deck_id = col.decks.id(name)
+        conf_id = col.decks.add_config(name, max_taken=times[1] // 1000 + 10)
+        col.decks.set_config_id(deck_id, conf_id)
+        for card_id in col.add_cards(deck_id, CARDS_PER_DECK):
+            cards.append(col.card(card_id, rng.randint(*times)))
+    # Histórico de respostas para semear os tempos por deck
+    col.add_reviews([(card.id, card.taken_ms) for card in cards])
+    rng.shuffle(cards)
+    return col, cards
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_session(mw, cards, count, latencies=None):
+    """Passa count cartões pelos hooks do revisor (latências em ns por hook, se pedido)"""
+    from aqt import gui_hooks
+    hooks = [getattr(gui_hooks, name) for name in HOOKS]
+    show_question, show_answer, answer_card = hooks
+    clock = time.perf_counter_ns
+    reviewer = mw.reviewer
+    total = len(cards)
+    for i in range(count):
+        card = cards[i % total]
+        reviewer.card = card
+        if latencies is None:
+            show_question(card)
+            show_answer(card)
+            answer_card(reviewer, card, 3)
+            continue
+        start = clock()
+        show_question(card)
+        middle = clock()
+        show_answer(card)
+        end = clock()
+        answer_card(reviewer, card, 3)
+        done = clock()
+        latencies[0].append(middle - start)
+        latencies[1].append(end - middle)
+        latencies[2].append(done - end)
+
+
+def console_stream(kind):
+    if kind == "slow":
+        return SlowStream()
+    if kind == "file":
+        return tempfile.TemporaryFile("w")
+    return open(os.devnull, "w")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cards", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--console", choices=("null", "file", "slow"), default="null")
+    args = parser.parse_args()
+
+    app, mw = harness.start()
+    addon = harness.load_addon()
+    addon.log_pipeline.start(console_stream(args.console), getattr(logging, args.log_level))
+
+    col, cards = build_collection()
+    harness.open_profile(col)
+    harness.configure(addon, inactivity_after_max_answer=True)
+    mw.moveToState("review")
+    # Aquecimento: caches de limites, tempos por deck e índices
+    run_session(mw, cards, 2000)
+    addon.journal.flush()
+    harness.process_events()
+    # A primeira contagem cria objetos internos; as seguintes são comparáveis
+    harness.resource_counts()
+
+    print(f"console: {args.console}, nível do log: {args.log_level}")
+    for count in args.cards:
+        before = harness.resource_counts()
+        latencies = ([], [], [])
+        started = time.perf_counter()
+        run_session(mw, cards, count, latencies)
+        elapsed = time.perf_counter() - started
+        # Os eventos do diário ficam na fila até a próxima gravação
+        addon.journal.flush()
+        harness.process_events()
+        after = harness.resource_counts()
+
+        print(f"\n{count} cartões: {elapsed / count * 1e6:.1f} us por cartão (3 hooks)")
+        for name, values in zip(HOOKS, latencies):
+            values.sort()
+            p50, p95, p99 = (percentile(values, f) / 1000 for f in (0.5, 0.95, 0.99))
+            print(f"  {name:28} p50 {p50:7.1f} us  p95 {p95:7.1f} us  p99 {p99:7.1f} us  máx {values[-1] / 1000:8.1f} us")
+        print(f"  QObjects {after['qobjects'] - before['qobjects']:+d}, QTimers {after['timers'] - before['timers']:+d}, "
+              f"objetos Python {after['objects'] - before['objects']:+d}")
+
+    # Depois de todas as medições de tempo: o tracemalloc deixa as passadas seguintes mais lentas
+    print()
+    for count in args.cards:
+        tracemalloc.start()
+        snapshot = tracemalloc.take_snapshot()
+        run_session(mw, cards, count)
+        addon.journal.flush()
+        gc.collect()
+        retained = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, "filename"))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"tracemalloc, {count} cartões: {retained / 1024:+.1f} kB retidos, pico {peak / 1024:.1f} kB")
+
+    mw.moveToState("overview")
+    harness.close_profile()
+    addon.log_pipeline.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# Copyright 2025 Carlos Duarte
+"""
+Benchmark do TimerEngine: custo de reagendar e cancelar um prazo a cada
+cartão, comparado ao padrão anterior (dois QTimers novos por cartão), e a
+memória retida depois de muitos ciclos.
+
+Uso:
+    python tests/bench_timer_engine.py [--cycles 100000] [--background 100]
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+import harness
+
+
+def engine_cycles(engine, cycles):
+    """Reagenda o mesmo prazo a cada cartão; metade dos cartões cancela (fim da revisão)"""
+    handle = None
+    for i in range(cycles):
+        handle = engine.schedule(120, lambda: None, handle)
+        if i % 2:
+            engine.cancel(handle)
+
+
+def qtimer_cycles(cycles):
+    """Padrão anterior: dois QTimers e duas funções novas por cartão"""
+    from aqt.qt import QTimer
+    timers = [None, None]
+    for i in range(cycles):
+        for slot, delay_ms in enumerate((120000, 420000)):
+            if timers[slot] is not None:
+                timers[slot].stop()
+            timer = QTimer()
+            timer.setSingleShot(True)
+
+            def on_timeout():
+                pass
+
+            timer.timeout.connect(on_timeout)
+            timer.start(delay_ms)
+            timers[slot] = timer
+        if i % 2:
+            for timer in timers:
+                timer.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cycles", type=int, default=100000)
+    parser.add_argument("--background", type=int, default=100, help="prazos pendentes de fundo")
+    args = parser.parse_args()
+
+    harness.start()
+    from dss_timer_engine import TimerEngine
+    engine = TimerEngine()
+    for i in range(args.background):
+        engine.schedule(3600 + i, lambda: None)
+
+    engine_cycles(engine, 10000)
+    started = time.perf_counter()
+    engine_cycles(engine, args.cycles)
+    engine_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    qtimer_cycles(args.cycles)
+    qtimer_time = time.perf_counter() - started
+
+    # Memória em uma passada separada: o tracemalloc deixa as chamadas mais lentas
+    tracemalloc.start()
+    engine_cycles(engine, 10000)
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    engine_cycles(engine, args.cycles)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"{args.cycles} ciclos de reagendar/cancelar, {args.background} prazos de fundo")
+    print(f"  TimerEngine:        {engine_time / args.cycles * 1e6:6.2f} us por ciclo")
+    print(f"  2 QTimers/cartão:   {qtimer_time / args.cycles * 1e6:6.2f} us por ciclo")
+    print(f"  memória retida (tracemalloc): {retained:+d} bytes; heap com {len(engine._heap)} entradas, "
+          f"{len(engine)} pendentes")
+    engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
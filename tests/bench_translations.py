@@ -0,0 +1,79 @@
+# Copyright 2025 Carlos Duarte
+"""
+Benchmark das traduções: vazão de tr() e tempo de importação.
+
+Mede tr() com uma chave simples e com argumentos de formatação, e o tempo de
+importar translations e de carregar o catálogo do idioma ativo (no primeiro
+tr()), com os módulos removidos do sys.modules a cada repetição; sem .pyc
+(PYTHONDONTWRITEBYTECODE), o tempo inclui a compilação. O corpo do módulo
+(unmarshal do código compilado + exec, como no Anki depois da primeira
+execução) é medido à parte, sem a busca no sys.path.
+
+Uso:
+    python tests/bench_translations.py [--calls 1000000] [--imports 200]
+"""
+import argparse
+import importlib
+import marshal
+import statistics
+import sys
+import time
+
+import harness
+
+
+def forget_modules():
+    for name in list(sys.modules):
+        if name == "translations" or name.split(".")[0] == "dss_locales":
+            del sys.modules[name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=1000000)
+    parser.add_argument("--imports", type=int, default=200)
+    args = parser.parse_args()
+
+    harness.start()
+    import translations
+    tr = translations.tr
+    tr("test_reminder")
+
+    print(f"{args.calls} chamadas de tr()")
+    for label, call in (("tr(chave)", lambda: tr("test_reminder")),
+                        ("tr(chave, **kwargs)", lambda: tr("due_counts", new=1, learn=2, review=3))):
+        started = time.perf_counter()
+        for _ in range(args.calls):
+            call()
+        elapsed = time.perf_counter() - started
+        print(f"  {label:22} {args.calls / elapsed:12,.0f} chamadas/s  {elapsed / args.calls * 1e9:6.0f} ns/chamada")
+
+    import_times, catalog_times = [], []
+    for _ in range(args.imports):
+        forget_modules()
+        started = time.perf_counter()
+        module = importlib.import_module("translations")
+        loaded = time.perf_counter()
+        module.tr("test_reminder")
+        done = time.perf_counter()
+        import_times.append(loaded - started)
+        catalog_times.append(done - loaded)
+    with open(module.__file__, encoding="utf-8") as f:
+        pyc = marshal.dumps(compile(f.read(), module.__file__, "exec"))
+    body_times = []
+    for _ in range(args.imports):
+        started = time.perf_counter()
+        code = marshal.loads(pyc)
+        exec(code, {"__name__": "translations", "__file__": module.__file__})
+        body_times.append(time.perf_counter() - started)
+    print(f"importação (mediana de {args.imports}, .pyc {'desativado' if sys.dont_write_bytecode else 'ativado'}):")
+    print(f"  import translations      {statistics.median(import_times) * 1e6:7.1f} us")
+    print(f"  catálogo no primeiro tr() {statistics.median(catalog_times) * 1e6:7.1f} us "
+          f"(idioma {module.get_language()})")
+    print(f"  corpo do módulo           {statistics.median(body_times) * 1e6:7.1f} us "
+          f"(código compilado com {len(pyc) / 1024:.1f} kB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
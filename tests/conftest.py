@@ -0,0 +1,64 @@
+# Copyright 2025 Carlos Duarte
+import pytest
+
+import harness
+
+# Antes da coleta: os módulos de teste importam os módulos do addon pelo nome
+harness.start()
+
+
+def pytest_configure(config):
+    # Com a raiz no diretório do addon (que tem __init__.py), o pytest importaria o
+    # addon original, que grava user_files e settings_user.json ao lado do código
+    if str(config.rootpath) == harness.ADDON_SOURCE:
+        raise pytest.UsageError("Rode os testes a partir de tests/: python -m pytest tests")
+
+
+@pytest.fixture(scope="session")
+def addon():
+    """O pacote do addon, importado uma única vez e descarregado ao final"""
+    module = harness.load_addon()
+    yield module
+    module.unload_addon()
+    harness.process_events()
+
+
+@pytest.fixture
+def collection():
+    from fake_collection import FakeCollection
+    col = FakeCollection()
+    deck_id = col.decks.id("Idiomas::Inglês")
+    col.add_cards(deck_id, 20)
+    return col
+
+
+@pytest.fixture
+def profile(addon, collection, request):
+    """Perfil aberto com a coleção de teste (um perfil por teste, com a sua
+    configuração); fechado ao final do teste"""
+    harness.open_profile(collection, request.node.name)
+    yield collection
+    harness.close_profile()
+
+
+class FakeClock:
+    """Relógio controlado pelo teste, no lugar de dss_clock.now"""
+
+    def __init__(self, start=100000.0):
+        self.time = start
+
+    def __call__(self):
+        return self.time
+
+    def advance(self, secs):
+        self.time += secs
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Substitui o relógio do TimerEngine; os prazos vencidos são executados com
+    engine._on_timeout() depois de avançar o relógio"""
+    import dss_timer_engine
+    clock = FakeClock()
+    monkeypatch.setattr(dss_timer_engine, "now", clock)
+    return clock
@@ -0,0 +1,124 @@
+# Copyright 2025 Carlos Duarte
+"""
+Ambiente dos testes e benchmarks: Qt offscreen, o substituto do aqt
+(tests/standin) e uma cópia do addon importada como pacote, como o Anki faz.
+
+O addon é copiado para um diretório temporário porque grava no próprio
+diretório (user_files, settings_user.json, metrics.prom): rodar os testes a
+partir de uma instalação não pode ler nem alterar a configuração do usuário.
+"""
+import atexit
+import gc
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_SOURCE = os.path.dirname(TESTS_DIR)
+STANDIN_DIR = os.path.join(TESTS_DIR, "standin")
+PACKAGE = "dont_stop_studying"
+PROFILE = "User 1"
+
+IGNORED = shutil.ignore_patterns(
+    "tests", ".*", "__pycache__", "*.pyc", "user_files", "settings_user.json", "metrics.prom",
+    "requests.jsonl", "*.patch",
+)
+
+_root = None
+
+
+def addon_dir():
+    """Copia o addon (uma vez por processo) e coloca o diretório da cópia no sys.path"""
+    global _root
+    if _root is None:
+        _root = tempfile.mkdtemp(prefix="dss-tests-")
+        atexit.register(shutil.rmtree, _root, True)
+        shutil.copytree(ADDON_SOURCE, os.path.join(_root, PACKAGE), ignore=IGNORED)
+        sys.path.insert(0, _root)
+    path = os.path.join(_root, PACKAGE)
+    # O addon faz o mesmo ao ser importado; aqui os módulos ficam disponíveis antes
+    # disso. O diretório original sai do sys.path (python -m coloca nele o diretório
+    # atual) para que os módulos venham sempre da cópia
+    sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != ADDON_SOURCE]
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return path
+
+
+def start():
+    """
+    Prepara o Qt offscreen, o aqt substituto e a cópia do addon.
+
+    Returns:
+        (QApplication, janela principal)
+    """
+    if STANDIN_DIR not in sys.path:
+        sys.path.insert(0, STANDIN_DIR)
+    import aqt
+    app, mw = aqt.create_main_window()
+    addon_dir()
+    return app, mw
+
+
+def load_addon():
+    """Importa o addon (uma vez por processo), como o Anki faz na inicialização"""
+    start()
+    return importlib.import_module(PACKAGE)
+
+
+def process_events():
+    """Entrega os eventos pendentes, inclusive as destruições adiadas (deleteLater)"""
+    from aqt.qt import QApplication, QEvent
+    app = QApplication.instance()
+    app.processEvents()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    app.processEvents()
+
+
+def open_profile(collection, name=PROFILE):
+    """Abre o perfil e executa a etapa adiada da inicialização do addon"""
+    import aqt
+    aqt.mw.loadProfile(name, collection)
+    process_events()
+
+
+def configure(addon, **options):
+    """Altera opções do perfil aberto e as aplica ao agendador, como o diálogo de opções"""
+    utils = addon.anki_utils
+    utils.set_config(utils.get_config().replace(**options))
+    addon.dont_stop_scheduler.update_state(utils.get_config())
+
+
+def close_profile():
+    import aqt
+    aqt.mw.unloadProfile()
+    process_events()
+
+
+def resource_counts():
+    """
+    Contagens usadas na verificação de vazamentos: callbacks nos hooks,
+    objetos Python, QObjects e QTimers vivos (wrappers Python) e RSS em kB.
+    """
+    import aqt
+    from aqt.qt import QObject, QTimer
+    gc.collect()
+    objects = gc.get_objects()
+    return {
+        "hooks": aqt.gui_hooks.callback_count(),
+        "objects": len(objects),
+        "qobjects": sum(1 for o in objects if isinstance(o, QObject)),
+        "timers": sum(1 for o in objects if isinstance(o, QTimer)),
+        "rss_kb": rss_kb(),
+    }
+
+
+def rss_kb():
+    """Memória residente do processo em kB (0 onde /proc não existe)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return 0
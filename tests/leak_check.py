@@ -0,0 +1,103 @@
+# Copyright 2025 Carlos Duarte
+"""
+Verificação de vazamentos ao trocar de perfil e ao descarregar o addon.
+
+Cada ciclo abre um perfil (alternando entre três), constrói o popup, faz três
+rodadas de pergunta/resposta na revisão, com o monitor de inatividade ligado,
+e fecha o perfil. Depois de um
+aquecimento, compara com a linha de base, a cada quarto dos ciclos: callbacks
+nos hooks, objetos Python, QObjects, QTimers e RSS. No fim, remove o addon
+pelo hook do diálogo de addons (o Anki não tem hook de desativação: remover
+ou atualizar o addon é o que dispara a liberação) e confere o que sobrou.
+
+Uso:
+    python tests/leak_check.py [--cycles 1000] [--json]
+"""
+import argparse
+import json
+import sys
+
+import harness
+
+WARMUP_CYCLES = 20
+PROFILES = ("Perfil A", "Perfil B", "Perfil C")
+
+
+def cycle(addon, mw, collection, index):
+    from aqt import gui_hooks
+    harness.open_profile(collection, PROFILES[index % len(PROFILES)])
+    if not addon.anki_utils.get_config().inactivity_after_max_answer:
+        harness.configure(addon, inactivity_after_max_answer=True)
+    addon.get_reminder_popup()
+    mw.moveToState("review")
+    for card in collection.review_cards:
+        mw.reviewer.card = card
+        gui_hooks.reviewer_did_show_question(card)
+        gui_hooks.reviewer_did_show_answer(card)
+        gui_hooks.reviewer_did_answer_card(mw.reviewer, card, 3)
+    mw.moveToState("overview")
+    harness.close_profile()
+
+
+def run(cycles):
+    """Executa os ciclos e o descarregamento; retorna as amostras e o estado final"""
+    app, mw = harness.start()
+    addon = harness.load_addon()
+    from fake_collection import FakeCollection
+    collection = FakeCollection()
+    deck_id = collection.decks.id("Idiomas::Inglês")
+    collection.review_cards = [collection.card(card_id, 4000) for card_id in collection.add_cards(deck_id, 3)]
+
+    for i in range(WARMUP_CYCLES):
+        cycle(addon, mw, collection, i)
+    # A primeira contagem cria objetos internos; as seguintes são comparáveis
+    harness.resource_counts()
+    baseline = harness.resource_counts()
+    samples = []
+    step = max(1, cycles // 4)
+    for i in range(1, cycles + 1):
+        cycle(addon, mw, collection, i)
+        if i % step == 0 or i == cycles:
+            counts = harness.resource_counts()
+            samples.append({"cycles": i, **{key: counts[key] - baseline[key] for key in counts}})
+
+    from aqt import gui_hooks
+    gui_hooks.addons_dialog_will_delete_addons(None, [harness.PACKAGE])
+    harness.process_events()
+    after = harness.resource_counts()
+    thread = addon.journal._thread
+    unloaded = {
+        "registry": addon.lifecycle.names(),
+        "hooks": after["hooks"],
+        "menu_actions": len(mw.form.menuTools.actions()),
+        "journal_thread_alive": thread is not None and thread.is_alive(),
+        "qobjects": after["qobjects"] - baseline["qobjects"],
+        "timers": after["timers"] - baseline["timers"],
+    }
+    return {"baseline": baseline, "samples": samples, "unloaded": unloaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cycles", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="resultado em JSON (usado pelos testes)")
+    args = parser.parse_args()
+    result = run(args.cycles)
+    if args.json:
+        print(json.dumps(result))
+        return 0
+    base = result["baseline"]
+    print(f"linha de base: {base['hooks']} callbacks, {base['objects']} objetos, "
+          f"{base['qobjects']} QObjects, {base['timers']} QTimers, RSS {base['rss_kb']} kB")
+    for sample in result["samples"]:
+        print(f"após {sample['cycles']:5d} ciclos: hooks {sample['hooks']:+d}, objetos {sample['objects']:+d}, "
+              f"QObjects {sample['qobjects']:+d}, QTimers {sample['timers']:+d}, RSS {sample['rss_kb']:+d} kB")
+    unloaded = result["unloaded"]
+    print(f"após remover o addon: registro {unloaded['registry']}, {unloaded['hooks']} callbacks, "
+          f"{unloaded['menu_actions']} ações no menu, thread do diário viva: {unloaded['journal_thread_alive']}, "
+          f"QObjects {unloaded['qobjects']:+d}, QTimers {unloaded['timers']:+d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
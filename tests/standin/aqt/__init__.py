@@ -0,0 +1,187 @@
+# Copyright 2025 Carlos Duarte
+"""
+Substituto do pacote aqt do Anki para os testes e benchmarks do addon.
+
+Só entra no sys.path pelo ambiente dos testes (tests/harness.py); o Anki nunca
+o importa, porque o addon coloca no sys.path apenas o próprio diretório.
+Reproduz o que o addon usa do aqt: gui_hooks, a janela principal (mw) com
+perfil, coleção, revisor, menu Ferramentas e gerenciador de addons, e aqt.qt
+sobre o PyQt6 com a plataforma offscreen.
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from aqt.qt import QApplication, QMainWindow, QMenu, QWidget  # noqa: E402
+
+
+def _is_card(value):
+    return hasattr(value, "id") and hasattr(value, "did") and hasattr(value, "time_taken")
+
+
+def _is_reviewer(value):
+    return isinstance(value, Reviewer)
+
+
+def _is_ease(value):
+    return isinstance(value, int) and 1 <= value <= 4
+
+
+def _is_str(value):
+    return isinstance(value, str)
+
+
+def _is_str_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _any(value):
+    return True
+
+
+class _Hook:
+    """
+    Lista de callbacks de um hook, com a mesma interface dos hooks do Anki.
+    Aceita só os argumentos posicionais do hook correspondente do aqt, na mesma
+    ordem, e confere o tipo de cada um: um teste que chame o hook com outra
+    assinatura falha em vez de esconder um erro que o Anki mostraria.
+    """
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = params  # ((nome, verificação), ...)
+        self._hooks = []
+
+    def append(self, callback):
+        self._hooks.append(callback)
+
+    def remove(self, callback):
+        if callback in self._hooks:
+            self._hooks.remove(callback)
+
+    def count(self):
+        return len(self._hooks)
+
+    def __call__(self, *args):
+        if len(args) != len(self.params):
+            names = ", ".join(name for name, _ in self.params)
+            raise TypeError(f"{self.name}({names}) recebeu {len(args)} argumentos")
+        for (name, check), value in zip(self.params, args):
+            if not check(value):
+                raise TypeError(f"{self.name}: argumento {name} inválido: {value!r}")
+        for callback in list(self._hooks):
+            callback(*args)
+
+
+class _GuiHooks:
+    """Os hooks de aqt.gui_hooks usados pelo addon, com as assinaturas do aqt"""
+
+    SIGNATURES = {
+        "profile_did_open": (),
+        "profile_will_close": (),
+        "state_will_change": (("new_state", _is_str), ("old_state", _is_str)),
+        "reviewer_did_show_question": (("card", _is_card),),
+        "reviewer_did_show_answer": (("card", _is_card),),
+        "reviewer_did_answer_card": (("reviewer", _is_reviewer), ("card", _is_card), ("ease", _is_ease)),
+        "operation_did_execute": (("changes", _any), ("handler", _any)),
+        "deck_conf_will_save_config": (("deck_conf", _any), ("deck", _any), ("config", _any)),
+        "addons_dialog_will_delete_addons": (("dialog", _any), ("ids", _is_str_list)),
+        "addon_manager_will_install_addon": (("manager", _any), ("module", _is_str)),
+    }
+    NAMES = tuple(SIGNATURES)
+
+    def __init__(self):
+        for name, params in self.SIGNATURES.items():
+            setattr(self, name, _Hook(name, params))
+
+    def callback_count(self):
+        """Total de callbacks conectados a todos os hooks"""
+        return sum(getattr(self, name).count() for name in self.NAMES)
+
+
+gui_hooks = _GuiHooks()
+
+
+class ProfileManager:
+    def __init__(self):
+        self.name = None
+        self.meta = {"defaultLang": "pt_BR"}
+
+
+class Reviewer:
+    def __init__(self, parent):
+        self.web = QWidget(parent)
+        self.card = None
+        self.state = None
+
+
+class AddonManager:
+    def __init__(self):
+        self.config_actions = {}
+        self.config_updated_actions = {}
+
+    def setConfigAction(self, module, action):
+        self.config_actions[module] = action
+
+    def setConfigUpdatedAction(self, module, action):
+        self.config_updated_actions[module] = action
+
+
+class _Form:
+    def __init__(self, parent):
+        self.menuTools = QMenu(parent)
+
+
+class MainWindow(QMainWindow):
+    """
+    Janela principal do Anki: estado, perfil, coleção e revisor.
+    loadProfile/unloadProfile e moveToState disparam os mesmos hooks, na mesma
+    ordem, que o Anki.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pm = ProfileManager()
+        self.col = None
+        self.state = "startup"
+        self.reviewer = Reviewer(self)
+        self.form = _Form(self)
+        self.addonManager = AddonManager()
+
+    def loadProfile(self, name, collection):
+        """Abre o perfil com a coleção informada e dispara profile_did_open"""
+        self.pm.name = name
+        self.col = collection
+        self.moveToState("deckBrowser")
+        gui_hooks.profile_did_open()
+
+    def unloadProfile(self):
+        """Dispara profile_will_close e fecha a coleção"""
+        if self.state == "review":
+            self.moveToState("overview")
+        gui_hooks.profile_will_close()
+        self.col = None
+        self.pm.name = None
+        self.state = "profileManager"
+
+    def moveToState(self, state):
+        old_state, self.state = self.state, state
+        gui_hooks.state_will_change(state, old_state)
+        if state != "review":
+            self.reviewer.card = None
+
+    def onOverview(self):
+        self.moveToState("overview")
+
+
+mw = None
+
+
+def create_main_window():
+    """Cria a QApplication (se ainda não existir) e a janela principal em aqt.mw"""
+    global mw
+    app = QApplication.instance() or QApplication(["anki"])
+    if mw is None:
+        mw = MainWindow()
+        mw.app = app
+    return app, mw
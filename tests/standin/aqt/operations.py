@@ -0,0 +1,47 @@
+# Copyright 2025 Carlos Duarte
+"""aqt.operations: QueryOp executa a operação em outra thread, como no Anki"""
+import threading
+import aqt
+from aqt.qt import QTimer
+
+
+class QueryOp:
+    """
+    A operação roda em uma thread e é aguardada; success (ou failure) é
+    entregue na thread principal, no próximo ciclo do loop de eventos.
+    runs conta as operações iniciadas.
+    """
+
+    runs = 0
+
+    def __init__(self, *, parent, op, success):
+        self._op = op
+        self._success = success
+        self._failure = None
+
+    def failure(self, failure):
+        self._failure = failure
+        return self
+
+    def without_collection(self):
+        return self
+
+    def run_in_background(self):
+        QueryOp.runs += 1
+        outcome = {}
+
+        def run():
+            try:
+                outcome["result"] = self._op(aqt.mw.col)
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        if "error" in outcome:
+            if self._failure is None:
+                raise outcome["error"]
+            QTimer.singleShot(0, lambda: self._failure(outcome["error"]))
+        else:
+            QTimer.singleShot(0, lambda: self._success(outcome["result"]))
@@ -0,0 +1,5 @@
+# Copyright 2025 Carlos Duarte
+"""aqt.qt: reexporta o PyQt6, como no Anki"""
+from PyQt6.QtCore import *  # noqa: F401,F403
+from PyQt6.QtGui import *  # noqa: F401,F403
+from PyQt6.QtWidgets import *  # noqa: F401,F403
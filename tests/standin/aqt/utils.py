@@ -0,0 +1,12 @@
+# Copyright 2025 Carlos Duarte
+"""aqt.utils: as mensagens mostradas ficam em messages, para os testes"""
+
+messages = []
+
+
+def showInfo(text, *args, **kwargs):
+    messages.append(("info", text))
+
+
+def tooltip(text, *args, **kwargs):
+    messages.append(("tooltip", text))
@@ -0,0 +1,221 @@
+# Copyright 2025 Carlos Duarte
+"""
+Coleção do Anki para os testes e benchmarks: decks, grupos de opções,
+configuração (col.conf), agendador e um banco SQLite em memória com as
+tabelas cards e revlog, com as colunas consultadas pelo addon.
+"""
+import itertools
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+create table cards (id integer primary key, did integer, odid integer default 0,
+                    queue integer, due integer, ivl integer default 0);
+create table revlog (id integer primary key, cid integer, ease integer, time integer);
+"""
+
+# Filas dos cartões, como no Anki
+QUEUE_NEW = 0
+QUEUE_LEARN = 1
+QUEUE_REVIEW = 2
+QUEUE_DAY_LEARN = 3
+
+
+class FakeDB:
+    """col.db: consultas SQL sobre o banco em memória (usado também pelas threads do QueryOp)"""
+
+    def __init__(self):
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def all(self, sql, *args):
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def scalar(self, sql, *args):
+        rows = self.all(sql, *args)
+        return rows[0][0] if rows else None
+
+    def executemany(self, sql, rows):
+        with self._lock:
+            self._conn.executemany(sql, rows)
+
+
+class NameId:
+    """Item de decks.all_names_and_ids()"""
+
+    def __init__(self, deck_id, name):
+        self.id = deck_id
+        self.name = name
+
+
+class FakeDeckManager:
+    """col.decks"""
+
+    DEFAULT_CONF_ID = 1
+
+    def __init__(self, col):
+        self.col = col
+        self._decks = {}
+        self._configs = {self.DEFAULT_CONF_ID: {"id": self.DEFAULT_CONF_ID, "name": "Default", "maxTaken": 60}}
+        self._ids = itertools.count(1)
+        self.selected = None
+        self.id("Default")
+
+    def id(self, name, create=True):
+        """Id do deck pelo nome; cria o deck (e os ancestrais) se não existir"""
+        deck = self.by_name(name)
+        if deck is not None:
+            return deck["id"]
+        if not create:
+            return None
+        if "::" in name:
+            self.id(name.rsplit("::", 1)[0])
+        deck_id = next(self._ids)
+        self._decks[deck_id] = {"id": deck_id, "name": name, "conf": self.DEFAULT_CONF_ID}
+        self.col.touch()
+        return deck_id
+
+    def by_name(self, name):
+        for deck in self._decks.values():
+            if deck["name"] == name:
+                return deck
+        return None
+
+    def get(self, deck_id, default=True):
+        deck = self._decks.get(int(deck_id))
+        if deck is None and default:
+            return self._decks[min(self._decks)]
+        return deck
+
+    def all_names_and_ids(self):
+        """Decks em ordem hierárquica (pais antes dos filhos)"""
+        decks = sorted(self._decks.values(), key=lambda d: d["name"].split("::"))
+        return [NameId(d["id"], d["name"]) for d in decks]
+
+    def children_ids(self, deck_id):
+        """O deck e todos os seus subdecks"""
+        name = self._decks[deck_id]["name"]
+        return [d["id"] for d in self._decks.values() if d["id"] == deck_id or d["name"].startswith(name + "::")]
+
+    def select(self, deck_id):
+        self.selected = deck_id
+
+    def add_config(self, name, max_taken=60):
+        """Cria um grupo de opções e retorna o id"""
+        conf_id = max(self._configs) + 1
+        self._configs[conf_id] = {"id": conf_id, "name": name, "maxTaken": max_taken}
+        return conf_id
+
+    def set_config_id(self, deck_id, conf_id):
+        self._decks[deck_id]["conf"] = conf_id
+        self.col.touch()
+
+    def get_config(self, conf_id):
+        return self._configs.get(int(conf_id))
+
+
+class DueNode:
+    """Nó de sched.deck_due_tree(): contagens do deck com os subdecks"""
+
+    def __init__(self, deck_id, new_count, learn_count, review_count):
+        self.deck_id = deck_id
+        self.new_count = new_count
+        self.learn_count = learn_count
+        self.review_count = review_count
+
+
+class FakeScheduler:
+    """col.sched"""
+
+    def __init__(self, col):
+        self.col = col
+        self.today = 1000
+
+    def deck_due_tree(self, deck_id):
+        if self.col.decks.get(deck_id, default=False) is None:
+            return None
+        ids = self.col.decks.children_ids(deck_id)
+        marks = ",".join("?" * len(ids))
+        learn_cutoff = int(time.time()) + self.col.get_config("collapseTime", 1200)
+        new, learn, review = self.col.db.all(
+            f"""select coalesce(sum(queue = 0), 0),
+                       coalesce(sum((queue = 1 and due <= ?) or (queue = 3 and due <= ?)), 0),
+                       coalesce(sum(queue = 2 and due <= ?), 0)
+                from cards where did in ({marks})""",
+            learn_cutoff, self.today, self.today, *ids,
+        )[0]
+        return DueNode(deck_id, new, learn, review)
+
+    def answerButtons(self, card):
+        return 4
+
+
+class FakeCard:
+    """
+    Cartão em revisão: id, deck, deck de origem e tempo de resposta. Como no
+    Anki, time_taken() já vem limitado ao tempo máximo das opções do deck, e
+    timer_started (instante em que a pergunta foi mostrada) fica None até o
+    revisor iniciar o cronômetro.
+    """
+
+    def __init__(self, card_id, did, odid=0, taken_ms=5000):
+        self.id = card_id
+        self.did = did
+        self.odid = odid
+        self.taken_ms = taken_ms
+        self.timer_started = None
+
+    def time_taken(self):
+        return self.taken_ms
+
+
+class FakeCollection:
+    """mw.col"""
+
+    def __init__(self):
+        self.mod = 0
+        self.conf = {"collapseTime": 1200}
+        self.db = FakeDB()
+        self.decks = FakeDeckManager(self)
+        self.sched = FakeScheduler(self)
+        self._card_ids = itertools.count(1)
+        self._revlog_ids = itertools.count(int(time.time() * 1000) - 10**6)
+
+    def touch(self):
+        """Marca a coleção como modificada (col.mod), como toda escrita no Anki"""
+        self.mod += 1
+
+    def get_config(self, key, default=None):
+        return self.conf.get(key, default)
+
+    def set_config(self, key, value):
+        self.conf[key] = value
+        self.touch()
+
+    def add_cards(self, deck_id, count, queue=QUEUE_REVIEW, due=None):
+        """Adiciona cartões ao deck; por padrão, revisões que vencem hoje"""
+        if due is None:
+            due = int(time.time()) if queue == QUEUE_LEARN else self.sched.today
+        ids = [next(self._card_ids) for _ in range(count)]
+        self.db.executemany(
+            "insert into cards (id, did, queue, due) values (?, ?, ?, ?)",
+            [(card_id, deck_id, queue, due) for card_id in ids],
+        )
+        self.touch()
+        return ids
+
+    def add_reviews(self, card_times):
+        """Registra no revlog uma resposta por (id do cartão, tempo em ms)"""
+        self.db.executemany(
+            "insert into revlog (id, cid, ease, time) values (?, ?, 3, ?)",
+            [(next(self._revlog_ids), card_id, taken_ms) for card_id, taken_ms in card_times],
+        )
+        self.touch()
+
+    def card(self, card_id, taken_ms=5000):
+        """Cartão da coleção pronto para os hooks do revisor"""
+        did, odid = self.db.all("select did, odid from cards where id = ?", card_id)[0]
+        return FakeCard(card_id, did, odid, taken_ms)
@@ -0,0 +1,58 @@
+# Copyright 2025 Carlos Duarte
+import json
+import os
+
+import anki_utils
+import harness
+from dss_config_writer import writer
+
+
+def test_set_config_with_dict_keeps_other_options(addon, profile):
+    utils = addon.anki_utils
+    utils.set_config(utils.get_config().replace(frequency=25, deck="Idiomas::Inglês"))
+    assert utils.set_config({"enabled": False})
+    config = utils.get_config()
+    assert (config.enabled, config.frequency, config.deck) == (False, 25, "Idiomas::Inglês")
+    writer.flush()
+    with open(anki_utils.USER_SETTINGS_PATH, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert (saved["enabled"], saved["frequency"]) == (False, 25)
+
+
+def test_profile_open_does_not_rewrite_current_settings(addon, collection):
+    # Arquivo na versão atual, diferente de settings.json e sem algumas opções
+    path = os.path.join(anki_utils.USER_FILES_DIR, "settings_user-Sem_conflito.json")
+    os.makedirs(anki_utils.USER_FILES_DIR, exist_ok=True)
+    content = json.dumps({"frequency": 25, "schema_version": 4})
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    harness.open_profile(collection, "Sem conflito")
+    try:
+        writer.flush()
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == content
+        config = addon.anki_utils.get_config()
+        assert config.frequency == 25
+        assert config.enabled is True
+    finally:
+        harness.close_profile()
+
+
+def test_fractional_minutes_are_kept():
+    from addon_config import AddonConfig
+    config = AddonConfig.from_dict({"frequency": 1.5, "inactivity_extra_minutes": 0.5})
+    assert (config.frequency, config.inactivity_extra_minutes) == (1.5, 0.5)
+    for invalid in (0, -1, True, float("nan"), float("inf"), "10"):
+        assert AddonConfig(frequency=invalid).frequency == 1
+
+
+def test_atomic_write_keeps_file_permissions(tmp_path):
+    import stat
+    from dss_config_writer import atomic_write
+    path = tmp_path / "settings_user.json"
+    path.write_text("{}")
+    path.chmod(0o644)
+    atomic_write(str(path), b'{"frequency": 10}')
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+    assert path.read_bytes() == b'{"frequency": 10}'
+    assert [p.name for p in tmp_path.iterdir()] == ["settings_user.json"]
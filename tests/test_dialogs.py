@@ -0,0 +1,56 @@
+# Copyright 2025 Carlos Duarte
+from aqt import mw
+from aqt.qt import QApplication, QTimer
+
+import harness
+
+
+def test_options_dialog_is_destroyed_after_closing(addon, profile):
+    from gui.options import ReminderOptions
+    opened = []
+
+    def close_dialog():
+        dialog = QApplication.activeModalWidget()
+        opened.append(type(dialog))
+        dialog.reject()
+
+    QTimer.singleShot(0, close_dialog)
+    addon.show_options()
+    harness.process_events()
+    assert opened == [ReminderOptions]
+    assert mw.findChildren(ReminderOptions) == []
+
+
+def test_shared_deck_model_is_released_with_the_profile(addon, collection):
+    from gui import deck_model
+    harness.open_profile(collection, "Modelo de decks")
+    model = addon.get_reminder_popup().deck_model
+    assert deck_model.shared_deck_model() is model
+    harness.close_profile()
+    assert deck_model._shared_model is None
+    assert "deck_model" not in addon.lifecycle.names()
+
+
+def test_deck_model_rebuild_keeps_each_combo_selection(addon, profile):
+    from aqt.qt import QComboBox
+    from gui.deck_model import attach_deck_model
+    profile.decks.id("Medicina")
+    addon.anki_utils.deck_index(refresh=True)
+    popup_combo, options_combo = QComboBox(), QComboBox()
+    model = attach_deck_model(popup_combo)
+    attach_deck_model(options_combo)
+    model.sync()
+    popup_combo.setCurrentIndex(model.row_for_name("Medicina"))
+    options_combo.setCurrentIndex(model.row_for_name("Idiomas::Inglês"))
+    changes = []
+    options_combo.currentIndexChanged.connect(changes.append)
+    # Um deck novo antes dos selecionados muda as linhas de ambos
+    profile.decks.id("Artes")
+    addon.anki_utils.deck_index(refresh=True)
+    assert model.sync()
+    assert popup_combo.currentData() == "Medicina"
+    assert options_combo.currentData() == "Idiomas::Inglês"
+    assert changes == []
+    popup_combo.deleteLater()
+    options_combo.deleteLater()
+    harness.process_events()
@@ -0,0 +1,62 @@
+# Copyright 2025 Carlos Duarte
+import time
+
+from deck_index import DeckIndex
+from due_counts import batched_due_counts, roll_up
+from fake_collection import QUEUE_LEARN, QUEUE_NEW, QUEUE_REVIEW, FakeCollection, NameId
+
+
+def build_index(names):
+    index = DeckIndex()
+    index.rebuild([NameId(deck_id, name) for deck_id, name in enumerate(names, start=1)])
+    return index
+
+
+def test_roll_up_sums_every_descendant_into_each_ancestor():
+    index = build_index(["Idiomas", "Idiomas::Alemão", "Idiomas::Alemão::Verbos", "Idiomas::Inglês", "Medicina"])
+    ids = {entry.name: entry.id for entry in index.entries}
+    own = {
+        ids["Idiomas"]: (1, 0, 0),
+        ids["Idiomas::Alemão"]: (0, 2, 0),
+        ids["Idiomas::Alemão::Verbos"]: (0, 0, 4),
+        ids["Idiomas::Inglês"]: (8, 0, 0),
+        ids["Medicina"]: (0, 0, 16),
+    }
+    totals = roll_up(index.entries, own)
+    assert totals[ids["Idiomas::Alemão::Verbos"]] == (0, 0, 4)
+    assert totals[ids["Idiomas::Alemão"]] == (0, 2, 4)
+    assert totals[ids["Idiomas"]] == (9, 2, 4)
+    assert totals[ids["Medicina"]] == (0, 0, 16)
+
+
+def test_roll_up_gives_empty_decks_zero_counts():
+    index = build_index(["Vazio", "Vazio::Filho"])
+    totals = roll_up(index.entries, {})
+    assert totals == {entry.id: (0, 0, 0) for entry in index.entries}
+
+
+def test_batched_counts_skip_suspended_and_future_cards():
+    col = FakeCollection()
+    deck_id = col.decks.id("Idiomas::Inglês")
+    today = col.sched.today
+    col.add_cards(deck_id, 3, queue=QUEUE_NEW)
+    col.add_cards(deck_id, 2, queue=QUEUE_REVIEW, due=today - 1)
+    col.add_cards(deck_id, 5, queue=QUEUE_REVIEW, due=today + 1)
+    col.add_cards(deck_id, 1, queue=QUEUE_LEARN)
+    col.add_cards(deck_id, 1, queue=QUEUE_LEARN, due=int(time.time()) + 86400)
+    suspended = col.add_cards(deck_id, 4, queue=QUEUE_REVIEW)
+    col.db.executemany("update cards set queue = -1 where id = ?", [(card_id,) for card_id in suspended])
+    assert batched_due_counts(col)[deck_id] == (3, 1, 2)
+
+
+def test_batched_counts_roll_up_like_the_scheduler_tree():
+    col = FakeCollection()
+    parent = col.decks.id("Idiomas")
+    child = col.decks.id("Idiomas::Inglês")
+    col.add_cards(parent, 2)
+    col.add_cards(child, 3)
+    col.add_cards(child, 1, queue=QUEUE_NEW)
+    index = DeckIndex().ensure(col)
+    totals = roll_up(index.entries, batched_due_counts(col))
+    node = col.sched.deck_due_tree(parent)
+    assert totals[parent] == (node.new_count, node.learn_count, node.review_count) == (1, 0, 5)
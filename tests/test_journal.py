@@ -0,0 +1,30 @@
+# Copyright 2025 Carlos Duarte
+import json
+import os
+
+from aqt import gui_hooks, mw
+
+import harness
+
+
+def read_events(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_each_profile_writes_its_own_journal(addon, collection):
+    deck_id = collection.decks.id("Idiomas::Inglês")
+    card_ids = {}
+    for name in ("Perfil A", "Perfil B"):
+        harness.open_profile(collection, name)
+        card = collection.card(collection.add_cards(deck_id, 1)[0])
+        card_ids[name] = card.id
+        gui_hooks.reviewer_did_answer_card(mw.reviewer, card, 3)
+        harness.close_profile()
+
+    user_files = os.path.join(harness.addon_dir(), "user_files")
+    for name, slug in (("Perfil A", "Perfil_A"), ("Perfil B", "Perfil_B")):
+        events = read_events(os.path.join(user_files, f"journal-{slug}", "journal.ndjson"))
+        answered = [event["card"] for event in events if event["e"] == "answer"]
+        assert answered == [card_ids[name]]
+    assert not os.path.exists(os.path.join(user_files, "journal.ndjson"))
@@ -0,0 +1,81 @@
+# Copyright 2025 Carlos Duarte
+import time
+
+from journal_analytics import LATENCY_BUCKETS, ReminderAnalyzer
+
+START = 1750000000
+
+
+def analyze(events):
+    return ReminderAnalyzer().feed(events).result()
+
+
+def reminder(t, reason="schedule"):
+    return {"t": t, "e": "reminder", "reason": reason}
+
+
+def test_outcomes_of_scheduled_reminders():
+    window = ReminderAnalyzer.CONVERSION_WINDOW_SECS
+    stats = analyze([
+        # Estudar Agora e o primeiro cartão 45 s depois
+        reminder(START), {"t": START + 5, "e": "study_now"}, {"t": START + 45, "e": "answer"},
+        # Sem clicar, mas respondeu dentro da janela
+        reminder(START + 3600), {"t": START + 3600 + 200, "e": "answer"},
+        # Respondeu só depois da janela: ignorado
+        reminder(START + 7200), {"t": START + 7200 + window + 1, "e": "answer"},
+        # Depois
+        reminder(START + 14400), {"t": START + 14410, "e": "later"},
+    ])
+    assert (stats.reminders, stats.studied, stats.ignored, stats.dismissed) == (4, 2, 1, 1)
+    assert stats.conversion_rate == 0.5
+    assert stats.latency_count == 2
+    assert stats.mean_latency == (45 + 200) / 2
+    assert stats.latency_histogram[LATENCY_BUCKETS.index(60)] == 1
+    assert stats.latency_histogram[LATENCY_BUCKETS.index(300)] == 1
+    assert stats.latency_quantile(0.5) == 60
+    assert stats.latency_quantile(0.9) == 300
+
+
+def test_dismissal_streaks():
+    events = []
+    for i, kind in enumerate(["later", "later", "later", "study_now", "later", "later"]):
+        events += [reminder(START + i * 600), {"t": START + i * 600 + 1, "e": kind}]
+    stats = analyze(events)
+    assert stats.longest_dismissal_streak == 3
+    assert stats.current_dismissal_streak == 2
+
+
+def test_inactivity_alerts_are_counted_apart_from_conversion():
+    stats = analyze([
+        {"t": START, "e": "inactivity_alert", "threshold": 120},
+        reminder(START, reason="inactivity"), {"t": START + 10, "e": "answer"},
+    ])
+    assert stats.inactivity_alerts == 1
+    assert stats.reminders == 0
+    assert stats.latency_count == 0
+
+
+def test_effectiveness_by_local_hour():
+    stats = analyze([
+        reminder(START), {"t": START + 1, "e": "study_now"},
+        reminder(START + 60), {"t": START + 61, "e": "later"},
+    ])
+    hour = time.localtime(START).tm_hour
+    assert stats.hour_rows() == [(hour, 2, 1, 0.5)]
+
+
+def test_events_without_reminder_or_timestamp_are_skipped():
+    stats = analyze([{"t": START, "e": "answer"}, {"e": "reminder"}, {"t": START, "e": "later"}])
+    assert stats.events == 3
+    assert stats.reminders == stats.dismissed == 0
+
+
+def test_test_reminders_do_not_skew_conversion():
+    stats = analyze([
+        reminder(START), {"t": START + 10, "e": "later"},
+        # Testar Lembrete nas opções e Estudar Agora no popup de teste
+        reminder(START + 60, reason="test"), {"t": START + 65, "e": "study_now"},
+        {"t": START + 90, "e": "answer"},
+    ])
+    assert (stats.reminders, stats.studied, stats.dismissed) == (1, 0, 1)
+    assert stats.latency_count == 0
@@ -0,0 +1,36 @@
+# Copyright 2025 Carlos Duarte
+import json
+import os
+import subprocess
+import sys
+
+import harness
+
+CYCLES = 200
+
+
+def test_profile_cycles_and_unload_release_everything():
+    # Em outro processo: o descarregamento desliga o addon importado pelos demais testes
+    output = subprocess.run(
+        [sys.executable, os.path.join(harness.TESTS_DIR, "leak_check.py"), "--cycles", str(CYCLES), "--json"],
+        capture_output=True, text=True, check=True, timeout=300,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    for sample in result["samples"]:
+        assert sample["hooks"] == 0
+        assert sample["qobjects"] == 0
+        assert sample["timers"] == 0
+        # Margens para caches internos do Python e do alocador, que não crescem com os ciclos
+        assert sample["objects"] < 50
+        assert sample["rss_kb"] < 2048
+    last, first = result["samples"][-1], result["samples"][0]
+    assert last["objects"] - first["objects"] < 10
+
+    unloaded = result["unloaded"]
+    assert unloaded["registry"] == []
+    assert unloaded["hooks"] == 0
+    assert unloaded["menu_actions"] == 0
+    assert not unloaded["journal_thread_alive"]
+    assert unloaded["qobjects"] <= 0
+    assert unloaded["timers"] <= 0
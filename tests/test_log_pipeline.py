@@ -0,0 +1,56 @@
+# Copyright 2025 Carlos Duarte
+import io
+import logging
+
+import pytest
+
+from dss_log_pipeline import ADDON_LOGGER, LogPipeline, get_logger
+
+
+@pytest.fixture
+def pipeline():
+    # O logger do addon é global: o estado deixado pelo addon importado é restaurado
+    addon_logger = logging.getLogger(ADDON_LOGGER)
+    saved = (list(addon_logger.handlers), addon_logger.propagate, addon_logger.level)
+    pipeline = LogPipeline()
+    stream = io.StringIO()
+    pipeline.start(stream, logging.INFO)
+    yield pipeline, stream
+    pipeline.stop()
+    addon_logger.handlers[:], addon_logger.propagate, addon_logger.level = saved
+
+
+def test_module_loggers_are_children_of_the_addon_logger():
+    assert get_logger("dss_timer_engine").name == f"{ADDON_LOGGER}.dss_timer_engine"
+    assert get_logger("gui.popup").parent.name in (f"{ADDON_LOGGER}.gui", ADDON_LOGGER)
+
+
+def test_only_the_addon_logger_is_touched(pipeline):
+    pipeline, stream = pipeline
+    addon_logger = logging.getLogger(ADDON_LOGGER)
+    assert pipeline._handler in addon_logger.handlers
+    assert not addon_logger.propagate
+    # Nomes genéricos de outros addons ou bibliotecas continuam como estavam
+    for name in ("gui", "locales", "metrics", "journal", "clock", "lifecycle", "translations"):
+        other = logging.getLogger(name)
+        assert pipeline._handler not in other.handlers
+        assert other.propagate
+
+
+def test_module_records_reach_console_and_ring_buffer(pipeline):
+    pipeline, stream = pipeline
+    get_logger("dss_timer_engine").info("prazo %d", 1)
+    get_logger("dss_timer_engine").debug("oculto")
+    pipeline.stop()
+    assert f"{ADDON_LOGGER}.dss_timer_engine - INFO - prazo 1" in stream.getvalue()
+    assert "oculto" not in stream.getvalue()
+    assert pipeline.recent_lines()[-1].endswith("prazo 1")
+
+
+def test_stop_restores_propagation(pipeline):
+    pipeline, stream = pipeline
+    handler = pipeline._handler
+    pipeline.stop()
+    addon_logger = logging.getLogger(ADDON_LOGGER)
+    assert addon_logger.propagate
+    assert handler not in addon_logger.handlers
@@ -0,0 +1,9 @@
+# Copyright 2025 Carlos Duarte
+import sys
+
+# Nomes genéricos que outros addons (no mesmo sys.path) também podem usar
+GENERIC_NAMES = ("locales", "metrics", "journal", "clock", "timer_engine", "config_writer", "log_pipeline", "lifecycle")
+
+
+def test_addon_modules_use_namespaced_names(addon):
+    assert [name for name in GENERIC_NAMES if name in sys.modules] == []
@@ -0,0 +1,41 @@
+# Copyright 2025 Carlos Duarte
+from aqt import mw
+
+import harness
+
+
+def test_missing_deck_preselects_ranked_deck_without_saving(addon, profile):
+    from deck_ranking import deck_ranking
+    harness.configure(addon, deck="Deck removido", suggest_urgent_deck=True)
+    deck_ranking.request(mw, mw.col)
+    harness.process_events()
+    assert deck_ranking.get(mw.col)
+    popup = addon.get_reminder_popup()
+    popup.show_popup()
+    assert popup.deck_select.currentData() == "Idiomas::Inglês"
+    # A classificação do momento não substitui a escolha salva
+    assert addon.anki_utils.get_config().deck == "Deck removido"
+    popup.hide_card()
+
+
+def test_profile_close_discards_deck_ranking(addon, collection):
+    from deck_ranking import deck_ranking
+    harness.open_profile(collection, "Classificação")
+    deck_ranking.request(mw, mw.col)
+    harness.process_events()
+    assert deck_ranking._ranking is not None
+    harness.close_profile()
+    assert deck_ranking._ranking is None
+    assert deck_ranking._answer_secs is None
+
+
+def test_profile_close_discards_due_counts(addon, collection):
+    from due_counts import due_counts
+    harness.open_profile(collection, "Contagens")
+    deck_id = collection.decks.id("Idiomas::Inglês")
+    due_counts.request(mw, mw.col, deck_id)
+    harness.process_events()
+    assert due_counts.get(mw.col, deck_id) is not None
+    harness.close_profile()
+    assert due_counts._cache == {}
+    assert due_counts._all is None
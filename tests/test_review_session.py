@@ -0,0 +1,95 @@
+# Copyright 2025 Carlos Duarte
+import time
+
+import pytest
+from aqt import gui_hooks, mw
+
+import bench_review
+import harness
+
+
+def test_profile_open_starts_scheduler_and_menu(addon, profile):
+    assert addon.dont_stop_scheduler is not None
+    assert addon.options_action in mw.form.menuTools.actions()
+    assert mw.addonManager.config_actions[harness.PACKAGE] is not None
+
+
+def test_review_arms_inactivity_monitor(addon, profile):
+    deck_id = profile.decks.id("Idiomas::Inglês")
+    card = profile.card(profile.add_cards(deck_id, 1)[0], taken_ms=4000)
+    harness.configure(addon, inactivity_after_max_answer=True)
+    mw.moveToState("review")
+    assert addon.dont_stop_scheduler.paused
+    mw.reviewer.card = card
+    gui_hooks.reviewer_did_show_question(card)
+    assert addon.timer_engine.is_pending(addon.inactivity_check_timer)
+    # maxTaken do grupo padrão + tempo extra configurado
+    assert addon.inactivity_threshold_secs == 60 + addon.anki_utils.get_config().inactivity_extra_minutes * 60
+    gui_hooks.reviewer_did_answer_card(mw.reviewer, card, 3)
+    mw.moveToState("overview")
+    assert not addon.timer_engine.is_pending(addon.inactivity_check_timer)
+    assert not addon.dont_stop_scheduler.paused
+
+
+def test_answer_hook_in_aqt_order_feeds_deck_estimator(addon, profile):
+    # O aqt chama reviewer_did_answer_card(reviewer, card, ease)
+    deck_id = profile.decks.id("Idiomas::Inglês")
+    card = profile.card(profile.add_cards(deck_id, 1)[0])
+    estimator = addon.answer_times.estimators.get(deck_id)
+    count = estimator.count if estimator else 0
+    hooks = gui_hooks.reviewer_did_answer_card.count()
+    mw.moveToState("review")
+    mw.reviewer.card = card
+    gui_hooks.reviewer_did_show_question(card)
+    card.timer_started = time.time() - 7
+    gui_hooks.reviewer_did_answer_card(mw.reviewer, card, 3)
+    mw.moveToState("overview")
+    assert addon.answer_times.estimators[deck_id].count == count + 1
+    assert gui_hooks.reviewer_did_answer_card.count() == hooks
+    # O substituto do aqt recusa a ordem errada, como o Anki recusaria
+    with pytest.raises(TypeError):
+        gui_hooks.reviewer_did_answer_card(card, 3, mw.reviewer)
+
+
+def test_adaptive_threshold_can_exceed_max_answer_time(addon, profile):
+    # Deck com tempo máximo de 60 s em que as respostas levam 90 s
+    deck_id = profile.decks.id("Idiomas::Inglês")
+    harness.configure(addon, inactivity_after_max_answer=True)
+    extra_secs = addon.anki_utils.get_config().inactivity_extra_minutes * 60
+    mw.moveToState("review")
+    for card_id in profile.add_cards(deck_id, addon.answer_times.MIN_SAMPLES + 5):
+        card = profile.card(card_id, taken_ms=60000)
+        mw.reviewer.card = card
+        gui_hooks.reviewer_did_show_question(card)
+        card.timer_started = time.time() - 90
+        gui_hooks.reviewer_did_answer_card(mw.reviewer, card, 3)
+    gui_hooks.reviewer_did_show_question(card)
+    assert addon.inactivity_threshold_secs == 90 + extra_secs
+    # Uma resposta depois de uma ausência maior que o limite não entra na estatística
+    count = addon.answer_times.estimators[deck_id].count
+    card.timer_started = time.time() - 2 * addon.inactivity_threshold_secs
+    gui_hooks.reviewer_did_answer_card(mw.reviewer, card, 3)
+    assert addon.answer_times.estimators[deck_id].count == count
+    mw.moveToState("overview")
+
+
+def test_review_hooks_cost_under_a_millisecond_per_card(addon):
+    col, cards = bench_review.build_collection()
+    harness.open_profile(col, "Benchmark")
+    try:
+        harness.configure(addon, inactivity_after_max_answer=True)
+        mw.moveToState("review")
+        bench_review.run_session(mw, cards, 500)
+        before = harness.resource_counts()
+        started = time.perf_counter()
+        bench_review.run_session(mw, cards, 2000)
+        per_card = (time.perf_counter() - started) / 2000
+        addon.journal.flush()
+        harness.process_events()
+        after = harness.resource_counts()
+        mw.moveToState("overview")
+    finally:
+        harness.close_profile()
+    assert per_card < 0.001
+    assert after["qobjects"] == before["qobjects"]
+    assert after["timers"] == before["timers"]
@@ -0,0 +1,84 @@
+# Copyright 2025 Carlos Duarte
+import pytest
+
+from addon_config import AddonConfig
+from dont_stop_scheduler import DontStopScheduler
+from dss_timer_engine import TimerEngine
+
+INTERVAL = 600
+
+
+class ConfigSource:
+    """anki_utils mínimo: só a configuração"""
+
+    def __init__(self, config):
+        self.config = config
+
+    def get_config(self):
+        return self.config
+
+
+@pytest.fixture
+def engine(fake_clock):
+    engine = TimerEngine()
+    yield engine
+    engine.dispose()
+
+
+def start_scheduler(engine, policy):
+    alarms = []
+    config = AddonConfig(frequency=INTERVAL // 60, missed_reminder_policy=policy)
+    scheduler = DontStopScheduler(alarms.append, lambda: None, ConfigSource(config), timer_engine=engine)
+    scheduler.start_schedule()
+    return scheduler, alarms
+
+
+@pytest.mark.parametrize("policy", ["reschedule", "skip", "fire_once"])
+def test_on_time_alarm_fires_and_keeps_interval(engine, fake_clock, policy):
+    scheduler, alarms = start_scheduler(engine, policy)
+    fake_clock.advance(INTERVAL)
+    engine._on_timeout()
+    assert alarms == ["schedule"]
+    assert engine.remaining(scheduler.alarm_handle) == INTERVAL
+
+
+@pytest.mark.parametrize("policy", ["reschedule", "skip", "fire_once"])
+def test_small_delay_is_timer_jitter_not_a_missed_reminder(engine, fake_clock, policy):
+    scheduler, alarms = start_scheduler(engine, policy)
+    # Abaixo de LATE_GAP_SECS: dispara e mantém a fase original
+    fake_clock.advance(INTERVAL + 30)
+    engine._on_timeout()
+    assert alarms == ["schedule"]
+    assert engine.remaining(scheduler.alarm_handle) == INTERVAL - 30
+
+
+@pytest.mark.parametrize("policy, fired, remaining", [
+    # Recomeça o intervalo a partir do despertar
+    ("reschedule", [], INTERVAL),
+    # Mantém a fase: próximo múltiplo do intervalo desde o início
+    ("skip", [], INTERVAL - 1500 % INTERVAL),
+    # Um único lembrete pelos 3 perdidos, mantendo a fase
+    ("fire_once", ["schedule"], INTERVAL - 1500 % INTERVAL),
+])
+def test_missed_reminders_follow_policy(engine, fake_clock, policy, fired, remaining):
+    scheduler, alarms = start_scheduler(engine, policy)
+    # Computador suspenso: o prazo vence 1500 s (2,5 intervalos) atrasado
+    fake_clock.advance(INTERVAL + 1500)
+    engine._on_timeout()
+    assert alarms == fired
+    assert engine.remaining(scheduler.alarm_handle) == remaining
+    assert engine.lateness == 0.0
+
+
+def test_lateness_threshold_scales_with_interval(engine):
+    engine.lateness = TimerEngine.LATE_GAP_SECS
+    assert engine.is_late(INTERVAL)
+    # Para intervalos longos, a tolerância é LATE_FRACTION do intervalo
+    assert not engine.is_late(3600)
+    engine.lateness = 0.0
+
+
+def test_test_reminder_is_tagged(engine, fake_clock):
+    scheduler, alarms = start_scheduler(engine, "reschedule")
+    scheduler.exec_schedule(reason="test")
+    assert alarms == ["test"]
@@ -0,0 +1,103 @@
+# Copyright 2025 Carlos Duarte
+import gc
+import tracemalloc
+
+import pytest
+from aqt.qt import QEventLoop, QTimer
+
+from dss_timer_engine import TimerEngine
+
+
+@pytest.fixture
+def engine():
+    engine = TimerEngine()
+    yield engine
+    engine.dispose()
+
+
+def run_until_idle(engine, timeout_ms=2000):
+    """Roda o loop de eventos até não haver prazos pendentes (ou até o limite)"""
+    loop = QEventLoop()
+    poll = QTimer()
+    poll.timeout.connect(lambda: len(engine) or loop.quit())
+    poll.start(5)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    poll.stop()
+
+
+def test_fires_in_deadline_order(engine):
+    fired = []
+    engine.schedule(0.06, lambda: fired.append("c"))
+    engine.schedule(0.02, lambda: fired.append("a"))
+    cancelled = engine.schedule(0.03, lambda: fired.append("x"))
+    engine.schedule(0.04, lambda: fired.append("b"))
+    engine.cancel(cancelled)
+    run_until_idle(engine)
+    assert fired == ["a", "b", "c"]
+
+
+def test_equal_deadlines_fire_in_scheduling_order(engine):
+    # Com a granularidade, os prazos caem no mesmo ponto da grade
+    engine.set_coalescing(0.05)
+    fired = []
+    for name in "abcd":
+        engine.schedule(0.01, lambda name=name: fired.append(name))
+    run_until_idle(engine)
+    assert fired == list("abcd")
+
+
+def test_reschedule_keeps_handle_and_moves_deadline(engine):
+    fired = []
+    handle = engine.schedule(0.01, lambda: fired.append("first"))
+    assert engine.schedule(0.03, lambda: fired.append("second"), handle) == handle
+    run_until_idle(engine)
+    assert fired == ["second"]
+    assert not engine.is_pending(handle)
+
+
+def test_compacts_heap_after_threshold_of_cancelled_entries(engine):
+    handles = [engine.schedule(3600 + i, lambda: None) for i in range(100)]
+    # O primeiro fica no topo: os cancelados abaixo dele ficam no heap
+    for handle in handles[1:TimerEngine.COMPACT_THRESHOLD + 1]:
+        engine.cancel(handle)
+    assert len(engine._heap) == 100
+    engine.cancel(handles[TimerEngine.COMPACT_THRESHOLD + 1])
+    assert len(engine._heap) == len(engine) == 100 - TimerEngine.COMPACT_THRESHOLD - 1
+
+
+def test_schedule_cancel_churn_keeps_memory_flat(engine):
+    background = [engine.schedule(3600 + i, lambda: None) for i in range(100)]
+    handle = None
+
+    def churn(cycles):
+        nonlocal handle
+        # Como o monitor de inatividade: reagenda a cada cartão, cancela ao sair
+        for i in range(cycles):
+            handle = engine.schedule(120, lambda: None, handle)
+            if i % 2:
+                engine.cancel(handle)
+
+    tracemalloc.start()
+    churn(10000)
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    churn(100000)
+    gc.collect()
+    growth = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert growth < 1024
+    assert len(engine) == len(background)
+    assert len(engine._heap) <= len(background) + 2 * TimerEngine.COMPACT_THRESHOLD + 2
+
+
+def test_exact_deadlines_skip_coalescing(engine):
+    # Grade longa: o prazo alinhado não vence durante o teste
+    engine.set_coalescing(86400)
+    fired = []
+    coalesced = engine.schedule(0.02, lambda: fired.append("coalesced"))
+    engine.schedule(0.02, lambda: fired.append("exact"), coalesce=False)
+    assert engine.remaining(coalesced) > 0.02
+    run_until_idle(engine, timeout_ms=500)
+    assert fired == ["exact"]
+    assert engine.is_pending(coalesced)
@@ -0,0 +1,16 @@
+# Copyright 2025 Carlos Duarte
+import sys
+
+import translations
+
+
+def test_invalidate_language_releases_the_catalog(addon):
+    translations.tr("log_initializing")
+    language = translations.get_language()
+    name = f"{translations.CATALOG_PACKAGE}.{language}"
+    assert name in sys.modules
+    translations.invalidate_language()
+    assert name not in sys.modules
+    assert not hasattr(sys.modules[translations.CATALOG_PACKAGE], language)
+    # O próximo tr() carrega o catálogo de novo
+    assert translations.tr("log_initializing") != "log_initializing"